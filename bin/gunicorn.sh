@@ -2,5 +2,10 @@
 
 set -o nounset -o pipefail -o errexit
 
+# The workers write their metrics to the directory and /metrics collects them, see `easyhome.parser.metrics`.
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+
 echo "Run uWSGI"
-gunicorn --chdir=/src --bind=0.0.0.0:8080 --workers=2 config.asgi:application
+gunicorn --chdir=/src --config=/src/config/gunicorn.py --bind=0.0.0.0:8080 --workers=2 config.asgi:application
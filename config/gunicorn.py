@@ -0,0 +1,11 @@
+"""Use this module to configure gunicorn, see `bin/gunicorn.sh`."""
+from __future__ import annotations
+
+from typing import Any
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server: Any, worker: Any) -> None:  # noqa: ANN401, ARG001
+    """Remove the live metrics of the exited worker, its counters and histograms are kept."""
+    multiprocess.mark_process_dead(worker.pid)
@@ -9,6 +9,7 @@ from django.utils.functional import lazy
 from django.views.decorators.csrf import csrf_exempt
 from graphene_django.views import GraphQLView
 
+from easyhome.parser.views import metrics_page
 from easyhome.sso.views import index_page, login_page
 
 admin.site.enable_nav_sidebar = False
@@ -20,6 +21,7 @@ urlpatterns = [
     path("logout/", LogoutView.as_view()),
     path("easyhome/", admin.site.urls),
     path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("metrics/", metrics_page),
     *static(settings.STATIC_URL, document_root=settings.STATIC_ROOT),
 ]
 
@@ -0,0 +1,101 @@
+"""Use this module to run coroutines on a long-lived event loop from synchronous code."""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import threading
+from typing import Any, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Coroutine
+    from concurrent.futures import Future
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """
+    Use this class to own an asyncio event loop running forever in a daemon thread.
+
+    Coroutines can be submitted from any thread, the loop (and everything bound to it, like aiohttp sessions) lives
+    until `stop` is called.
+
+    Example:
+    -------
+        loop_thread = EventLoopThread(name="http-client")
+        result = loop_thread.run(fetch_something())
+        loop_thread.stop()
+
+    """
+
+    def __init__(self, name: str = "easyhome-event-loop") -> None:  # noqa: D107
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Return the running loop, the thread is started on the first access."""
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                self._start()
+            return self._loop  # type: ignore[return-value]
+
+    def _start(self) -> None:
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run_forever() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        self._thread = threading.Thread(target=run_forever, name=self.name, daemon=True)
+        self._thread.start()
+        ready.wait()
+        self._loop = loop
+
+    def in_loop_thread(self) -> bool:
+        """Return True if the caller runs inside the loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule the coroutine on the loop and return a thread-safe future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run the coroutine on the loop and block the calling thread until it is done."""
+        if self.in_loop_thread():
+            coro.close()
+            msg = "EventLoopThread.run() can't be called from the loop thread, await the coroutine instead."
+            raise RuntimeError(msg)
+        return self.submit(coro).result(timeout=timeout)
+
+    def stop(self) -> None:
+        """Stop the loop and wait for the thread to finish."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+
+        if loop is None or thread is None:
+            return
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+@functools.cache
+def get_event_loop_thread() -> EventLoopThread:
+    """
+    Return the event loop of the process, it's created on the first call and stopped when the process exits.
+
+    All crawls of the process run on this loop: the scheduler threads and the management commands submit their
+    coroutines to it, so the loop and the connections bound to it live across the runs instead of being created by
+    every run.
+    """
+    loop_thread = EventLoopThread(name="easyhome-event-loop")
+    atexit.register(loop_thread.stop)
+    return loop_thread
@@ -3,10 +3,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from apscheduler.events import EVENT_JOB_SUBMITTED
 from apscheduler.triggers.interval import IntervalTrigger
 from django.apps import AppConfig
 from django.conf import settings
 
+from easyhome.parser.metrics import observe_scheduler_lag
+
 if TYPE_CHECKING:
     from apscheduler.schedulers.background import BackgroundScheduler
 
@@ -31,18 +34,21 @@ class EasyHomeConfig(AppConfig):
         if settings.SCHEDULER_ENABLED:
             scheduler: BackgroundScheduler = APP_CONTAINER.services.background_scheduler()
 
-            if settings.SCHEDULER_LALAFO_ENABLED:
-                scheduler.add_job(
-                    APP_CONTAINER.services.lalafo_service().parse,
-                    IntervalTrigger(minutes=APP_CONTAINER.config.SCHEDULER_PARSE_INTERVAL()),
-                    max_instances=1,
-                )
-
-            if settings.SCHEDULER_DIESEL_ENABLED:
-                scheduler.add_job(
-                    APP_CONTAINER.services.diesel_service().parse,
-                    IntervalTrigger(minutes=APP_CONTAINER.config.SCHEDULER_PARSE_INTERVAL()),
-                    max_instances=1,
+            # The enabled sites are crawled concurrently by one job on the event loop of the HTTP client.
+            services = [
+                service()
+                for enabled, service in (
+                    (settings.SCHEDULER_LALAFO_ENABLED, APP_CONTAINER.services.lalafo_service),
+                    (settings.SCHEDULER_DIESEL_ENABLED, APP_CONTAINER.services.diesel_service),
+                    (settings.SCHEDULER_HOUSE_ENABLED, APP_CONTAINER.services.house_service),
                 )
-
+                if enabled
+            ]
+            scheduler.add_job(
+                APP_CONTAINER.services.crawl_orchestrator(services=services).crawl,
+                IntervalTrigger(minutes=APP_CONTAINER.config.SCHEDULER_PARSE_INTERVAL()),
+                max_instances=1,
+            )
+
+            scheduler.add_listener(observe_scheduler_lag, EVENT_JOB_SUBMITTED)
             scheduler.start()
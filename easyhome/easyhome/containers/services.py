@@ -4,7 +4,9 @@ from __future__ import annotations
 from apscheduler.schedulers.background import BackgroundScheduler
 from dependency_injector import containers, providers
 
+from easyhome.parser.archive import PageArchive
 from easyhome.parser.http_client import HttpClient
+from easyhome.parser.orchestrator import CrawlOrchestrator
 from easyhome.parser.services import ParseSiteService
 from easyhome.parser.sites.diesel import Diesel
 from easyhome.parser.sites.house import House
@@ -18,26 +20,36 @@ class ServicesContainer(containers.DeclarativeContainer):
 
     background_scheduler: providers.Provider[BackgroundScheduler] = providers.Singleton(BackgroundScheduler)
 
-    lalafo_site = providers.Factory(Lalafo)
+    lalafo_site = providers.Factory(Lalafo, listing_only=config.LALAFO_LISTING_ONLY)
     diesel_site = providers.Factory(Diesel)
     house_site = providers.Factory(House)
 
     http_client = providers.Singleton(HttpClient)
+    page_archive = providers.Singleton(PageArchive.from_settings)
 
     lalafo_service = providers.Factory(
         ParseSiteService,
         http_client=http_client,
         site=lalafo_site,
+        archive=page_archive,
     )
 
     diesel_service = providers.Factory(
         ParseSiteService,
         http_client=http_client,
         site=diesel_site,
+        archive=page_archive,
     )
 
     house_service = providers.Factory(
         ParseSiteService,
         http_client=http_client,
         site=house_site,
+        archive=page_archive,
+    )
+
+    crawl_orchestrator = providers.Factory(
+        CrawlOrchestrator,
+        http_client=http_client,
+        services=providers.List(lalafo_service, diesel_service, house_service),
     )
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_apartments(apps, schema_editor):
+    """Keep the first stored apartment per (site, external_id) and move the relations of the duplicates to it."""
+    Apartment = apps.get_model("easyhome", "Apartment")
+    Answer = apps.get_model("easyhome", "Answer")
+    Image = apps.get_model("easyhome", "Image")
+    TgMessage = apps.get_model("easyhome", "TgMessage")
+
+    duplicates = (
+        Apartment.objects.values("site", "external_id")
+        .annotate(first_id=Min("id"), total=Count("id"))
+        .filter(total__gt=1)
+    )
+    for duplicate in duplicates:
+        duplicate_ids = list(
+            Apartment.objects.filter(site=duplicate["site"], external_id=duplicate["external_id"])
+            .exclude(id=duplicate["first_id"])
+            .values_list("id", flat=True)
+        )
+        for model in (Answer, Image, TgMessage):
+            model.objects.filter(apartment_id__in=duplicate_ids).update(apartment_id=duplicate["first_id"])
+        Apartment.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('easyhome', '0002_auto_20210908_1449'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='apartment',
+            name='external_id',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.RunPython(remove_duplicate_apartments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('easyhome', '0003_apartment_external_id_identity'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='apartment',
+            constraint=models.UniqueConstraint(fields=('site', 'external_id'), name='apartment_site_external_id_uniq'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('easyhome', '0004_apartment_site_external_id_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apartment',
+            name='page_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -70,7 +70,7 @@ class Currency(models.IntegerChoices):
 class Apartment(models.Model):
     """Use this model to store the apartment data."""
 
-    external_id = models.BigIntegerField()  # FIXME: Change to CharField  # noqa: FIX001, TD001, TD002, TD003
+    external_id = models.CharField(max_length=255)
     url = models.CharField(max_length=255, default="")
     topic = models.CharField(max_length=255, default="")
     phone = models.CharField(max_length=255, default="", blank=True)
@@ -87,6 +87,8 @@ class Apartment(models.Model):
     district = models.CharField(max_length=255, default="", blank=True)
     lat = models.FloatField(default=0.0, blank=True)
     lon = models.FloatField(default=0.0, blank=True)
+    # The SHA-256 of the raw page the apartment was parsed from, the page is kept by the parser archive.
+    page_hash = models.CharField(max_length=64, default="", blank=True)
 
     images_count = models.IntegerField(default=0)  # FIXME: Redundant field  # noqa: FIX001, TD001, TD002, TD003
     is_deleted = models.BooleanField(default=False)  # FIXME: Change to datetime field  # noqa: FIX001, TD001, TD002, TD003
@@ -95,6 +97,15 @@ class Apartment(models.Model):
 
     # TODO: Need to add a field for the last update and last seen  # noqa: FIX002, TD002, TD003
 
+    class Meta:
+        """Metaclass for the Apartment model."""
+
+        constraints = (
+            # The announcement identity is the site and the id on this site. The index is used by the parser to skip
+            # announcements that are already stored.
+            models.UniqueConstraint(fields=("site", "external_id"), name="apartment_site_external_id_uniq"),
+        )
+
     def __str__(self) -> str:
         """Return the string representation of the Apartment model."""
         return f"{self.topic} {self.get_site_display()!r} (#{self.pk})"
@@ -0,0 +1,154 @@
+"""Use this module to keep the raw pages of the sites, so the history can be parsed again."""
+from __future__ import annotations
+
+import enum
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import zstandard
+from django.conf import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class PageKind(enum.StrEnum):
+    """Use this class to define the kinds of the archived pages."""
+
+    list = "list"
+    detail = "detail"
+
+
+@dataclass(slots=True, frozen=True)
+class ArchivedPage:
+    """Use this class to describe a page of the archive."""
+
+    site: str
+    kind: PageKind
+    digest: str
+    path: Path
+
+
+class PageArchive:
+    """
+    Use this class to store the raw pages of the sites on the local disk.
+
+    The pages are compressed by zstd and addressed by the SHA-256 of the raw content:
+    `root/<site>/<kind>/<digest[:2]>/<digest>.html.zst`. The same page is stored once, storing it again only renews
+    its modification time, and `prune()` removes the pages which weren't stored for `retention_days`.
+    """
+
+    suffix = ".html.zst"
+    # The archive of a site is pruned at most once per interval by `prune_if_due()`.
+    prune_interval = 60 * 60
+
+    def __init__(self, root: Path | str, compression_level: int = 10, retention_days: int = 30) -> None:  # noqa: D107
+        self.root = Path(root)
+        self.retention_days = retention_days
+        self._compression_level = compression_level
+        self._pruned_at: dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls) -> PageArchive | None:
+        """Use this method to get the archive configured by `PARSER_ARCHIVE_*`, returns None if it's disabled."""
+        if not settings.PARSER_ARCHIVE_DIR:
+            return None
+
+        return cls(
+            settings.PARSER_ARCHIVE_DIR,
+            compression_level=settings.PARSER_ARCHIVE_COMPRESSION_LEVEL,
+            retention_days=settings.PARSER_ARCHIVE_RETENTION_DAYS,
+        )
+
+    @staticmethod
+    def get_digest(content: bytes) -> str:
+        """Use this method to get the address of the content."""
+        return hashlib.sha256(content).hexdigest()
+
+    def get_path(self, site: str, kind: PageKind, digest: str) -> Path:
+        """Use this method to get the path of the page, the page may not exist."""
+        return self.root / site / kind / digest[:2] / f"{digest}{self.suffix}"
+
+    def store(self, site: str, kind: PageKind, content: bytes) -> str:
+        """Use this method to store the page, returns its digest."""
+        digest = self.get_digest(content)
+        path = self.get_path(site, kind, digest)
+        if path.exists():
+            path.touch()
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # The compressors aren't thread-safe, so every page gets its own one.
+        compressed = zstandard.ZstdCompressor(level=self._compression_level).compress(content)
+
+        # The page is written to a temporary file and renamed, so a reader never sees a partial page.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(compressed)
+            Path(tmp_path).replace(path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        return digest
+
+    def read(self, page: ArchivedPage) -> bytes:
+        """Use this method to read the raw content of the page."""
+        return zstandard.ZstdDecompressor().decompress(page.path.read_bytes())
+
+    def iter_pages(self, site: str | None = None, kind: PageKind | None = None) -> Iterator[ArchivedPage]:
+        """Use this method to iterate over the pages of the archive, optionally of one site and one kind."""
+        site_pattern = site or "*"
+        kind_pattern = kind or "*"
+        for path in sorted(self.root.glob(f"{site_pattern}/{kind_pattern}/*/*{self.suffix}")):
+            yield ArchivedPage(
+                site=path.parents[2].name,
+                kind=PageKind(path.parents[1].name),
+                digest=path.name.removesuffix(self.suffix),
+                path=path,
+            )
+
+    def prune(self, site: str | None = None) -> int:
+        """Use this method to remove the pages which weren't stored for `retention_days`, returns their number."""
+        expired_at = time.time() - self.retention_days * 24 * 60 * 60
+        pruned = 0
+        for page in self.iter_pages(site):
+            if page.path.stat().st_mtime < expired_at:
+                page.path.unlink(missing_ok=True)
+                pruned += 1
+
+        return pruned
+
+    def prune_if_due(self, site: str) -> int:
+        """Use this method to prune the pages of the site if it wasn't pruned for `prune_interval`."""
+        now = time.monotonic()
+        if now - self._pruned_at.get(site, -self.prune_interval) < self.prune_interval:
+            return 0
+
+        self._pruned_at[site] = now
+        return self.prune(site)
+
+
+def archive_page(archive: PageArchive | None, site: str, kind: PageKind, content: bytes) -> str:
+    """
+    Use this function to store the page if the archive is enabled, returns its digest or an empty string.
+
+    The errors of the archive are logged, a full disk doesn't stop the parsing.
+    """
+    if archive is None:
+        return ""
+
+    try:
+        return archive.store(site, kind, content)
+    except OSError:
+        logger.exception("Can't archive a %s page of site %s", kind, site)
+        return ""
@@ -0,0 +1,120 @@
+"""
+Use this module to build the pages of the sites with different HTML parsers.
+
+The sites work with the BeautifulSoup API (`select`, `select_one`, `get_text`, `attrs`, `get_attribute_list`,
+`parent`), the `html.parser`
+and `lxml` backends return BeautifulSoup trees and the `selectolax` backend returns a thin wrapper around the lexbor
+tree which implements the same subset of the API.
+
+The pages are built from the raw bytes of the responses and the encoding declared by the site, so every page is
+decoded once by the parser and the encoding isn't sniffed.
+
+The pages of every backend accept the selectors compiled once by `compile_selector`: the BeautifulSoup trees match the
+compiled soupsieve pattern, lexbor has no compiled selectors so the lexbor tree gets the pattern of the selector.
+"""
+from __future__ import annotations
+
+import codecs
+import enum
+import functools
+from typing import TypeAlias
+
+import soupsieve
+from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser, LexborNode
+
+
+class ParserBackend(enum.StrEnum):
+    """Use this class to define the HTML parser backends."""
+
+    html_parser = "html.parser"
+    lxml = "lxml"
+    selectolax = "selectolax"
+
+
+Selector: TypeAlias = str | soupsieve.SoupSieve
+
+
+@functools.lru_cache(maxsize=256)
+def compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Use this function to compile the CSS selector once instead of parsing it again on every call."""
+    return soupsieve.compile(selector)
+
+
+@functools.lru_cache(maxsize=256)
+def _to_lexbor_selector(selector: str) -> str:
+    # soupsieve and lexbor have the same "text contains" pseudo-class under different names.
+    return selector.replace(":-soup-contains(", ":lexbor-contains(")
+
+
+def _get_lexbor_selector(selector: Selector) -> str:
+    return _to_lexbor_selector(selector if isinstance(selector, str) else selector.pattern)
+
+
+class SelectolaxNode:
+    """Use this class to access a lexbor node with the BeautifulSoup API used by the sites."""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node: LexborNode | LexborHTMLParser) -> None:  # noqa: D107
+        self._node = node
+
+    def select(self, selector: Selector) -> list[SelectolaxNode]:  # noqa: D102
+        return [SelectolaxNode(node) for node in self._node.css(_get_lexbor_selector(selector))]
+
+    def select_one(self, selector: Selector) -> SelectolaxNode | None:  # noqa: D102
+        node = self._node.css_first(_get_lexbor_selector(selector))
+        return None if node is None else SelectolaxNode(node)
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:  # noqa: FBT001, FBT002, D102
+        return self._node.text(deep=True, separator=separator, strip=strip) or ""
+
+    getText = get_text  # noqa: N815
+
+    @property
+    def attrs(self) -> dict[str, str | None]:  # noqa: D102
+        if isinstance(self._node, LexborHTMLParser):
+            return {}
+        return self._node.attributes
+
+    def get_attribute_list(self, key: str) -> list[str]:  # noqa: D102
+        value = self.attrs.get(key)
+        if value is None:
+            return []
+        # BeautifulSoup splits the multi-valued "class" attribute only.
+        return value.split() if key == "class" else [value]
+
+    @property
+    def parent(self) -> SelectolaxNode | None:  # noqa: D102
+        if isinstance(self._node, LexborHTMLParser):
+            return None
+        node = self._node.parent
+        return None if node is None else SelectolaxNode(node)
+
+    def decompose(self) -> None:
+        """Do nothing, the lexbor tree has no reference cycles and is freed with the last reference."""
+
+
+Page: TypeAlias = BeautifulSoup | SelectolaxNode
+
+
+@functools.lru_cache(maxsize=16)
+def _is_utf8(encoding: str) -> bool:
+    return codecs.lookup(encoding).name == "utf-8"
+
+
+def make_page(
+    content: bytes | str,
+    backend: ParserBackend = ParserBackend.html_parser,
+    encoding: str = "utf-8",
+) -> Page:
+    """Use this function to parse the content with the backend, the bytes are decoded by the `encoding`."""
+    if backend == ParserBackend.selectolax:
+        # lexbor parses the bytes as UTF-8, only the pages in other encodings are decoded before.
+        if isinstance(content, bytes) and not _is_utf8(encoding):
+            content = content.decode(encoding, errors="replace")
+        return SelectolaxNode(LexborHTMLParser(content))
+
+    if isinstance(content, bytes):
+        return BeautifulSoup(content, str(backend), from_encoding=encoding)
+    return BeautifulSoup(content, str(backend))
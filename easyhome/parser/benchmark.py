@@ -0,0 +1,181 @@
+"""
+Use this module to measure the speed of the site parsers and to compare it with the stored baseline.
+
+The times of the parsers depend on the machine, so they are stored and compared in the units of the calibration
+benchmark: a fixed pure-Python workload measured together with the parsers. A faster or slower machine changes the
+calibration as much as the parsers, so the baseline of one machine can be compared with the results of another one.
+"""
+from __future__ import annotations
+
+import collections
+import gc
+import json
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+    from easyhome.parser.sites.base import AbstractSite
+
+
+# The name of the calibration benchmark and the unit of the stored baseline.
+CALIBRATION = "calibration"
+
+_calibration_page = "".join(
+    f'<div class="item" id="item-{i}"><a href="/items/{i}">Item {i}</a><span class="price">{i * 100} KGS</span></div>'
+    for i in range(200)
+)
+
+
+class _TagCounter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.tags: collections.Counter[str] = collections.Counter()
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.tags[tag] += len(attrs)
+
+
+def _calibrate() -> None:
+    parser = _TagCounter()
+    parser.feed(_calibration_page)
+    parser.close()
+
+
+@dataclass(slots=True, frozen=True)
+class Benchmark:
+    """Use this class to describe a measured call, the name is `<site>.<stage>.<page>`."""
+
+    name: str
+    func: Callable[[], object]
+
+
+@dataclass(slots=True, frozen=True)
+class Regression:
+    """Use this class to describe a benchmark which became slower than the baseline allows."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """The change of the time against the baseline in percent."""
+        return (self.current / self.baseline - 1) * 100
+
+
+def get_calibration_benchmark() -> Benchmark:
+    """Use this function to get the calibration benchmark, it tokenizes a synthetic list page by the stdlib parser."""
+    return Benchmark(CALIBRATION, _calibrate)
+
+
+def get_site_benchmarks(site: AbstractSite, dataset_path: Path) -> list[Benchmark]:
+    """
+    Use this function to get the benchmarks of the site over the pages of the dataset.
+
+    Every page of the site (`<site>_first_page.html` and `<site>_<id>.html`) is measured by the stages of the parsing:
+    `make_page` builds and destroys the tree of the page by the backend of the site, `get_announcement_pages_map` and
+    `parse_apartment` parse the list page and the announcement pages from their content.
+    """
+    benchmarks: list[Benchmark] = []
+    for page_path in sorted(dataset_path.glob(f"{site.name}_*.html")):
+        content = page_path.read_bytes()
+        page_name = page_path.stem.removeprefix(f"{site.name}_")
+        make_page = lambda c=content: site.make_page(c).decompose()  # noqa: E731
+        benchmarks.append(Benchmark(f"{site.name}.make_page.{page_name}", make_page))
+        if page_name == "first_page":
+            stage, func = "get_announcement_pages_map", site.get_announcement_pages_map_from_content
+        else:
+            stage, func = "parse_apartment", site.parse_apartment_from_content
+        benchmarks.append(Benchmark(f"{site.name}.{stage}.{page_name}", lambda f=func, c=content: f(c)))
+
+    return benchmarks
+
+
+def run_benchmarks(benchmarks: Iterable[Benchmark], rounds: int = 5, min_time: float = 0.1) -> dict[str, float]:
+    """
+    Use this function to measure the benchmarks, returns the time of one call of every benchmark in seconds.
+
+    The number of calls of a round of every benchmark grows until the round takes `min_time`, then the rounds of the
+    benchmarks are interleaved and the fastest of the `rounds` rounds is taken: a busy machine slows down the rounds
+    of a period of time, not of one benchmark. The garbage collector is paused during the rounds as `timeit` does,
+    the trees of the pages are destroyed by the measured calls.
+    """
+    numbers: dict[str, int] = {}
+    results: dict[str, float] = {}
+    benchmarks = list(benchmarks)
+    for benchmark in benchmarks:
+        benchmark.func()  # Warm up the caches of the parser and of the selectors.
+        number = 1
+        while (elapsed := _measure_round(benchmark.func, number)) < min_time:
+            number *= 2
+        numbers[benchmark.name] = number
+        results[benchmark.name] = elapsed / number
+
+    for _ in range(rounds - 1):
+        for benchmark in benchmarks:
+            number = numbers[benchmark.name]
+            results[benchmark.name] = min(results[benchmark.name], _measure_round(benchmark.func, number) / number)
+
+    return results
+
+
+def _measure_round(func: Callable[[], object], number: int) -> float:
+    gc.collect()
+    gc.disable()
+    try:
+        started_at = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - started_at
+    finally:
+        gc.enable()
+
+
+def normalize_results(results: dict[str, float]) -> dict[str, float]:
+    """Use this function to express the times of the benchmarks in the times of the calibration benchmark."""
+    calibration = results[CALIBRATION]
+    return {name: seconds / calibration for name, seconds in results.items() if name != CALIBRATION}
+
+
+def find_regressions(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    max_regression: float,
+) -> list[Regression]:
+    """
+    Use this function to find the benchmarks which are slower than the baseline by more than `max_regression` percent.
+
+    The benchmarks which aren't in the baseline are new and can't regress.
+    """
+    return [
+        Regression(name=name, baseline=baseline[name], current=current)
+        for name, current in results.items()
+        if name in baseline and current > baseline[name] * (1 + max_regression / 100)
+    ]
+
+
+def read_baseline(path: Path) -> dict[str, float]:
+    """
+    Use this function to read the stored normalized results of the benchmarks.
+
+    The missing baseline and the baseline in other units (e.g. the seconds of one machine) are empty.
+    """
+    if not path.exists():
+        return {}
+
+    data: dict[str, Any] = json.loads(path.read_text())
+    if data.get("unit") != CALIBRATION:
+        return {}
+    benchmarks: dict[str, float] = data["benchmarks"]
+    return benchmarks
+
+
+def write_baseline(path: Path, results: dict[str, float]) -> None:
+    """Use this function to store the normalized results of the benchmarks as the new baseline."""
+    data = {"unit": CALIBRATION, "benchmarks": dict(sorted(results.items()))}
+    path.write_text(json.dumps(data, indent=2) + "\n")
@@ -0,0 +1,95 @@
+"""Use this module to stop requesting a site while it's down."""
+from __future__ import annotations
+
+import enum
+import logging
+import threading
+import time
+
+import aiohttp
+
+from easyhome.parser.rate_limit import AimdController
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(enum.IntEnum):
+    """Use this class to define the states of the circuit, the values are exported by the metrics."""
+
+    closed = 0
+    open = 1
+    half_open = 2
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Use this exception to reject a request to the site which is down, the request isn't made."""
+
+
+class CircuitBreaker:
+    """
+    Use this class to fail fast the requests to a site which is down.
+
+    The circuit is closed while the site answers. After `failure_threshold` failures in a row (429, 5xx or connection
+    errors) it's opened and every request is rejected without being made. After `reset_timeout` seconds the circuit is
+    half-open: one request is let through as a probe and the others are still rejected, the probe closes the circuit
+    if it succeeds and opens it again otherwise. So a site which is down costs one request per `reset_timeout`.
+
+    The HTTP client keeps one breaker per host, so the failures of the first pages and of the announcement pages of a
+    site trip the same circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300) -> None:  # noqa: D107
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Use this method before a request, returns False if the request must not be made."""
+        with self._lock:
+            if self.state == CircuitState.closed:
+                return True
+
+            if self.state == CircuitState.open and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = CircuitState.half_open
+                self._probe_in_flight = False
+
+            if self.state == CircuitState.half_open and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            return False
+
+    def check(self) -> None:
+        """Use this method before a request, raises `CircuitOpenError` if the request must not be made."""
+        if not self.allow_request():
+            msg = f"The circuit of site {self.name} is open."
+            raise CircuitOpenError(msg)
+
+    def on_cancel(self) -> None:
+        """Use this method if an allowed request is cancelled without a response, e.g. by the deadline of the run."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def on_response(self, status: int) -> None:
+        """Use this method to report the status of the response of an allowed request, 0 is a connection error."""
+        with self._lock:
+            if not AimdController.is_overloaded(status):
+                if self.state != CircuitState.closed:
+                    logger.info("The circuit of site %s is closed", self.name, extra={"site": self.name})
+                self.state = CircuitState.closed
+                self._failures = 0
+                self._probe_in_flight = False
+                return
+
+            self._failures += 1
+            if self.state == CircuitState.half_open or self._failures >= self.failure_threshold:
+                if self.state != CircuitState.open:
+                    logger.warning("The circuit of site %s is open", self.name, extra={"site": self.name})
+                self.state = CircuitState.open
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
@@ -0,0 +1,70 @@
+"""Use this module to limit the time of a run of the crawler."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class DeadlineExceededError(TimeoutError):
+    """Use this exception to stop the run which is out of its time budget, the outstanding requests are cancelled."""
+
+
+class Deadline:
+    """
+    Use this class to share the time budget of a run with every request of the run.
+
+    The deadline is a point of the monotonic clock, the requests take `min(their timeout, remaining)`, so no request
+    outlives the run. `Deadline()` never expires.
+
+    Example:
+    -------
+        deadline = Deadline(settings.PARSER_RUN_TIMEOUT)
+        async with deadline.timeout():
+            await fetch_pages()  # raises DeadlineExceededError when the budget runs out
+
+    """
+
+    def __init__(self, timeout: float = math.inf) -> None:  # noqa: D107
+        self.timeout_seconds = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def __repr__(self) -> str:  # noqa: D105
+        return f"Deadline(remaining={self.remaining():.3f})"
+
+    def remaining(self) -> float:
+        """Use this method to get the seconds left before the deadline, 0 if it's expired."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:  # noqa: D102
+        return self.remaining() <= 0
+
+    def get_timeout(self, timeout: float) -> float:
+        """Use this method to cut the timeout of a request (or of a sleep) by the remaining time."""
+        return min(timeout, self.remaining())
+
+    def check(self) -> None:
+        """Use this method before a request, raises `DeadlineExceededError` if the deadline is expired."""
+        if self.expired:
+            raise DeadlineExceededError(self._get_message())
+
+    @contextlib.asynccontextmanager
+    async def timeout(self) -> AsyncIterator[None]:
+        """Use this method to cancel the awaited code at the deadline, raises `DeadlineExceededError` then."""
+        # The clock of the asyncio loops is the monotonic one.
+        try:
+            async with asyncio.timeout_at(self.expires_at if math.isfinite(self.expires_at) else None):
+                yield
+        except TimeoutError as e:
+            if not self.expired:
+                raise
+            raise DeadlineExceededError(self._get_message()) from e
+
+    def _get_message(self) -> str:
+        return f"The run is out of its time budget of {self.timeout_seconds} seconds."
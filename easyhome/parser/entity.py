@@ -1,6 +1,7 @@
 from __future__ import annotations  # noqa: D100
 
 from dataclasses import dataclass
+from http import HTTPStatus
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -29,3 +30,23 @@ class ApartmentEntity:  # noqa: D101
     lat: float = 0.0
     lon: float = 0.0
     is_deleted: bool = False
+    page_hash: str = ""
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """Use this class to describe the result of fetching one page."""
+
+    url: str
+    body: bytes = b""
+    status: int = 0  # 0 means the response was not received
+    latency: float = 0.0  # seconds spent on all attempts
+    attempts: int = 0
+    error: str = ""
+    # The validators of the response for the conditional requests.
+    etag: str = ""
+    last_modified: str = ""
+
+    @property
+    def ok(self) -> bool:  # noqa: D102
+        return self.status == HTTPStatus.OK and not self.error
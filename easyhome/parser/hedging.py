@@ -0,0 +1,54 @@
+"""Use this module to send a duplicate of a slow request, so the slowest pages don't set the time of a run."""
+from __future__ import annotations
+
+import collections
+import math
+
+
+class HedgePolicy:
+    """
+    Use this class to decide when a duplicate of a slow request (a hedge) is sent to a host.
+
+    The delay of the hedge is the `quantile` of the latencies of the last `window` successful responses of the host, so
+    only the slowest requests are hedged, and no request is hedged until `min_samples` latencies are observed. Every
+    request adds `max_rate` tokens to the budget of the hedges, up to `burst` tokens, and every hedge takes one token,
+    so at most `max_rate` of the requests are hedged and the extra load on the host is bounded.
+
+    The policy is used only by the event loop of the HTTP client.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        max_rate: float,
+        *,
+        quantile: float = 0.95,
+        window: int = 100,
+        min_samples: int = 20,
+        burst: float = 5,
+    ) -> None:
+        self.max_rate = max_rate
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.burst = burst
+        self.delay: float | None = None
+        self._latencies: collections.deque[float] = collections.deque(maxlen=window)
+        self._tokens = 0.0
+
+    def on_request(self) -> float | None:
+        """Use this method when a request is started, returns the delay of its hedge or None if it isn't hedged."""
+        self._tokens = min(self._tokens + self.max_rate, self.burst)
+        return self.delay
+
+    def take(self) -> bool:
+        """Take one hedge from the budget, return False if the hedge rate is exceeded."""
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def on_response(self, latency: float) -> None:
+        """Use this method to report the latency of a successful response."""
+        self._latencies.append(latency)
+        if len(self._latencies) >= self.min_samples:
+            latencies = sorted(self._latencies)
+            self.delay = latencies[math.ceil(self.quantile * len(latencies)) - 1]
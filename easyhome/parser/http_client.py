@@ -1,21 +1,36 @@
 from __future__ import annotations  # noqa: D100
 
 import asyncio
+import atexit
+import threading
+import time
 from http import HTTPStatus
 from itertools import cycle
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING, TypeVar
+from urllib.parse import urlparse
 
-from aiohttp_retry import ExponentialRetry, RetryClient
-from bs4 import BeautifulSoup
+import aiohttp
+from aiohttp_retry import ExponentialRetry
 from django.conf import settings
-from requests import Session
-from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 
+from easyhome.common.event_loop import get_event_loop_thread
 from easyhome.common.utils import Singleton
+from easyhome.parser import metrics
+from easyhome.parser.circuit_breaker import CircuitBreaker, CircuitState
+from easyhome.parser.deadline import Deadline
+from easyhome.parser.entity import FetchResult
+from easyhome.parser.hedging import HedgePolicy
+from easyhome.parser.metrics import HedgeResult
+from easyhome.parser.proxy_pool import ProxyPool
+from easyhome.parser.rate_limit import AimdController, RequestLimiter, RetryBudget
+from easyhome.parser.sites.base import AbstractSite
 
 if TYPE_CHECKING:
-    import aiohttp
+    from collections.abc import AsyncGenerator, Coroutine, Iterator
+
+    from easyhome.parser.proxy_pool import Proxy
+
+T = TypeVar("T")
 
 # https://deviceatlas.com/blog/list-of-user-agent-strings
 user_agent_list = [
@@ -34,36 +49,6 @@ user_agent_list = [
 user_agent_cycle = cycle(user_agent_list)
 
 
-def get_session() -> Session:
-    """
-    Use this function to get the http session, with retry settings to be used the HubSpot API.
-
-    For example, if the total=6 and backoff_factor is set to:
-    1 second the successive sleeps will be 0.5, 1, 2, 4, 8, 16.
-    2 seconds - 1, 2, 4, 8, 16, 32.
-    10 seconds - 5, 10, 20, 40, 80, 160.
-
-    :return: Session
-    """
-    retries = Retry(
-        total=3,
-        backoff_factor=1,
-        allowed_methods=["GET"],
-        status_forcelist=[
-            HTTPStatus.BAD_GATEWAY,
-            HTTPStatus.SERVICE_UNAVAILABLE,
-            HTTPStatus.GATEWAY_TIMEOUT,
-        ],
-        raise_on_status=False,  # without this option request raises MaxRetryError on 500s without returning response.
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-
-    http = Session()
-    http.mount("https://", adapter)
-    http.mount("http://", adapter)
-    return http
-
-
 retry_options = ExponentialRetry(
     attempts=3,
     start_timeout=0.3,
@@ -75,8 +60,29 @@ retry_options = ExponentialRetry(
 )
 
 
-def get_retry_client() -> RetryClient:  # noqa: D103
-    return RetryClient(raise_for_status=False, retry_options=retry_options)
+def get_async_session() -> aiohttp.ClientSession:
+    """
+    Use this function to get the async http session, it must be called inside a running event loop.
+
+    The connector keeps connections alive between the runs and caches DNS answers, so the sites are resolved and
+    handshaked once instead of once per run. Responses are decompressed by aiohttp, it negotiates gzip/deflate and
+    brotli (when the `brotli` package is installed) via the `Accept-Encoding` header.
+    """
+    connector = aiohttp.TCPConnector(
+        limit_per_host=settings.AIOHTTP_CONNECTION_LIMIT_PER_HOST,
+        ttl_dns_cache=settings.AIOHTTP_DNS_CACHE_TTL,
+        keepalive_timeout=settings.AIOHTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, auto_decompress=True)
+
+
+def is_retryable(result: FetchResult) -> bool:
+    """Return True if the failed request can be retried (connection errors and server errors)."""
+    if result.status == 0:
+        return True
+    if result.status in retry_options.statuses:
+        return True
+    return retry_options.retry_all_server_errors and result.status >= HTTPStatus.INTERNAL_SERVER_ERROR
 
 
 class HttpClient(Singleton):
@@ -87,52 +93,524 @@ class HttpClient(Singleton):
     -------
         from easyhome.parser.http_client import HttpClient
 
-        http_client = HttpClient()  # used default get_session()
-        http_client = HttpClient(session=Session())  # you can pass your session
+        http_client = HttpClient()
+        page = http_client.fetch_first_page(site.first_page, site)
+
+    All requests are made by one long-lived aiohttp session which lives on the event loop of the process, see
+    `get_event_loop_thread`. The sync methods submit coroutines to this loop from the calling thread, so the scheduler
+    threads share the loop and its connections instead of a session of their own. The session is closed when the
+    process exits.
+
+    Each host has its own request limiter configured by the site (`max_in_flight`, `requests_per_second`), and
+    `AIOHTTP_REQUEST_LIMIT` caps the requests in flight across all hosts. With `PARSER_ADAPTIVE_CONCURRENCY` the limit
+    of a site follows its responses: it grows while the site answers fast and is cut on overload, see `AimdController`.
+
+    The `a`-prefixed methods are the async variants, they must be awaited on the event loop of the client, e.g. by
+    `run()`.
+
+    The announcement pages are fetched independently: every URL gets a `FetchResult` with the body or the error, one
+    failed page doesn't fail the others. Failed requests are retried with `retry_options`, but the retries of one run
+    are limited by `PARSER_RETRY_BUDGET`, so an outage of a site doesn't multiply the requests. After a few failures in
+    a row the circuit of the site is opened and its requests fail fast until a probe succeeds, see `CircuitBreaker`.
+    The announcement pages of the sites with `hedge_requests` are hedged: a request slower than the p95 latency of
+    the site is duplicated and the first response wins, at most `PARSER_HEDGE_MAX_RATE` of the requests, see
+    `HedgePolicy`.
+
+    The client remembers the `ETag` and `Last-Modified` validators of the first pages, a conditional request of a
+    first page returns None if the page isn't modified (304).
+
+    The requests of the sites with `use_proxy` are spread over the proxies of `PARSER_PROXIES` by their health, every
+    proxy has its own connection pool, see `ProxyPool`.
+
+    Every request has the connect, read and total timeouts of its site and is cut by the deadline of the run, the
+    fetches which are still outstanding at the deadline are cancelled and `DeadlineExceededError` is raised.
 
     """
 
-    session: Session
+    async_session: aiohttp.ClientSession | None
+
+    def _init(self, *args: list[str], **kwargs: dict[str, str]) -> None:
+        self.async_session = None
+        self.proxy_pool = ProxyPool(settings.PARSER_PROXIES, eviction_timeout=settings.PARSER_PROXY_EVICTION_TIMEOUT)
+        self._proxy_sessions: dict[str, aiohttp.ClientSession] = {}
+        self._event_loop = get_event_loop_thread()
+        self._limiters: dict[str, RequestLimiter] = {}
+        # The URL of a first page -> the `ETag` and `Last-Modified` of its last response.
+        self._validators: dict[str, tuple[str, str]] = {}
+        self._hedges: dict[str, HedgePolicy] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._request_semaphore = asyncio.Semaphore(settings.AIOHTTP_REQUEST_LIMIT)
+        atexit.register(self.close)
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run the coroutine on the event loop of the client and wait for its result."""
+        return self._event_loop.run(coro)
+
+    def close(self) -> None:
+        """Close the async sessions, the event loop is owned by the process and keeps running."""
+        if self.async_session is not None:
+            self._event_loop.run(self.async_session.close())
+            self.async_session = None
+        for proxy_session in self._proxy_sessions.values():
+            self._event_loop.run(proxy_session.close())
+        self._proxy_sessions.clear()
+
+    async def _get_async_session(self) -> aiohttp.ClientSession:
+        # The session is created and used only inside the event loop thread, so there is no race on creation.
+        if self.async_session is None:
+            self.async_session = get_async_session()
+        return self.async_session
+
+    async def _get_proxy_session(self, proxy: Proxy) -> aiohttp.ClientSession:
+        # Every proxy has its own connection pool, so the connections (and their limits) of the proxies don't mix.
+        proxy_session = self._proxy_sessions.get(proxy.url)
+        if proxy_session is None:
+            proxy_session = get_async_session()
+            self._proxy_sessions[proxy.url] = proxy_session
+        return proxy_session
+
+    def _get_proxy(self, site: AbstractSite | None) -> Proxy | None:
+        if site is None or not site.use_proxy or not self.proxy_pool:
+            return None
+        return self.proxy_pool.choose()
+
+    def _observe_proxy(self, proxy: Proxy | None, status: int, latency: float) -> None:
+        if proxy is None:
+            return
+
+        self.proxy_pool.on_response(proxy, status, latency)
+        metrics.proxy_score.labels(proxy.name).set(proxy.score)
+        metrics.proxy_evicted.labels(proxy.name).set(proxy.evicted_until > time.monotonic())
+
+    def _get_limiter(self, url: str, site: AbstractSite | None) -> RequestLimiter:
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            if site is None:
+                limiter = RequestLimiter(settings.AIOHTTP_REQUEST_LIMIT)
+            else:
+                controller = None
+                if settings.PARSER_ADAPTIVE_CONCURRENCY:
+                    # Above the connections of the host the requests would queue in the connector and their wait
+                    # would count as the latency of the site.
+                    max_limit = min(settings.AIOHTTP_REQUEST_LIMIT, settings.AIOHTTP_CONNECTION_LIMIT_PER_HOST)
+                    controller = AimdController(site.max_in_flight, max_limit=max_limit)
+                limiter = RequestLimiter(site.max_in_flight, site.requests_per_second, controller=controller)
+            metrics.in_flight_limit.labels(self._get_site_label(site)).set(limiter.limit)
+            self._limiters[host] = limiter
+        return limiter
+
+    def _get_hedge_policy(self, url: str, site: AbstractSite | None) -> HedgePolicy | None:
+        if site is None or not site.hedge_requests or settings.PARSER_HEDGE_MAX_RATE <= 0:
+            return None
+
+        host = urlparse(url).netloc
+        hedge = self._hedges.get(host)
+        if hedge is None:
+            hedge = HedgePolicy(settings.PARSER_HEDGE_MAX_RATE)
+            self._hedges[host] = hedge
+        return hedge
+
+    @staticmethod
+    def _get_site_label(site: AbstractSite | None) -> str:
+        return site.name if site is not None else "unknown"
+
+    def _observe_response(self, site: AbstractSite | None, status: int, body: bytes) -> None:
+        site_label = self._get_site_label(site)
+        metrics.responses.labels(site_label, status).inc()
+        metrics.response_bytes.labels(site_label).inc(len(body))
+
+    def get_breaker(self, url: str, site: AbstractSite | None = None) -> CircuitBreaker:
+        """Use this method to get the circuit breaker of the host of the URL."""
+        host = urlparse(url).netloc
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    site.name if site is not None else host,
+                    failure_threshold=settings.PARSER_CIRCUIT_FAILURE_THRESHOLD,
+                    reset_timeout=settings.PARSER_CIRCUIT_RESET_TIMEOUT,
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def _observe_breaker(self, site: AbstractSite | None, breaker: CircuitBreaker, status: int) -> None:
+        breaker.on_response(status)
+        metrics.circuit_state.labels(self._get_site_label(site)).set(breaker.state)
+
+    def _get_headers(self, page_url: str | None = None) -> dict[str, str]:
+        """Return the headers of a request, with the validators of the page if it's a conditional request."""
+        headers = {"User-Agent": next(user_agent_cycle)}
+        etag, last_modified = self._validators.get(page_url, ("", "")) if page_url is not None else ("", "")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def _remember_validators(self, page_url: str, etag: str, last_modified: str) -> None:
+        if etag or last_modified:
+            self._validators[page_url] = (etag, last_modified)
+        else:
+            self._validators.pop(page_url, None)
 
-    def _init(self, session: Session | None = None, *args: list[str], **kwargs: dict[str, str]) -> None:
-        self.session = session or get_session()
+    @staticmethod
+    def _get_timeout(site: AbstractSite | None) -> aiohttp.ClientTimeout:
+        timeouts = site or AbstractSite
+        return aiohttp.ClientTimeout(
+            total=timeouts.request_timeout,
+            sock_connect=timeouts.connect_timeout,
+            sock_read=timeouts.read_timeout,
+        )
 
-    def _get_headers(self) -> dict[str, str]:
-        return {"User-Agent": next(user_agent_cycle)}
+    def fetch_first_page(
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes | None:
+        """
+        Fetch the first page of the site from the calling thread by `afetch_first_page` on the event loop of the client.
+
+        The conditional request sends the validators of the last response of the page and returns None if the page
+        isn't modified since then.
+
+        Raises `aiohttp.ClientError` if the page can't be fetched, `CircuitOpenError` without a request if the site is
+        down, see `CircuitBreaker`, and `DeadlineExceededError` if the request is cut by the deadline.
+        """
+        return self.run(self.afetch_first_page(page_url, site, deadline, conditional=conditional))
+
+    async def afetch_first_page(
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes | None:
+        """
+        Fetch the first page of the site, raises `aiohttp.ClientError` if the page can't be fetched.
+
+        The conditional request returns None if the page isn't modified, see `fetch_first_page`.
+
+        Raises `CircuitOpenError` without a request if the site is down, so the run of the site fails fast, and
+        `DeadlineExceededError` if the deadline of the run is exceeded.
+        """
+        deadline = deadline or Deadline()
+        deadline.check()
+        self.get_breaker(page_url, site).check()
+        session = await self._get_async_session()
+        limiter = self._get_limiter(page_url, site)
+        async with deadline.timeout():
+            result = await self._async_api_get(
+                session,
+                page_url,
+                limiter=limiter,
+                retry_budget=RetryBudget(retry_options.attempts),
+                site=site,
+                deadline=deadline,
+                headers=self._get_headers(page_url if conditional else None),
+                admitted=True,
+            )
+        if result.status == HTTPStatus.NOT_MODIFIED:
+            return None
+        if not result.ok:
+            raise aiohttp.ClientError(result.error)
+
+        self._remember_validators(page_url, result.etag, result.last_modified)
+        return result.body
+
+    async def _async_api_get(  # noqa: PLR0913
+        self,
+        async_session: aiohttp.ClientSession,
+        url: str,
+        *,
+        limiter: RequestLimiter,
+        retry_budget: RetryBudget,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        hedge: HedgePolicy | None = None,
+        headers: dict[str, str] | None = None,
+        admitted: bool = False,
+    ) -> FetchResult:
+        """
+        Async request to GET data, the errors are returned in the result.
+
+        Retries which would start after the deadline are skipped, the caller cancels the request at the deadline. The
+        slow requests are hedged by the `hedge` policy, see `HedgePolicy`. Every attempt is admitted by the circuit
+        breaker of the site, the first one is `admitted` already if the caller has checked the breaker.
+        """
+        deadline = deadline or Deadline()
+        result = FetchResult(url=url)
+        breaker = self.get_breaker(url, site)
+        started_at = time.monotonic()
+        while True:
+            if deadline.expired:
+                if admitted:
+                    breaker.on_cancel()
+                result.status = 0
+                result.error = f"The deadline of the run is exceeded, URL {url} isn't requested."
+                break
+            if not admitted and not breaker.allow_request():
+                result.status = 0
+                result.error = f"The circuit of site {breaker.name} is open, URL {url} isn't requested."
+                break
+
+            result.attempts += 1
+            try:
+                # A half-open circuit lets one probe through, the probe isn't hedged.
+                attempt = await self._async_hedged_get(
+                    async_session,
+                    url,
+                    limiter=limiter,
+                    site=site,
+                    hedge=hedge if breaker.state == CircuitState.closed else None,
+                    headers=headers,
+                )
+            except asyncio.CancelledError:
+                breaker.on_cancel()
+                raise
+            admitted = False
+
+            result.status, result.body, result.error = attempt.status, attempt.body, attempt.error
+            result.etag, result.last_modified = attempt.etag, attempt.last_modified
+            await limiter.on_response(attempt.status, time.monotonic() - attempt.latency, attempt.latency)
+            self._observe_breaker(site, breaker, result.status)
+            metrics.in_flight_limit.labels(self._get_site_label(site)).set(limiter.limit)
+            self._observe_response(site, result.status, result.body)
+            if result.ok or not is_retryable(result) or result.attempts >= retry_options.attempts:
+                break
+            backoff = retry_options.get_timeout(result.attempts)
+            if backoff >= deadline.remaining() or not retry_budget.take():
+                break
+            metrics.retries.labels(self._get_site_label(site)).inc()
+            await asyncio.sleep(backoff)
 
-    def fetch_first_page(self, page_url: str) -> BeautifulSoup:  # noqa: D102
-        http_response = self.session.get(page_url, headers=self._get_headers())
-        http_response.raise_for_status()
+        result.latency = time.monotonic() - started_at
+        return result
 
-        return BeautifulSoup(http_response.content, "html.parser")
+    async def _async_get(
+        self,
+        async_session: aiohttp.ClientSession,
+        url: str,
+        limiter: RequestLimiter,
+        site: AbstractSite | None,
+        headers: dict[str, str] | None = None,
+    ) -> FetchResult:
+        """
+        Make one request in a slot of the limiter, the latency is measured from the start of the request.
+
+        The request is made via a proxy of the pool if the site has `use_proxy`.
+        """
+        result = FetchResult(url=url, attempts=1)
+        proxy = self._get_proxy(site)
+        if proxy is not None:
+            async_session = await self._get_proxy_session(proxy)
+        started_at = time.monotonic()
+        try:
+            async with limiter.slot(), self._request_semaphore:
+                started_at = time.monotonic()
+                async with async_session.get(
+                    url,
+                    headers=headers or self._get_headers(),
+                    timeout=self._get_timeout(site),
+                    proxy=proxy.url if proxy is not None else None,
+                ) as resp:
+                    result.status = resp.status
+                    result.body = await resp.read() if resp.status == HTTPStatus.OK else b""
+                    result.error = "" if resp.status == HTTPStatus.OK else f"Response {resp.status} for URL {url}."
+                    result.etag = resp.headers.get("ETag", "")
+                    result.last_modified = resp.headers.get("Last-Modified", "")
+        except (aiohttp.ClientError, TimeoutError) as e:
+            result.status = 0
+            result.error = f"{type(e).__name__} for URL {url}: {e}"
 
-    async def _async_api_get(
+        result.latency = time.monotonic() - started_at
+        self._observe_proxy(proxy, result.status, result.latency)
+        return result
+
+    async def _async_hedged_get(  # noqa: PLR0913
         self,
-        async_session: aiohttp.ClientSession | RetryClient,
+        async_session: aiohttp.ClientSession,
         url: str,
-        rid: int,
-    ) -> tuple[int, str]:
-        """Async request to GET data."""
-        semaphore = asyncio.Semaphore(settings.AIOHTTP_REQUEST_LIMIT)
-        async with semaphore, async_session.get(url, headers=self._get_headers()) as resp:
-            if resp.status != 200:  # noqa: PLR2004
-                msg = f"Response {resp.status} fot URL {url}."
-                raise Exception(msg)  # noqa: TRY002
-            return rid, await resp.text()
-
-    async def _async_fetch_announcement_pages(self, pages_map: dict[int, str]) -> dict[int, str]:
-        async with get_retry_client() as session:
-            tasks = (
-                asyncio.ensure_future(self._async_api_get(session, url, rid=_id)) for _id, url in pages_map.items()
+        *,
+        limiter: RequestLimiter,
+        site: AbstractSite | None,
+        hedge: HedgePolicy | None,
+        headers: dict[str, str] | None = None,
+    ) -> FetchResult:
+        """
+        Make one request, a duplicate is sent if the request is slower than the delay of the hedge policy.
+
+        The first successful response wins and the other request is cancelled. Both requests take a slot of the limiter.
+        The latency of the request is measured from the start of the first one, even if the duplicate wins.
+        """
+        delay = hedge.on_request() if hedge is not None else None
+        if hedge is None or delay is None:
+            attempt = await self._async_get(async_session, url, limiter, site, headers)
+        else:
+            attempt = await self._async_race(
+                async_session,
+                url,
+                limiter=limiter,
+                site=site,
+                hedge=hedge,
+                delay=delay,
             )
-            result = await asyncio.gather(*tasks)
-        return dict(result)
 
-    def fetch_announcement_pages(  # noqa: D102
+        if hedge is not None and attempt.ok:
+            hedge.on_response(attempt.latency)
+        return attempt
+
+    async def _async_race(  # noqa: PLR0913
+        self,
+        async_session: aiohttp.ClientSession,
+        url: str,
+        *,
+        limiter: RequestLimiter,
+        site: AbstractSite | None,
+        hedge: HedgePolicy,
+        delay: float,
+    ) -> FetchResult:
+        started_at = time.monotonic()
+        tasks = [asyncio.create_task(self._async_get(async_session, url, limiter, site))]
+        try:
+            done, pending = await asyncio.wait(tasks, timeout=delay)
+            if not done and hedge.take():
+                tasks.append(asyncio.create_task(self._async_get(async_session, url, limiter, site)))
+                pending.add(tasks[-1])
+
+            while not done or (pending and not any(task.result().ok for task in done)):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            winner = next((task for task in done if task.result().ok), next(iter(done)))
+            finished_at = time.monotonic()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if len(tasks) > 1:
+            hedge_result = HedgeResult.won if winner is tasks[-1] else HedgeResult.lost
+            metrics.hedged_requests.labels(self._get_site_label(site), hedge_result).inc()
+
+        result = winner.result()
+        # The duplicate starts after the delay, its own latency would pull the quantile of the hedge policy down.
+        result.latency = finished_at - started_at
+        return result
+
+    async def _async_stream_announcement_pages(
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None,
+        output: asyncio.Queue[tuple[str, FetchResult] | None],
+        deadline: Deadline,
+        retry_budget: RetryBudget,
+    ) -> None:
+        """
+        Fetch the pages by a fixed number of workers and put the results to the output queue as they complete.
+
+        The queue is bounded, when the consumer is slow the workers wait on it and don't start new requests, so at most
+        `AIOHTTP_REQUEST_LIMIT + PARSER_PIPELINE_QUEUE_SIZE` bodies are kept in memory. `None` marks the end. The
+        workers are cancelled at the deadline and `DeadlineExceededError` is raised.
+        """
+        session = await self._get_async_session()
+        pending = iter(pages_map.items())
+
+        async def worker() -> None:
+            for external_id, url in pending:
+                limiter = self._get_limiter(url, site)
+                result = await self._async_api_get(
+                    session,
+                    url,
+                    limiter=limiter,
+                    retry_budget=retry_budget,
+                    site=site,
+                    deadline=deadline,
+                    hedge=self._get_hedge_policy(url, site),
+                )
+                await output.put((external_id, result))
+
+        try:
+            async with deadline.timeout(), asyncio.TaskGroup() as task_group:
+                for _ in range(min(len(pages_map), settings.AIOHTTP_REQUEST_LIMIT)):
+                    task_group.create_task(worker())
+        except Exception:
+            await output.put(None)
+            raise
+
+        await output.put(None)
+
+    async def aiter_announcement_pages(
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> AsyncGenerator[tuple[str, FetchResult], None]:
+        """
+        Fetch the announcement pages and yield `(external_id, result)` pairs in the order of completion.
+
+        The requests are scheduled by the limits of the site. When the iteration is stopped, the remaining requests
+        are cancelled. At the deadline the pages fetched so far are yielded and `DeadlineExceededError` is raised.
+
+        The retries are taken from the `retry_budget` of the run, the calls of one run share it. Without it the call
+        has its own budget of `PARSER_RETRY_BUDGET` retries.
+        """
+        output: asyncio.Queue[tuple[str, FetchResult] | None] = asyncio.Queue(
+            maxsize=settings.PARSER_PIPELINE_QUEUE_SIZE,
+        )
+        producer = asyncio.create_task(
+            self._async_stream_announcement_pages(
+                pages_map,
+                site,
+                output,
+                deadline or Deadline(),
+                retry_budget or RetryBudget(settings.PARSER_RETRY_BUDGET),
+            ),
+        )
+        try:
+            while (item := await output.get()) is not None:
+                yield item
+            await producer
+        finally:
+            producer.cancel()
+
+    def iter_announcement_pages(
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> Iterator[tuple[str, FetchResult]]:
+        """Fetch the announcement pages and yield `(external_id, result)` pairs, see `aiter_announcement_pages`."""
+        async_iterator = self.aiter_announcement_pages(
+            pages_map,
+            site=site,
+            deadline=deadline,
+            retry_budget=retry_budget,
+        )
+        try:
+            while True:
+                try:
+                    yield self._event_loop.run(anext(async_iterator))
+                except StopAsyncIteration:
+                    return
+        finally:
+            self._event_loop.run(async_iterator.aclose())
+
+    def fetch_announcement_pages(
         self,
-        pages_map: dict[int, str],
-    ) -> dict[int, BeautifulSoup]:
-        announcement_pages: dict[int, BeautifulSoup] = {}
-        for external_id, context in asyncio.run(self._async_fetch_announcement_pages(pages_map)).items():
-            announcement_pages[external_id] = BeautifulSoup(context, "html.parser")
-        return announcement_pages
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> dict[str, FetchResult]:
+        """Fetch the announcement pages, the requests are scheduled by the limits of the site."""
+        fetch_results = dict(
+            self.iter_announcement_pages(pages_map, site=site, deadline=deadline, retry_budget=retry_budget),
+        )
+        return {external_id: fetch_results[external_id] for external_id in pages_map}
@@ -0,0 +1,88 @@
+from __future__ import annotations  # noqa: D100
+
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from easyhome.parser.benchmark import (
+    find_regressions,
+    get_calibration_benchmark,
+    get_site_benchmarks,
+    normalize_results,
+    read_baseline,
+    run_benchmarks,
+    write_baseline,
+)
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+
+class Command(BaseCommand):  # noqa: D101
+    help = "Measure the site parsers over the dataset pages and compare them with the baseline."
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument("--dataset", type=Path, default=settings.BASE_DIR / "tests/parser/__dataset__")
+        parser.add_argument("--baseline", type=Path, default=settings.BASE_DIR / "baselines/parsers.json")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=settings.PARSER_BENCHMARK_MAX_REGRESSION,
+            help="Fail if a benchmark is slower than the baseline by more than this percent of the calibration time.",
+        )
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--min-time", type=float, default=0.1, help="The minimal time of a round in seconds.")
+        parser.add_argument("--output", type=Path, help="Store the results as JSON.")
+        parser.add_argument("--write-baseline", action="store_true", help="Store the results as the new baseline.")
+
+    def handle(self, *args: Any, **options: Any) -> str | None:  # noqa: ANN401, D102
+        calibration = get_calibration_benchmark()
+        benchmarks = [
+            calibration,
+            *(
+                benchmark
+                for site in (Lalafo(), Diesel(), House())
+                for benchmark in get_site_benchmarks(site, options["dataset"])
+            ),
+        ]
+        seconds = run_benchmarks(benchmarks, rounds=options["rounds"], min_time=options["min_time"])
+        results = normalize_results(seconds)
+
+        if options["write_baseline"]:
+            write_baseline(options["baseline"], results)
+            self.stdout.write(f"The baseline {options['baseline']} is written.")
+            return None
+
+        baseline = read_baseline(options["baseline"])
+        regressions = find_regressions(results, baseline, options["max_regression"])
+        if regressions:
+            # A busy machine slows down a benchmark by chance, so the regressions are measured again before failing.
+            regressed = {regression.name for regression in regressions}
+            rerun_results = normalize_results(
+                run_benchmarks(
+                    [calibration, *(benchmark for benchmark in benchmarks if benchmark.name in regressed)],
+                    rounds=options["rounds"],
+                    min_time=options["min_time"],
+                ),
+            )
+            results.update({name: min(results[name], relative) for name, relative in rerun_results.items()})
+            regressions = find_regressions(results, baseline, options["max_regression"])
+
+        if options["output"]:
+            write_baseline(options["output"], results)
+
+        self.stdout.write(f"{calibration.name:<50} {seconds[calibration.name] * 1000:>9.3f} ms")
+        for name, current in results.items():
+            line = f"{name:<50} {seconds[name] * 1000:>9.3f} ms {current:>8.3f} x"
+            if name in baseline:
+                line += f" {(current / baseline[name] - 1) * 100:>+8.1f}%"
+            self.stdout.write(line)
+
+        if regressions:
+            names = ", ".join(f"{r.name} ({r.change:+.1f}%)" for r in regressions)
+            msg = f"The benchmarks regressed by more than {options['max_regression']}%: {names}"
+            raise CommandError(msg)
+
+        return None
@@ -0,0 +1,92 @@
+from __future__ import annotations  # noqa: D100
+
+import time
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandParser
+from django.db import transaction
+
+from easyhome.easyhome.models import Apartment
+from easyhome.parser.deadline import Deadline
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.simulator import SimulatorConfig, SiteSimulator
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+
+class Command(BaseCommand):  # noqa: D101
+    help = "Crawl the simulated sites through HttpClient and ParseSiteService and measure the throughput."
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401, D107
+        super().__init__(*args, **kwargs)
+
+        self.sites = {
+            "lalafo": Lalafo(listing_only=settings.LALAFO_LISTING_ONLY),
+            "diesel": Diesel(),
+            "house": House(),
+        }
+
+    def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
+        parser.add_argument(
+            "--site",
+            action="append",
+            choices=list(self.sites),
+            help="The sites to crawl, all by default.",
+        )
+        parser.add_argument("--dataset", type=Path, default=settings.BASE_DIR / "tests/parser/__dataset__")
+        parser.add_argument("--pages", type=int, default=10, help="The number of the list pages of every site.")
+        parser.add_argument("--latency", type=float, default=0.0, help="The delay of every response in seconds.")
+        parser.add_argument("--jitter", type=float, default=0.0, help="The random extra delay in seconds.")
+        parser.add_argument("--error-rate", type=float, default=0.0, help="The share of the 502/503/504 responses.")
+        parser.add_argument("--slow-rate", type=float, default=0.0, help="The share of the slow-loris responses.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--max-in-flight", type=int, help="Override the requests in flight limit of the sites.")
+        parser.add_argument(
+            "--requests-per-second",
+            type=float,
+            help="Override the rate limit of the sites, 0 disables it.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:  # noqa: ANN401, D102
+        config = SimulatorConfig(
+            pages=options["pages"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            error_rate=options["error_rate"],
+            slow_rate=options["slow_rate"],
+            seed=options["seed"],
+        )
+        for name in options["site"] or list(self.sites):
+            simulator = SiteSimulator(self.sites[name], options["dataset"], config)
+            simulator.start()
+            try:
+                site = simulator.get_site()
+                if options["max_in_flight"] is not None:
+                    site.max_in_flight = options["max_in_flight"]
+                if options["requests_per_second"] is not None:
+                    site.requests_per_second = options["requests_per_second"]
+
+                # The crawled apartments are synthetic, they are rolled back after the measurement.
+                with transaction.atomic():
+                    stored_before = Apartment.objects.filter(site=site.name).count()
+                    started_at = time.perf_counter()
+                    # The whole crawl is measured, it isn't cut by the deadline of the scheduled runs.
+                    ParseSiteService(http_client=HttpClient(), site=site).parse(Deadline())
+                    elapsed = time.perf_counter() - started_at
+                    apartments = Apartment.objects.filter(site=site.name).count() - stored_before
+                    transaction.set_rollback(True)
+            finally:
+                simulator.stop()
+
+            stats = simulator.stats
+            self.stdout.write(
+                f"{name}: {stats.requests} requests ({stats.list_pages} list, {stats.detail_pages} detail, "
+                f"{stats.errors} errors, {stats.slow_responses} slow) in {elapsed:.2f} s: "
+                f"{stats.requests / elapsed:.1f} requests/s, {apartments} apartments stored",
+            )
+
+        return None
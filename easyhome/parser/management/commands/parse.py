@@ -1,12 +1,18 @@
 from __future__ import annotations  # noqa: D100
 
+from pathlib import Path
 from typing import Any
 
+from django.conf import settings
 from django.core.management import BaseCommand, CommandParser
 
+from easyhome.parser.archive import PageArchive
 from easyhome.parser.http_client import HttpClient
+from easyhome.parser.orchestrator import CrawlOrchestrator
+from easyhome.parser.replay import ReplayService, iter_replay_pages
 from easyhome.parser.services import ParseSiteService
 from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
 from easyhome.parser.sites.lalafo import Lalafo
 
 
@@ -15,20 +21,53 @@ class Command(BaseCommand):  # noqa: D101
         super().__init__(*args, **kwargs)
 
         self.sites = {
-            "lalafo": Lalafo(),
+            "lalafo": Lalafo(listing_only=settings.LALAFO_LISTING_ONLY),
             "diesel": Diesel(),
+            "house": House(),
         }
 
     def add_arguments(self, parser: CommandParser) -> None:  # noqa: D102
         parser.add_argument("--site")
+        parser.add_argument("--all", action="store_true", help="Crawl all sites concurrently.")
+        parser.add_argument(
+            "--replay",
+            type=Path,
+            metavar="DIR",
+            help="Parse the stored pages of the archive or of a directory of <site>_<name>.html files offline.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Don't store the replayed apartments.")
 
     def handle(self, *args: Any, **options: Any) -> str | None:  # noqa: ANN401, D102
+        if options["replay"]:
+            self.replay(options["replay"], site=options["site"], dry_run=options["dry_run"])
+            return None
+
+        archive = PageArchive.from_settings()
+        if options["all"]:
+            http_client = HttpClient()
+            services = [
+                ParseSiteService(http_client=http_client, site=site, archive=archive) for site in self.sites.values()
+            ]
+            CrawlOrchestrator(http_client=http_client, services=services).crawl()
+            return None
+
         site = options["site"]
         site_parser = self.sites.get(site)
         if not site_parser:
             self.stdout.write(f"The site {site} not found.")
             return
 
-        use_case = ParseSiteService(http_client=HttpClient(), site=site_parser)
+        use_case = ParseSiteService(http_client=HttpClient(), site=site_parser, archive=archive)
         use_case.parse()
         return None
+
+    def replay(self, path: Path, *, site: str | None, dry_run: bool) -> None:  # noqa: D102
+        sites = self.sites
+        if site:
+            if site not in self.sites:
+                self.stdout.write(f"The site {site} not found.")
+                return
+            sites = {site: self.sites[site]}
+
+        stats = ReplayService(sites=sites, dry_run=dry_run).replay(iter_replay_pages(path))
+        self.stdout.write(stats.report())
@@ -0,0 +1,151 @@
+"""
+Use this module to export the metrics of the crawler for Prometheus.
+
+The metrics are labelled by the site and, for the durations, by the stage of the crawl, so it's visible which stage
+takes the time of a run. Under gunicorn every worker (and every worker of the `ParsePool`) has its own metrics, set
+`PROMETHEUS_MULTIPROC_DIR` to an empty directory to collect them together, see `bin/gunicorn.sh`.
+"""
+from __future__ import annotations
+
+import enum
+import os
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.multiprocess import MultiProcessCollector
+
+if TYPE_CHECKING:
+    from apscheduler.events import JobSubmissionEvent
+
+
+class Stage(enum.StrEnum):
+    """Use this class to define the stages of the crawl."""
+
+    first_page = "first_page"
+    pages_map = "pages_map"
+    filter = "filter"
+    fetch = "fetch"
+    parse = "parse"
+    insert = "insert"
+
+
+class AnnouncementResult(enum.StrEnum):
+    """Use this class to define what happened to the announcements of the list pages."""
+
+    new = "new"
+    skipped = "skipped"
+    failed = "failed"
+
+
+class RunResult(enum.StrEnum):
+    """Use this class to define how a run of a site ended."""
+
+    completed = "completed"
+    cut_short = "cut_short"
+    skipped = "skipped"
+    failed = "failed"
+
+
+class ListPageResult(enum.StrEnum):
+    """Use this class to define what was fetched for a list page."""
+
+    not_modified = "not_modified"
+    unchanged = "unchanged"
+    changed = "changed"
+
+
+class HedgeResult(enum.StrEnum):
+    """Use this class to define which request of a hedged pair answered first."""
+
+    won = "won"
+    lost = "lost"
+
+
+stage_duration = Histogram(
+    "easyhome_parser_stage_duration_seconds",
+    "The duration of the stages of the crawl, the fetch and the parse stages are measured per page.",
+    ["site", "stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+response_bytes = Counter(
+    "easyhome_parser_response_bytes",
+    "The size of the fetched pages.",
+    ["site"],
+)
+responses = Counter(
+    "easyhome_parser_responses",
+    "The responses of the sites by the HTTP status, 0 is a connection error.",
+    ["site", "status"],
+)
+retries = Counter(
+    "easyhome_parser_retries",
+    "The retried requests.",
+    ["site"],
+)
+announcements = Counter(
+    "easyhome_parser_announcements",
+    "The announcements of the list pages: stored as new, skipped as known, or failed to fetch or to parse.",
+    ["site", "result"],
+)
+list_pages = Counter(
+    "easyhome_parser_list_pages",
+    "The list pages: not modified (304), unchanged (the same ids as a page with only known announcements) or changed.",
+    ["site", "result"],
+)
+runs = Counter(
+    "easyhome_parser_runs",
+    "The runs of the sites: completed, cut short by the deadline, skipped by the open circuit or failed.",
+    ["site", "result"],
+)
+hedged_requests = Counter(
+    "easyhome_parser_hedged_requests",
+    "The duplicates of the slow requests: won if the duplicate answered first, lost if the original one did.",
+    ["site", "result"],
+)
+in_flight_limit = Gauge(
+    "easyhome_parser_in_flight_limit",
+    "The current limit of the requests in flight of the site, it's adapted to the responses of the site.",
+    ["site"],
+    multiprocess_mode="livemostrecent",
+)
+circuit_state = Gauge(
+    "easyhome_parser_circuit_state",
+    "The state of the circuit breaker of the site: 0 is closed, 1 is open and 2 is half-open.",
+    ["site"],
+    multiprocess_mode="livemostrecent",
+)
+proxy_score = Gauge(
+    "easyhome_parser_proxy_score",
+    "The score of the proxy by its latency and error rate, the requests are spread over the proxies by their scores.",
+    ["proxy"],
+    multiprocess_mode="livemostrecent",
+)
+proxy_evicted = Gauge(
+    "easyhome_parser_proxy_evicted",
+    "1 if the proxy is evicted for too many errors, 0 otherwise.",
+    ["proxy"],
+    multiprocess_mode="livemostrecent",
+)
+scheduler_lag = Histogram(
+    "easyhome_scheduler_lag_seconds",
+    "The delay between the scheduled time of a job and its submission to the executor.",
+    buckets=(0.01, 0.1, 0.5, 1, 5, 15, 30, 60, 120, 300),
+)
+
+
+def observe_scheduler_lag(event: JobSubmissionEvent) -> None:
+    """Use this function as a listener of the `EVENT_JOB_SUBMITTED` events of the scheduler."""
+    now = datetime.now(tz=UTC)
+    for scheduled_run_time in event.scheduled_run_times:
+        scheduler_lag.observe(max((now - scheduled_run_time).total_seconds(), 0))
+
+
+def get_registry() -> CollectorRegistry:
+    """Use this function to get the registry to export, it collects the metrics of all processes if it is enabled."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    return registry
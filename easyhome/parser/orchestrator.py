@@ -0,0 +1,56 @@
+"""Use this module to crawl all sites at once."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from easyhome.parser.circuit_breaker import CircuitOpenError
+from easyhome.parser.deadline import Deadline
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from easyhome.parser.services import HttpClientProtocol, ParseSiteService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CrawlOrchestrator:
+    """
+    Use this class to crawl the sites concurrently on the event loop of the HTTP client.
+
+    Every site is parsed by `ParseSiteService.aparse`, a failed site is logged and doesn't stop the others, a site which
+    is down is skipped by its open circuit without requests. The requests of all sites share the global budget of the
+    client (`AIOHTTP_REQUEST_LIMIT` requests in flight) on top of the limits of every site.
+
+    The sites share the deadline of the crawl (`PARSER_RUN_TIMEOUT`), so the crawl ends before the next one is due.
+    """
+
+    http_client: HttpClientProtocol
+    services: Sequence[ParseSiteService]
+
+    def crawl(self) -> None:
+        """Use this method to crawl the sites, it blocks until all of them are done."""
+        self.http_client.run(self.acrawl())
+
+    async def acrawl(self) -> None:  # noqa: D102
+        deadline = Deadline(settings.PARSER_RUN_TIMEOUT)
+        results = await asyncio.gather(
+            *(service.aparse(deadline) for service in self.services),
+            return_exceptions=True,
+        )
+        for service, result in zip(self.services, results, strict=True):
+            if isinstance(result, CircuitOpenError):
+                logger.warning("Skip site %s: %s", service.site.name, result)
+            elif isinstance(result, Exception):
+                logger.error("Can't parse site %s", service.site.name, exc_info=result)
+
+        # The async ORM runs the queries in the thread of `sync_to_async`, no request closes its connection.
+        await sync_to_async(close_old_connections)()
@@ -0,0 +1,89 @@
+"""Use this module to parse the announcement pages in worker processes."""
+from __future__ import annotations
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import django
+from django.conf import settings
+
+from easyhome.common.utils import Singleton
+from easyhome.parser.archive import PageKind, archive_page
+from easyhome.parser.metrics import Stage, stage_duration
+
+if TYPE_CHECKING:
+    from easyhome.parser.archive import PageArchive
+    from easyhome.parser.entity import ApartmentEntity
+    from easyhome.parser.sites.base import AbstractSite
+
+
+def parse_apartment(site: AbstractSite, content: bytes, archive: PageArchive | None = None) -> ApartmentEntity:
+    """
+    Use this function to archive the announcement page and parse the apartment from it.
+
+    It's run by the worker processes and by the service itself when the pool is disabled. The page is archived before
+    the parsing, so the pages which can't be parsed are kept too. The parse duration of the workers is exported in the
+    multiprocess mode of the metrics only.
+    """
+    page_hash = archive_page(archive, site.name, PageKind.detail, content)
+    with stage_duration.labels(site.name, Stage.parse).time():
+        apartment = site.parse_apartment_from_content(content)
+    apartment.page_hash = page_hash
+    return apartment
+
+
+def setup_worker() -> None:
+    """Use this function to set up Django in a worker process, the scheduler of the web worker isn't started there."""
+    settings.SCHEDULER_ENABLED = False
+    django.setup()
+
+
+class ParsePool(Singleton):
+    """
+    Returns the pool of worker processes which parse the announcement pages.
+
+    The parsing is CPU-bound and the scheduler threads run inside the web worker, so the pages are parsed by
+    `PARSER_POOL_SIZE` worker processes: the page bytes are sent to the workers and the apartments come back. The pool
+    is created on the first use and lives until the process exits, `PARSER_POOL_SIZE = 0` disables it and the pages
+    are parsed in-process.
+
+    The workers are spawned instead of forked, the web worker has running threads (the scheduler, the event loop of
+    the HTTP client) and a forked child would inherit their locks. The spawned workers set up Django without the
+    scheduler, otherwise every worker would run the crawl jobs too, see `setup_worker`.
+    """
+
+    executor: ProcessPoolExecutor | None
+
+    def _init(self, *args: list[str], **kwargs: dict[str, str]) -> None:
+        self.executor = None
+        self._max_workers = 0
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def get_executor(self) -> ProcessPoolExecutor | None:
+        """Use this method to get the pool, returns None if the pages are parsed in-process."""
+        max_workers = settings.PARSER_POOL_SIZE
+        with self._lock:
+            if self.executor is not None and self._max_workers != max_workers:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+
+            if self.executor is None and max_workers > 0:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=setup_worker,
+                )
+                self._max_workers = max_workers
+
+            return self.executor
+
+    def close(self) -> None:
+        """Shut down the worker processes, the next `get_executor` call starts new ones."""
+        with self._lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
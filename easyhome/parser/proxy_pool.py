@@ -0,0 +1,101 @@
+"""Use this module to spread the requests of the sites over several proxies."""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from easyhome.parser.rate_limit import AimdController
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class Proxy:
+    """Use this class to keep the health of one proxy, the latency and the error rate are moving averages."""
+
+    url: str
+    latency: float = 0.0
+    error_rate: float = 0.0
+    requests: int = 0
+    evicted_until: float = 0.0
+
+    @property
+    def name(self) -> str:
+        """Return the host and the port of the proxy, without the credentials, e.g. for the metrics."""
+        url_parts = urlsplit(self.url)
+        return f"{url_parts.hostname}:{url_parts.port}" if url_parts.port else str(url_parts.hostname)
+
+    @property
+    def score(self) -> float:
+        """Return the share of the load of the proxy: fast proxies without errors get more requests."""
+        return (1 - self.error_rate) / max(self.latency, 0.01)
+
+
+class ProxyPool:
+    """
+    Use this class to choose a proxy for every request of the sites with `use_proxy`.
+
+    The proxies are chosen at random weighted by their scores, so the load follows the health of the proxies. A proxy
+    is scored by the moving averages of its latency and error rate (429, 5xx and connection errors), a new proxy gets
+    the best score of the pool until it's measured. After `min_requests` requests a proxy with the error rate of
+    `max_error_rate` is evicted for `eviction_timeout` seconds, then it's tried again with a clean error rate. If all
+    proxies are evicted, the one which comes back first is used.
+
+    One pool serves all sites with `use_proxy`, so a proxy evicted by the errors of one site isn't used by the others
+    until its eviction ends.
+    """
+
+    # The weight of a new response in the moving averages.
+    weight = 0.2
+
+    def __init__(  # noqa: D107
+        self,
+        proxy_urls: list[str],
+        *,
+        max_error_rate: float = 0.5,
+        min_requests: int = 5,
+        eviction_timeout: float = 60,
+        seed: int | None = None,
+    ) -> None:
+        self.proxies = [Proxy(url) for url in proxy_urls]
+        self.max_error_rate = max_error_rate
+        self.min_requests = min_requests
+        self.eviction_timeout = eviction_timeout
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:  # noqa: D105
+        return bool(self.proxies)
+
+    def choose(self) -> Proxy:
+        """Use this method to choose the proxy of a request."""
+        now = time.monotonic()
+        with self._lock:
+            available = [proxy for proxy in self.proxies if proxy.evicted_until <= now]
+            if not available:
+                return min(self.proxies, key=lambda proxy: proxy.evicted_until)
+
+            best_score = max((proxy.score for proxy in available if proxy.requests), default=1.0)
+            weights = [proxy.score if proxy.requests else best_score for proxy in available]
+            return self._random.choices(available, weights=weights)[0]
+
+    def on_response(self, proxy: Proxy, status: int, latency: float) -> None:
+        """Use this method to report the status (0 is a connection error) and the latency of a response via proxy."""
+        is_error = AimdController.is_overloaded(status)
+        with self._lock:
+            if proxy.requests == 0:
+                proxy.latency, proxy.error_rate = latency, float(is_error)
+            else:
+                proxy.latency += self.weight * (latency - proxy.latency)
+                proxy.error_rate += self.weight * (is_error - proxy.error_rate)
+            proxy.requests += 1
+
+            if proxy.requests >= self.min_requests and proxy.error_rate >= self.max_error_rate:
+                logger.warning("Evict proxy %s, its error rate is %.2f", proxy.name, proxy.error_rate)
+                proxy.evicted_until = time.monotonic() + self.eviction_timeout
+                proxy.error_rate = 0.0
+                proxy.requests = 0
@@ -0,0 +1,174 @@
+"""Use this module to limit the requests made to the sites."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+class TokenBucket:
+    """
+    Use this class to limit the rate of the requests.
+
+    The bucket is refilled with `rate` tokens per second up to `capacity` tokens, each request takes one token and
+    waits for it when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:  # noqa: D107
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        """Take one token, wait until it is available."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class AimdController:
+    """
+    Use this class to adapt the limit of the requests in flight to the load a host can take at the moment (AIMD).
+
+    The limit grows by one after `limit` healthy responses, i.e. about once per round of requests, up to `max_limit`.
+    It's cut by `decrease_factor` down to `min_limit` on a 429, a 5xx, a connection error or a latency spike: a
+    response slower than `latency_spike_factor` times the average latency of the healthy responses (and slower than
+    `min_spike_latency` seconds, so the jitter of fast responses isn't a spike). The responses of the requests started
+    before the last cut don't cut the limit again, so a burst of errors cuts it once.
+    """
+
+    # The weight of a new latency in the average latency of the healthy responses.
+    latency_weight = 0.2
+
+    def __init__(  # noqa: D107, PLR0913
+        self,
+        limit: int,
+        *,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        decrease_factor: float = 0.5,
+        latency_spike_factor: float = 3.0,
+        min_spike_latency: float = 1.0,
+    ) -> None:
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit or limit, limit)
+        self.decrease_factor = decrease_factor
+        self.latency_spike_factor = latency_spike_factor
+        self.min_spike_latency = min_spike_latency
+        self.average_latency: float | None = None
+        self._healthy_responses = 0
+        self._decreased_at = -math.inf
+
+    @staticmethod
+    def is_overloaded(status: int) -> bool:
+        """Return True if the status shows that the host is overloaded, 0 is a connection error."""
+        return status in {0, HTTPStatus.TOO_MANY_REQUESTS} or status >= HTTPStatus.INTERNAL_SERVER_ERROR
+
+    def is_latency_spike(self, latency: float) -> bool:
+        """Return True if the response is much slower than the healthy ones."""
+        return (
+            self.average_latency is not None
+            and latency > self.min_spike_latency
+            and latency > self.latency_spike_factor * self.average_latency
+        )
+
+    def on_response(self, status: int, started_at: float, latency: float) -> int:
+        """Use this method to adapt the limit by the response of the request started at `started_at`."""
+        if self.is_overloaded(status) or self.is_latency_spike(latency):
+            if started_at >= self._decreased_at:
+                self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+                self._decreased_at = time.monotonic()
+                self._healthy_responses = 0
+            return self.limit
+
+        if self.average_latency is None:
+            self.average_latency = latency
+        else:
+            self.average_latency += self.latency_weight * (latency - self.average_latency)
+
+        self._healthy_responses += 1
+        if self._healthy_responses >= self.limit:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self._healthy_responses = 0
+        return self.limit
+
+
+class RequestLimiter:
+    """
+    Use this class to schedule the requests to one host.
+
+    At most `limit` requests are in flight at the same time and, when `requests_per_second` is set, they are started
+    not faster than the token bucket allows. The limit can be changed at any time, waiting requests pick it up. With
+    a controller the limit follows the responses reported by `on_response`, see `AimdController`.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        limit: int,
+        requests_per_second: float = 0,
+        controller: AimdController | None = None,
+    ) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.controller = controller
+        self._condition = asyncio.Condition()
+        self._bucket = TokenBucket(requests_per_second) if requests_per_second > 0 else None
+
+    async def on_response(self, status: int, started_at: float, latency: float) -> None:
+        """Use this method to report the response of a request to the controller of the limit."""
+        if self.controller is None:
+            return
+
+        limit = self.controller.on_response(status, started_at, latency)
+        if limit != self.limit:
+            async with self._condition:
+                self.limit = limit
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Wait for a free slot (and a token) and hold it while the request is made."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+        try:
+            if self._bucket is not None:
+                await self._bucket.acquire()
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+
+
+class RetryBudget:
+    """Use this class to limit the retries of one run, each retry takes one unit of the budget."""
+
+    def __init__(self, retries: int) -> None:  # noqa: D107
+        self.retries = retries
+        self.used = 0
+
+    def take(self) -> bool:
+        """Take one retry from the budget, return False if the budget is exhausted."""
+        if self.used >= self.retries:
+            return False
+        self.used += 1
+        return True
@@ -0,0 +1,265 @@
+"""Use this module to parse the stored pages of the sites again, without the network."""
+from __future__ import annotations
+
+import contextlib
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from easyhome.easyhome.models import Apartment
+from easyhome.parser.archive import PageArchive, PageKind
+from easyhome.parser.services import ParseSiteService
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from easyhome.parser.entity import ApartmentEntity
+    from easyhome.parser.sites.base import AbstractSite
+
+logger = logging.getLogger(__name__)
+
+# The fields which are updated when a stored apartment is parsed again.
+replay_update_fields = (
+    "url",
+    "topic",
+    "phone",
+    "rooms",
+    "body",
+    "price",
+    "currency",
+    "area",
+    "city",
+    "room_type",
+    "floor",
+    "max_floor",
+    "district",
+    "lat",
+    "lon",
+    "images_count",
+    "page_hash",
+)
+
+
+@dataclass(slots=True)
+class ReplayPage:
+    """Use this class to describe a stored page, the content is read lazily."""
+
+    site: str
+    kind: PageKind
+    name: str
+    read: Callable[[], bytes]
+    page_hash: str = ""
+
+
+def iter_replay_pages(path: Path) -> Iterator[ReplayPage]:
+    """
+    Use this function to iterate over the stored pages of the directory.
+
+    The directory is either the root of a `PageArchive` or a directory of `<site>_<name>.html` files, where the
+    `<site>_first_page.html` files are the list pages (like `tests/parser/__dataset__`). The archived pages are ordered
+    by the time they were stored, so the newest snapshot of an announcement is replayed last and wins.
+    """
+    archive = PageArchive(path)
+    archived_pages = sorted(archive.iter_pages(), key=lambda page: page.path.stat().st_mtime)
+    if archived_pages:
+        for page in archived_pages:
+            yield ReplayPage(
+                site=page.site,
+                kind=page.kind,
+                name=page.digest,
+                read=lambda page=page: archive.read(page),
+                page_hash=page.digest,
+            )
+        return
+
+    for page_path in sorted(path.glob("*_*.html")):
+        site, _, name = page_path.stem.partition("_")
+        yield ReplayPage(
+            site=site,
+            kind=PageKind.list if name == "first_page" else PageKind.detail,
+            name=name,
+            read=page_path.read_bytes,
+        )
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """Use this class to collect the statistics of the replay, the timings of the stages are in seconds."""
+
+    list_pages: int = 0
+    detail_pages: int = 0
+    skipped_pages: int = 0
+    announcements: int = 0
+    apartments: int = 0
+    failures: int = 0
+    elapsed: float = 0.0
+    timings: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    @property
+    def pages(self) -> int:  # noqa: D102
+        return self.list_pages + self.detail_pages
+
+    @property
+    def pages_per_second(self) -> float:  # noqa: D102
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        """Use this method to get the human-readable report of the replay."""
+        stages = ", ".join(f"{stage} {seconds:.2f} s" for stage, seconds in self.timings.items())
+        return (
+            f"Replayed {self.pages} pages ({self.list_pages} list, {self.detail_pages} detail) "
+            f"in {self.elapsed:.2f} s: {self.pages_per_second:.1f} pages/s\n"
+            f"Announcements on the list pages: {self.announcements}\n"
+            f"Apartments: {self.apartments} parsed, {self.failures} failed, {self.skipped_pages} pages skipped\n"
+            f"Stages: {stages}"
+        )
+
+
+@dataclass(slots=True)
+class ReplayBatch:
+    """
+    Use this class to collect the apartments of a site to be saved, one apartment per external id.
+
+    An apartment parsed from its announcement page takes precedence over the one built from a list page, whatever the
+    order of the pages, otherwise the last page wins.
+    """
+
+    details: dict[str, ApartmentEntity] = field(default_factory=dict)
+    listings: dict[str, ApartmentEntity] = field(default_factory=dict)
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.details) + len(self.listings)
+
+    def add(self, kind: PageKind, apartments: list[ApartmentEntity]) -> None:  # noqa: D102
+        for apartment in apartments:
+            if kind == PageKind.detail:
+                self.details[apartment.external_id] = apartment
+                self.listings.pop(apartment.external_id, None)
+            elif apartment.external_id not in self.details:
+                self.listings[apartment.external_id] = apartment
+
+    def clear(self) -> None:  # noqa: D102
+        self.details.clear()
+        self.listings.clear()
+
+
+@dataclass(slots=True)
+class ReplayService:
+    """
+    Use this class to parse the stored pages again, e.g. after a fix of a parser or to measure its throughput.
+
+    The list pages go through `get_announcement_pages_map_from_content` (and build the complete listing apartments of
+    the sites in the listing-only mode, like `ParseSiteService`), the detail pages go through
+    `parse_apartment_from_content`. The apartments are stored by batches of `PARSER_INSERT_BATCH_SIZE`, the stored ones
+    are updated with the new results of their announcement pages. The listing apartments only add the new apartments,
+    they never overwrite the fields parsed from the announcement pages. The dry run doesn't touch the database.
+    """
+
+    sites: dict[str, AbstractSite]
+    dry_run: bool = False
+
+    def replay(self, pages: Iterable[ReplayPage]) -> ReplayStats:  # noqa: D102
+        stats = ReplayStats()
+        started_at = time.perf_counter()
+
+        batches: dict[str, ReplayBatch] = defaultdict(ReplayBatch)
+        for page in pages:
+            site = self.sites.get(page.site)
+            if site is None:
+                stats.skipped_pages += 1
+                continue
+
+            with self._measure(stats, "read"):
+                content = page.read()
+
+            if page.kind == PageKind.list:
+                apartments = self._replay_list_page(site, page, content, stats)
+            else:
+                apartments = self._replay_detail_page(site, page, content, stats)
+
+            batch = batches[page.site]
+            batch.add(page.kind, apartments)
+            if len(batch) >= settings.PARSER_INSERT_BATCH_SIZE:
+                self._save_batch(batch, stats)
+                batch.clear()
+
+        for batch in batches.values():
+            self._save_batch(batch, stats)
+
+        stats.elapsed = time.perf_counter() - started_at
+        return stats
+
+    def _replay_list_page(
+        self,
+        site: AbstractSite,
+        page: ReplayPage,
+        content: bytes,
+        stats: ReplayStats,
+    ) -> list[ApartmentEntity]:
+        stats.list_pages += 1
+        with self._measure(stats, "list"):
+            try:
+                pages_map = site.get_announcement_pages_map_from_content(content)
+                listing_apartments = site.get_complete_listing_apartments_from_content(content, pages_map)
+            except Exception as e:
+                stats.failures += 1
+                logger.exception("Can't parse a list page %s of site %s", page.name, site.name, exc_info=e)
+                return []
+
+        stats.announcements += len(pages_map)
+        for apartment in listing_apartments:
+            apartment.page_hash = page.page_hash
+        stats.apartments += len(listing_apartments)
+        return listing_apartments
+
+    def _replay_detail_page(
+        self,
+        site: AbstractSite,
+        page: ReplayPage,
+        content: bytes,
+        stats: ReplayStats,
+    ) -> list[ApartmentEntity]:
+        stats.detail_pages += 1
+        with self._measure(stats, "parse"):
+            try:
+                apartment = site.parse_apartment_from_content(content)
+            except Exception as e:
+                stats.failures += 1
+                logger.exception("Can't parse an apartment page %s of site %s", page.name, site.name, exc_info=e)
+                return []
+
+        apartment.page_hash = page.page_hash
+        stats.apartments += 1
+        return [apartment]
+
+    def _save_batch(self, batch: ReplayBatch, stats: ReplayStats) -> None:
+        if self.dry_run or not batch:
+            return
+
+        with self._measure(stats, "save"):
+            if batch.details:
+                Apartment.objects.bulk_create(
+                    ParseSiteService.build_apartments(batch.details.values()),
+                    update_conflicts=True,
+                    unique_fields=("site", "external_id"),
+                    update_fields=replay_update_fields,
+                )
+            if batch.listings:
+                Apartment.objects.bulk_create(
+                    ParseSiteService.build_apartments(batch.listings.values()),
+                    ignore_conflicts=True,
+                )
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _measure(stats: ReplayStats, stage: str) -> Iterator[None]:
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.timings[stage] += time.perf_counter() - started_at
@@ -1,29 +1,87 @@
 from __future__ import annotations  # noqa: D100
 
+import asyncio
+import contextlib
+import hashlib
 import logging
-from dataclasses import dataclass
-from typing import Protocol, TYPE_CHECKING
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TYPE_CHECKING, TypeVar
 
+from django.conf import settings
 from django.utils import timezone
 
 from easyhome.easyhome.models import Apartment
+from easyhome.parser import metrics
+from easyhome.parser.archive import PageKind, archive_page
+from easyhome.parser.circuit_breaker import CircuitOpenError
+from easyhome.parser.deadline import Deadline, DeadlineExceededError
+from easyhome.parser.metrics import AnnouncementResult, ListPageResult, RunResult, Stage
+from easyhome.parser.parse_pool import ParsePool, parse_apartment
+from easyhome.parser.rate_limit import RetryBudget
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import AsyncIterable, AsyncIterator, Coroutine, Iterable, Iterator
+    from concurrent.futures import Future, ProcessPoolExecutor
 
-    from bs4 import BeautifulSoup
     from django.db.models import QuerySet
+    from prometheus_client.context_managers import Timer
 
+    from easyhome.parser.archive import PageArchive
+    from easyhome.parser.entity import ApartmentEntity, FetchResult
     from easyhome.parser.sites.base import AbstractSite
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def get_ids_hash(pages_map: dict[str, str]) -> str:
+    """Use this function to get the hash of the announcement ids of a list page, in the order of the page."""
+    return hashlib.sha256("\n".join(pages_map).encode()).hexdigest()
+
 
 class HttpClientProtocol(Protocol):  # noqa: D101
-    def fetch_first_page(self, page_url: str) -> BeautifulSoup:  # noqa: D102
+    def fetch_first_page(  # noqa: D102
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes | None:
         raise NotImplementedError
 
-    def fetch_announcement_pages(self, pages_map: dict[int, str]) -> dict[int, BeautifulSoup]:  # noqa: D102
+    def iter_announcement_pages(  # noqa: D102
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> Iterator[tuple[str, FetchResult]]:
+        raise NotImplementedError
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:  # noqa: D102
+        raise NotImplementedError
+
+    async def afetch_first_page(  # noqa: D102
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes | None:
+        raise NotImplementedError
+
+    def aiter_announcement_pages(  # noqa: D102
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> AsyncIterator[tuple[str, FetchResult]]:
         raise NotImplementedError
 
 
@@ -31,70 +89,506 @@ class HttpClientProtocol(Protocol):  # noqa: D101
 class ParseSiteService:  # noqa: D101
     http_client: HttpClientProtocol
     site: AbstractSite
+    # The raw pages are kept by the archive if it's set, the apartments refer to their pages by `page_hash`.
+    archive: PageArchive | None = None
+    # The URL of a list page which has only known announcements -> the hash of its ids, see `parse_page`.
+    _known_pages: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def parse(self, deadline: Deadline | None = None) -> None:
+        """
+        Use this method to parse the new announcements of the site.
+
+        The pages of the list are crawled one by one up to `max_pages` of the site, the crawl stops at the first page
+        which has only known announcements (the high-water mark). So the announcements pushed past the first page
+        between two runs aren't lost, and no more pages than needed are fetched.
 
-    def parse(self) -> None:  # noqa: D102
+        The run is limited by the deadline (`PARSER_RUN_TIMEOUT` by default): at the deadline the outstanding requests
+        are cancelled, the apartments parsed so far are stored and the run is recorded as cut short. The announcements
+        which aren't stored are fetched by the next run. The pages of the run share its budget of retries
+        (`PARSER_RETRY_BUDGET`), so an outage of the site doesn't multiply the requests by the pages.
+        """
         logger.info("Start parsing site %s", self.site.name, extra={"site": self.site.name})
+        deadline = deadline or Deadline(settings.PARSER_RUN_TIMEOUT)
 
-        first_page = self.http_client.fetch_first_page(self.site.first_page)
-        announcement_pages_map = self.site.get_announcement_pages_map(first_page)
+        retry_budget = RetryBudget(settings.PARSER_RETRY_BUDGET)
 
-        non_existing_announcement = self.filter_non_existing_announcement(announcement_pages_map)
-        announcement_map = self.http_client.fetch_announcement_pages(non_existing_announcement)
+        with self._record_run():
+            seen_announcement: set[str] = set()
+            for page_number in range(1, self.site.max_pages + 1):
+                if not self.parse_page(page_number, seen_announcement, deadline, retry_budget):
+                    break
 
-        self.create_announcement(announcement_map)
+        if self.archive is not None:
+            self.archive.prune_if_due(self.site.name)
+
+    def parse_page(
+        self,
+        page_number: int,
+        seen_announcement: set[str],
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> bool:
+        """
+        Use this method to parse the page of the list, returns False if it has only known announcements.
+
+        The announcements stored by the site or seen on the previous pages of the run are known, `seen_announcement`
+        is updated with the announcements of the page.
+
+        A page which had only known announcements is remembered: it's requested by a conditional GET and if it isn't
+        modified (304), or the server ignores the validators but the page has the same ids, the page is skipped without
+        parsing or querying the database. The pages with new or failed announcements aren't remembered, so the failed
+        announcements are fetched again by the next run.
+        """
+        page_url = self.site.get_page_url(page_number)
+        known_ids_hash = self._known_pages.get(page_url)
+        with self._measure(Stage.first_page):
+            page = self.http_client.fetch_first_page(
+                page_url,
+                site=self.site,
+                deadline=deadline,
+                conditional=known_ids_hash is not None,
+            )
+        if page is None:
+            self._count_list_page(ListPageResult.not_modified)
+            self._log_high_water_mark(page_number)
+            return False
+
+        with self._measure(Stage.pages_map):
+            announcement_pages_map = self.site.get_announcement_pages_map_from_content(page)
+        if not self._is_page_changed(page_url, announcement_pages_map, known_ids_hash):
+            self._log_high_water_mark(page_number)
+            return False
+
+        with self._measure(Stage.filter):
+            unseen_announcement = self._exclude_seen_announcement(announcement_pages_map, seen_announcement)
+            non_existing_announcement = self.filter_non_existing_announcement(unseen_announcement)
+        self._count_announcements(AnnouncementResult.skipped, len(unseen_announcement) - len(non_existing_announcement))
+        if not non_existing_announcement:
+            self._known_pages[page_url] = get_ids_hash(announcement_pages_map)
+            self._log_high_water_mark(page_number)
+            return False
+
+        page_hash = archive_page(self.archive, self.site.name, PageKind.list, page)
+        non_existing_announcement = self.create_listing_announcement(page, non_existing_announcement, page_hash)
+        fetch_results = self.http_client.iter_announcement_pages(
+            non_existing_announcement,
+            site=self.site,
+            deadline=deadline,
+            retry_budget=retry_budget,
+        )
+
+        # The failed pages are not stored, so they are fetched again by the next run.
+        self.create_announcement(fetch_results)
         # self.update_viewed_at(set(announcement_pages_map.keys()) - set(non_existing_announcement.keys()))  # noqa: E501, ERA001
+        return True
 
-    def filter_non_existing_announcement(self, pages_map: dict[int, str]) -> dict[int, str]:
-        """Use this method to filter non-existing announcements."""
-        apartment_queryset: QuerySet[Apartment] = Apartment.objects.filter(
+    async def aparse(self, deadline: Deadline | None = None) -> None:
+        """
+        Use this method to parse the site on the event loop of the HTTP client, it's the async variant of `parse`.
+
+        The pages are fetched by aiohttp and the database is queried by the async ORM. The CPU-bound parsing is run in
+        a thread (or by the `ParsePool` workers), so the loop keeps fetching the pages of the other sites meanwhile.
+        """
+        logger.info("Start parsing site %s", self.site.name, extra={"site": self.site.name})
+        deadline = deadline or Deadline(settings.PARSER_RUN_TIMEOUT)
+
+        retry_budget = RetryBudget(settings.PARSER_RETRY_BUDGET)
+
+        with self._record_run():
+            seen_announcement: set[str] = set()
+            for page_number in range(1, self.site.max_pages + 1):
+                if not await self.aparse_page(page_number, seen_announcement, deadline, retry_budget):
+                    break
+
+        if self.archive is not None:
+            await asyncio.to_thread(self.archive.prune_if_due, self.site.name)
+
+    async def aparse_page(
+        self,
+        page_number: int,
+        seen_announcement: set[str],
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> bool:
+        """Use this method to parse the page of the list, it's the async variant of `parse_page`."""
+        page_url = self.site.get_page_url(page_number)
+        known_ids_hash = self._known_pages.get(page_url)
+        with self._measure(Stage.first_page):
+            page = await self.http_client.afetch_first_page(
+                page_url,
+                site=self.site,
+                deadline=deadline,
+                conditional=known_ids_hash is not None,
+            )
+        if page is None:
+            self._count_list_page(ListPageResult.not_modified)
+            self._log_high_water_mark(page_number)
+            return False
+
+        with self._measure(Stage.pages_map):
+            announcement_pages_map = await asyncio.to_thread(self.site.get_announcement_pages_map_from_content, page)
+        if not self._is_page_changed(page_url, announcement_pages_map, known_ids_hash):
+            self._log_high_water_mark(page_number)
+            return False
+
+        with self._measure(Stage.filter):
+            unseen_announcement = self._exclude_seen_announcement(announcement_pages_map, seen_announcement)
+            non_existing_announcement = await self.afilter_non_existing_announcement(unseen_announcement)
+        self._count_announcements(AnnouncementResult.skipped, len(unseen_announcement) - len(non_existing_announcement))
+        if not non_existing_announcement:
+            self._known_pages[page_url] = get_ids_hash(announcement_pages_map)
+            self._log_high_water_mark(page_number)
+            return False
+
+        page_hash = await asyncio.to_thread(archive_page, self.archive, self.site.name, PageKind.list, page)
+        non_existing_announcement = await self.acreate_listing_announcement(page, non_existing_announcement, page_hash)
+        fetch_results = self.http_client.aiter_announcement_pages(
+            non_existing_announcement,
+            site=self.site,
+            deadline=deadline,
+            retry_budget=retry_budget,
+        )
+
+        await self.acreate_announcement(fetch_results)
+        return True
+
+    def _is_page_changed(self, page_url: str, pages_map: dict[str, str], known_ids_hash: str | None) -> bool:
+        """Return False if the page has the same ids as when it had only known announcements."""
+        if known_ids_hash is not None and get_ids_hash(pages_map) == known_ids_hash:
+            self._count_list_page(ListPageResult.unchanged)
+            return False
+
+        self._known_pages.pop(page_url, None)
+        self._count_list_page(ListPageResult.changed)
+        return True
+
+    def _count_list_page(self, result: ListPageResult) -> None:
+        metrics.list_pages.labels(self.site.name, result).inc()
+
+    @staticmethod
+    def _exclude_seen_announcement(pages_map: dict[str, str], seen_announcement: set[str]) -> dict[str, str]:
+        unseen_announcement = {k: v for k, v in pages_map.items() if k not in seen_announcement}
+        seen_announcement.update(pages_map)
+        return unseen_announcement
+
+    @contextlib.contextmanager
+    def _record_run(self) -> Iterator[None]:
+        """Count the run by its result, the run which is cut short by the deadline is logged and not raised."""
+        try:
+            yield
+        except DeadlineExceededError as e:
+            metrics.runs.labels(self.site.name, RunResult.cut_short).inc()
+            logger.warning("The run of site %s is cut short: %s", self.site.name, e, extra={"site": self.site.name})
+        except CircuitOpenError:
+            metrics.runs.labels(self.site.name, RunResult.skipped).inc()
+            raise
+        except Exception:
+            metrics.runs.labels(self.site.name, RunResult.failed).inc()
+            raise
+        else:
+            metrics.runs.labels(self.site.name, RunResult.completed).inc()
+
+    def _measure(self, stage: Stage) -> Timer:
+        return metrics.stage_duration.labels(self.site.name, stage).time()
+
+    def _count_announcements(self, result: AnnouncementResult, count: int = 1) -> None:
+        if count > 0:
+            metrics.announcements.labels(self.site.name, result).inc(count)
+
+    def _log_high_water_mark(self, page_number: int) -> None:
+        logger.info(
+            "Site %s has only known announcements on page %s",
+            self.site.name,
+            page_number,
+            extra={"site": self.site.name},
+        )
+
+    def filter_non_existing_announcement(self, pages_map: dict[str, str]) -> dict[str, str]:
+        """
+        Use this method to filter non-existing announcements.
+
+        The lookup is covered by the unique (site, external_id) index, so only the ids are read from the database.
+        """
+        existing_announcement: set[str] = set(self._get_existing_external_ids(pages_map))
+        return {k: v for k, v in pages_map.items() if k not in existing_announcement}
+
+    async def afilter_non_existing_announcement(self, pages_map: dict[str, str]) -> dict[str, str]:
+        """Use this method to filter non-existing announcements by the async ORM."""
+        existing_announcement = {external_id async for external_id in self._get_existing_external_ids(pages_map)}
+        return {k: v for k, v in pages_map.items() if k not in existing_announcement}
+
+    def _get_existing_external_ids(self, pages_map: dict[str, str]) -> QuerySet[Apartment, str]:
+        return Apartment.objects.filter(
             site=self.site.name,
             external_id__in=pages_map.keys(),
+        ).values_list("external_id", flat=True)
+
+    def create_listing_announcement(
+        self,
+        first_page: bytes,
+        pages_map: dict[str, str],
+        page_hash: str = "",
+    ) -> dict[str, str]:
+        """
+        Use this method to store the apartments built from the main page, returns the pages which still need a fetch.
+
+        Only the sites in the listing-only mode build the apartments from the main page, the incomplete ones (without a
+        phone or a description) are left to their announcement pages.
+        """
+        complete_apartments = self._get_complete_listing_apartments(first_page, pages_map, page_hash)
+        self.save_apartments(complete_apartments)
+
+        stored_ids = {apartment.external_id for apartment in complete_apartments}
+        return {k: v for k, v in pages_map.items() if k not in stored_ids}
+
+    async def acreate_listing_announcement(
+        self,
+        first_page: bytes,
+        pages_map: dict[str, str],
+        page_hash: str = "",
+    ) -> dict[str, str]:
+        """Use this method to store the apartments built from the main page by the async ORM."""
+        complete_apartments = await asyncio.to_thread(
+            self._get_complete_listing_apartments,
+            first_page,
+            pages_map,
+            page_hash,
         )
-        existing_announcement = {i.external_id: i for i in apartment_queryset}
-        return {k: v for k, v in pages_map.items() if k not in existing_announcement}
+        await self.asave_apartments(complete_apartments)
+
+        stored_ids = {apartment.external_id for apartment in complete_apartments}
+        return {k: v for k, v in pages_map.items() if k not in stored_ids}
+
+    def _get_complete_listing_apartments(
+        self,
+        first_page: bytes,
+        pages_map: dict[str, str],
+        page_hash: str,
+    ) -> list[ApartmentEntity]:
+        complete_apartments = self.site.get_complete_listing_apartments_from_content(first_page, pages_map)
+        for apartment in complete_apartments:
+            apartment.page_hash = page_hash
+        return complete_apartments
+
+    def create_announcement(self, new_announcement: Iterable[tuple[str, FetchResult]]) -> None:
+        """
+        Use this method to parse the fetched announcement pages and store the apartments, failed pages are skipped.
+
+        The pages are parsed one by one as they come and the apartments are inserted by batches of
+        `PARSER_INSERT_BATCH_SIZE`, so only a few pages and one batch are kept in memory. The apartments parsed before
+        the deadline are stored.
+        """
+        apartments_to_create: list[ApartmentEntity] = []
+        try:
+            for parsed_apartment in self.parse_announcements(new_announcement):
+                apartments_to_create.append(parsed_apartment)
+                if len(apartments_to_create) >= settings.PARSER_INSERT_BATCH_SIZE:
+                    self.save_apartments(apartments_to_create)
+                    apartments_to_create = []
+        except DeadlineExceededError:
+            self.save_apartments(apartments_to_create)
+            raise
+
+        self.save_apartments(apartments_to_create)
+
+    async def acreate_announcement(self, new_announcement: AsyncIterable[tuple[str, FetchResult]]) -> None:
+        """Use this method to parse the fetched announcement pages and store the apartments by the async ORM."""
+        apartments_to_create: list[ApartmentEntity] = []
+        try:
+            async for external_id, fetch_result in new_announcement:
+                parsed_apartment = await self.aparse_announcement(external_id, fetch_result)
+                if parsed_apartment is None:
+                    continue
+
+                apartments_to_create.append(parsed_apartment)
+                if len(apartments_to_create) >= settings.PARSER_INSERT_BATCH_SIZE:
+                    await self.asave_apartments(apartments_to_create)
+                    apartments_to_create = []
+        except DeadlineExceededError:
+            await self.asave_apartments(apartments_to_create)
+            raise
+
+        await self.asave_apartments(apartments_to_create)
+
+    def parse_announcements(self, new_announcement: Iterable[tuple[str, FetchResult]]) -> Iterator[ApartmentEntity]:
+        """
+        Use this method to parse the fetched announcement pages, the pages which can't be parsed are skipped.
+
+        The pages are parsed by the `ParsePool` workers if the pool is enabled, otherwise in-process.
+        """
+        executor = ParsePool().get_executor()
+        if executor is not None:
+            yield from self._parse_announcements_in_pool(new_announcement, executor)
+            return
+
+        for external_id, fetch_result in new_announcement:
+            parsed_apartment = self.parse_announcement(external_id, fetch_result)
+            if parsed_apartment is not None:
+                yield parsed_apartment
 
-    def create_announcement(self, new_announcement: dict[int, BeautifulSoup]) -> None:  # noqa: D102
-        apartments_to_create: list[Apartment] = []
-        for external_id, parsed_response in new_announcement.items():
+    def _parse_announcements_in_pool(
+        self,
+        new_announcement: Iterable[tuple[str, FetchResult]],
+        executor: ProcessPoolExecutor,
+    ) -> Iterator[ApartmentEntity]:
+        # At most two pages per worker wait for the parsing, so the fetching is still paused when the workers are busy.
+        max_pending = 2 * settings.PARSER_POOL_SIZE
+
+        pending: dict[Future[ApartmentEntity], str] = {}
+        for external_id, fetch_result in new_announcement:
+            if not self.is_fetched(external_id, fetch_result):
+                continue
+
+            pending[executor.submit(parse_apartment, self.site, fetch_result.body, self.archive)] = external_id
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from self._get_parsed_apartments(done, pending)
+
+        yield from self._get_parsed_apartments(as_completed(pending), pending)
+
+    def _get_parsed_apartments(
+        self,
+        done: Iterable[Future[ApartmentEntity]],
+        pending: dict[Future[ApartmentEntity], str],
+    ) -> Iterator[ApartmentEntity]:
+        for future in done:
+            external_id = pending.pop(future)
             try:
-                parsed_apartment = self.site.parse_apartment(parsed_response)
+                yield future.result()
+            except BrokenProcessPool:
+                # A worker died, the next run starts a new pool and fetches the pages which aren't stored again.
+                ParsePool().close()
+                raise
             except Exception as e:
+                self._count_announcements(AnnouncementResult.failed)
                 logger.exception(
                     "Can't parse an apartment with id %s from site %s",
                     external_id,
                     self.site.name,
                     exc_info=e,
                 )
-                continue
 
-            apartments_to_create.append(
-                Apartment(
-                    external_id=parsed_apartment.external_id,
-                    url=parsed_apartment.external_url,
-                    topic=parsed_apartment.title,
-                    phone=parsed_apartment.phone,
-                    rooms=parsed_apartment.rooms,
-                    body=parsed_apartment.body,
-                    price=parsed_apartment.price,
-                    currency=parsed_apartment.currency,
-                    area=parsed_apartment.area,
-                    city=parsed_apartment.city,
-                    room_type=parsed_apartment.room_type,
-                    site=parsed_apartment.site,
-                    floor=parsed_apartment.floor,
-                    max_floor=parsed_apartment.max_floor,
-                    district=parsed_apartment.district,
-                    lat=parsed_apartment.lat,
-                    lon=parsed_apartment.lon,
-                    images_count=len(parsed_apartment.images_list),
-                    # TODO: Need to implement  # noqa: FIX002, TD002, TD003
-                    # viewed_at=timezone.now(),  # noqa: ERA001
-                ),
+    def parse_announcement(self, external_id: str, fetch_result: FetchResult) -> ApartmentEntity | None:
+        """Use this method to parse the fetched announcement page, returns None if the page can't be parsed."""
+        if not self.is_fetched(external_id, fetch_result):
+            return None
+
+        try:
+            return parse_apartment(self.site, fetch_result.body, self.archive)
+        except Exception as e:
+            self._count_announcements(AnnouncementResult.failed)
+            logger.exception(
+                "Can't parse an apartment with id %s from site %s",
+                external_id,
+                self.site.name,
+                exc_info=e,
+            )
+            return None
+
+    async def aparse_announcement(self, external_id: str, fetch_result: FetchResult) -> ApartmentEntity | None:
+        """Use this method to parse the fetched announcement page out of the event loop, see `parse_announcement`."""
+        if not self.is_fetched(external_id, fetch_result):
+            return None
+
+        executor = ParsePool().get_executor()
+        try:
+            if executor is None:
+                return await asyncio.to_thread(parse_apartment, self.site, fetch_result.body, self.archive)
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, parse_apartment, self.site, fetch_result.body, self.archive)
+        except BrokenProcessPool:
+            ParsePool().close()
+            raise
+        except Exception as e:
+            self._count_announcements(AnnouncementResult.failed)
+            logger.exception(
+                "Can't parse an apartment with id %s from site %s",
+                external_id,
+                self.site.name,
+                exc_info=e,
             )
+            return None
 
-        Apartment.objects.bulk_create(apartments_to_create)
+    def is_fetched(self, external_id: str, fetch_result: FetchResult) -> bool:
+        """Use this method to check the fetch result of the announcement page, the failed fetches are logged."""
+        metrics.stage_duration.labels(self.site.name, Stage.fetch).observe(fetch_result.latency)
+        if not fetch_result.ok:
+            self._count_announcements(AnnouncementResult.failed)
+            logger.warning(
+                "Can't fetch an apartment with id %s from site %s after %s attempts: %s",
+                external_id,
+                self.site.name,
+                fetch_result.attempts,
+                fetch_result.error,
+            )
+        return fetch_result.ok
+
+    def save_apartments(self, apartments: Iterable[ApartmentEntity]) -> None:
+        """Use this method to store the parsed apartments."""
+        apartments_to_create = self.build_apartments(apartments)
+        if not apartments_to_create:
+            return
+
+        # Another run may store the same announcement in the meantime, the unique index keeps the first one. The
+        # ignored rows aren't reported by the insert, so the new apartments are counted by the stored ones.
+        stored_apartments = self._get_stored_apartments(apartments_to_create)
+        with self._measure(Stage.insert):
+            stored_before = stored_apartments.count()
+            Apartment.objects.bulk_create(apartments_to_create, ignore_conflicts=True)
+            inserted = stored_apartments.count() - stored_before
+        self._count_announcements(AnnouncementResult.new, inserted)
+
+    async def asave_apartments(self, apartments: Iterable[ApartmentEntity]) -> None:
+        """Use this method to store the parsed apartments by the async ORM."""
+        apartments_to_create = self.build_apartments(apartments)
+        if not apartments_to_create:
+            return
+
+        stored_apartments = self._get_stored_apartments(apartments_to_create)
+        with self._measure(Stage.insert):
+            stored_before = await stored_apartments.acount()
+            await Apartment.objects.abulk_create(apartments_to_create, ignore_conflicts=True)
+            inserted = await stored_apartments.acount() - stored_before
+        self._count_announcements(AnnouncementResult.new, inserted)
+
+    def _get_stored_apartments(self, apartments: list[Apartment]) -> QuerySet[Apartment]:
+        return Apartment.objects.filter(
+            site=self.site.name,
+            external_id__in=[apartment.external_id for apartment in apartments],
+        )
+
+    @staticmethod
+    def build_apartments(apartments: Iterable[ApartmentEntity]) -> list[Apartment]:
+        """Use this method to build the rows of the parsed apartments."""
+        return [
+            Apartment(
+                external_id=parsed_apartment.external_id,
+                url=parsed_apartment.external_url,
+                topic=parsed_apartment.title,
+                phone=parsed_apartment.phone,
+                rooms=parsed_apartment.rooms,
+                body=parsed_apartment.body,
+                price=parsed_apartment.price,
+                currency=parsed_apartment.currency,
+                area=parsed_apartment.area,
+                city=parsed_apartment.city,
+                room_type=parsed_apartment.room_type,
+                site=parsed_apartment.site,
+                floor=parsed_apartment.floor,
+                max_floor=parsed_apartment.max_floor,
+                district=parsed_apartment.district,
+                lat=parsed_apartment.lat,
+                lon=parsed_apartment.lon,
+                images_count=len(parsed_apartment.images_list),
+                page_hash=parsed_apartment.page_hash,
+                # TODO: Need to implement  # noqa: FIX002, TD002, TD003
+                # viewed_at=timezone.now(),  # noqa: ERA001
+            )
+            for parsed_apartment in apartments
+        ]
 
-    def update_viewed_at(self, announcement_external_ids: Iterable[int]) -> None:  # noqa: D102
+    def update_viewed_at(self, announcement_external_ids: Iterable[str]) -> None:  # noqa: D102
         apartment_queryset: QuerySet[Apartment] = Apartment.objects.filter(
             site=self.site.name,
             external_id__in=announcement_external_ids,
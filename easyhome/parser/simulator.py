@@ -0,0 +1,229 @@
+"""Use this module to serve a local copy of a site, so the crawler can be load-tested without the real sites."""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import copy
+import random
+import re
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from easyhome.common.event_loop import EventLoopThread
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from easyhome.parser.sites.base import AbstractSite
+
+error_statuses = (HTTPStatus.BAD_GATEWAY, HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.GATEWAY_TIMEOUT)
+
+
+@dataclass(slots=True)
+class SimulatorConfig:
+    """
+    Use this class to configure the behaviour of the simulated site.
+
+    Every response is delayed by `latency` plus a random `jitter` (in seconds). A share of `error_rate` responses is a
+    502/503/504 error and a share of `slow_rate` responses is a slow-loris one: the body is sent by `slow_chunk_size`
+    bytes every `slow_chunk_delay` seconds. The random choices are reproducible by `seed`.
+    """
+
+    pages: int = 10
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    slow_rate: float = 0.0
+    slow_chunk_size: int = 16 * 1024
+    slow_chunk_delay: float = 0.05
+    seed: int = 0
+
+
+@dataclass(slots=True)
+class SimulatorStats:
+    """Use this class to count the responses of the simulated site."""
+
+    list_pages: int = 0
+    detail_pages: int = 0
+    not_found: int = 0
+    errors: int = 0
+    slow_responses: int = 0
+
+    @property
+    def requests(self) -> int:  # noqa: D102
+        return self.list_pages + self.detail_pages + self.not_found + self.errors
+
+
+class SiteSimulator:
+    """
+    Use this class to serve a site on the local host by the pages of the dataset.
+
+    The list pages `1..pages` are the `<site>_first_page.html` page of the dataset with synthetic announcement ids, so
+    every list page has new announcements. Every announcement page is the first `<site>_<id>.html` page of the dataset
+    with the id of the announcement. The links to the host of the site are rewritten to the simulator, so
+    `get_site()` returns a copy of the site which is crawled by the unchanged parsers.
+
+    The server runs on its own event loop thread, so it can be used by the sync and the async code of the crawler.
+
+    Example:
+    -------
+        simulator = SiteSimulator(Diesel(), dataset_path, SimulatorConfig(pages=20, error_rate=0.05))
+        simulator.start()
+        ParseSiteService(http_client=HttpClient(), site=simulator.get_site()).parse()
+        simulator.stop()
+
+    """
+
+    def __init__(self, site: AbstractSite, dataset_path: Path, config: SimulatorConfig | None = None) -> None:  # noqa: D107
+        self.site = site
+        self.config = config or SimulatorConfig()
+        self.stats = SimulatorStats()
+        self.base_url = ""
+
+        self._dataset_path = dataset_path
+        self._random = random.Random(self.config.seed)  # noqa: S311
+        self._event_loop = EventLoopThread(name=f"{site.name}-simulator")
+        self._runner: web.AppRunner | None = None
+
+        self._list_template = b""
+        self._list_ids: list[str] = []
+        self._list_pattern: re.Pattern[bytes] | None = None
+        self._detail_parts: list[bytes] = []
+        # The path and the query of the announcement pages -> the synthetic announcement id.
+        self._detail_paths: dict[str, str] = {}
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Use this method to start the server, returns its base URL."""
+        self._event_loop.run(self._start(host, port))
+        self._load_templates()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Use this method to stop the server and its event loop."""
+        if self._runner is not None:
+            self._event_loop.run(self._runner.cleanup())
+            self._runner = None
+
+        self._event_loop.stop()
+
+    def get_site(self) -> AbstractSite:
+        """Use this method to get a copy of the site which is crawled from the simulator."""
+        site = copy.copy(self.site)
+        site.first_page = self.base_url + self._get_path(self.site.first_page)
+        site._host = self.base_url  # type: ignore[attr-defined]  # noqa: SLF001
+        site.max_pages = self.config.pages
+        return site
+
+    def get_announcement_id(self, page_number: int, index: int, template_id: str) -> str:
+        """
+        Use this method to get the synthetic id of the announcement of the list page.
+
+        The trailing digits of the id are replaced by a unique number which starts with 9, so the ids keep the format
+        of the site and don't clash with the ids of the dataset.
+        """
+        prefix = template_id.rstrip("0123456789")
+        digits = max(len(template_id) - len(prefix), 2)
+        number = (page_number - 1) * len(self._list_ids) + index + 1
+        return f"{prefix}9{number:0{digits - 1}d}"
+
+    @staticmethod
+    def _get_path(url: str) -> str:
+        url_parts = urlsplit(url)
+        return f"{url_parts.path}?{url_parts.query}" if url_parts.query else url_parts.path
+
+    @staticmethod
+    def _get_id_pattern(ids: list[str]) -> re.Pattern[bytes]:
+        alternatives = b"|".join(re.escape(i.encode()) for i in sorted(ids, key=len, reverse=True))
+        return re.compile(rb"(?<![0-9A-Za-z])(" + alternatives + rb")(?![0-9])")
+
+    def _read_template(self, name: str) -> bytes:
+        content = (self._dataset_path / f"{self.site.name}_{name}.html").read_bytes()
+        return content.replace(self.site._host.encode(), self.base_url.encode())  # type: ignore[attr-defined]  # noqa: SLF001
+
+    def _load_templates(self) -> None:
+        site = self.get_site()
+
+        self._list_template = self._read_template("first_page")
+        pages_map = site.get_announcement_pages_map_from_content(self._list_template)
+        self._list_ids = list(pages_map)
+        self._list_pattern = self._get_id_pattern(self._list_ids)
+        for page_number in range(1, self.config.pages + 1):
+            for index, (template_id, url) in enumerate(pages_map.items()):
+                announcement_id = self.get_announcement_id(page_number, index, template_id)
+                self._detail_paths[self._get_path(url.replace(template_id, announcement_id))] = announcement_id
+
+        page_names = sorted(p.stem.split("_", 1)[1] for p in self._dataset_path.glob(f"{self.site.name}_*.html"))
+        detail_template = self._read_template(next(name for name in page_names if name != "first_page"))
+        detail_id = site.parse_apartment_from_content(detail_template).external_id
+        # The parts of the page between the id, the page of an announcement is the parts joined by its id.
+        self._detail_parts = [part or b"" for part in self._get_id_pattern([detail_id]).split(detail_template)[::2]]
+
+    async def _start(self, host: str, port: int) -> None:
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        tcp_site = web.TCPSite(self._runner, host, port)
+        await tcp_site.start()
+        bound_host, bound_port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{bound_host}:{bound_port}"
+
+    def _get_list_page(self, page_number: int) -> bytes:
+        if self._list_pattern is None:
+            msg = "The simulator isn't started."
+            raise RuntimeError(msg)
+
+        ids = {template_id: index for index, template_id in enumerate(self._list_ids)}
+
+        def replace(match: re.Match[bytes]) -> bytes:
+            # The lookarounds of the pattern are empty, so the whole match is the id.
+            template_id = match.group().decode()
+            return self.get_announcement_id(page_number, ids[template_id], template_id).encode()
+
+        return self._list_pattern.sub(replace, self._list_template)
+
+    def _get_page(self, request: web.Request) -> bytes | None:
+        announcement_id = self._detail_paths.get(request.path_qs)
+        if announcement_id is not None:
+            self.stats.detail_pages += 1
+            return announcement_id.encode().join(self._detail_parts)
+
+        if request.path == urlsplit(self.site.first_page).path:
+            page_number = int(request.query.get(self.site.page_param, 1))
+            if 1 <= page_number <= self.config.pages:
+                self.stats.list_pages += 1
+                return self._get_list_page(page_number)
+
+        return None
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        config = self.config
+        await asyncio.sleep(config.latency + self._random.uniform(0, config.jitter))
+
+        if self._random.random() < config.error_rate:
+            self.stats.errors += 1
+            return web.Response(status=self._random.choice(error_statuses))
+
+        content = self._get_page(request)
+        if content is None:
+            self.stats.not_found += 1
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        if self._random.random() >= config.slow_rate:
+            return web.Response(body=content, content_type="text/html")
+
+        self.stats.slow_responses += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/html"})
+        response.content_length = len(content)
+        # The client may go away in the middle of the response, e.g. the loser of a hedged request is cancelled.
+        with contextlib.suppress(ConnectionResetError):
+            await response.prepare(request)
+            for start in range(0, len(content), config.slow_chunk_size):
+                await response.write(content[start : start + config.slow_chunk_size])
+                await asyncio.sleep(config.slow_chunk_delay)
+            await response.write_eof()
+        return response
@@ -3,12 +3,13 @@ from __future__ import annotations
 
 import abc
 from typing import ClassVar, TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from easyhome.easyhome.models import Currency
+from easyhome.parser.backends import ParserBackend, compile_selector, make_page
 
 if TYPE_CHECKING:
-    from bs4 import BeautifulSoup
-
+    from easyhome.parser.backends import Page, Selector
     from easyhome.parser.entity import ApartmentEntity
 
 
@@ -16,10 +17,50 @@ class AbstractSite(abc.ABC):
     """Use this class to create a new site parser."""
 
     name: str
+    # The requests of the site are made via the proxies of `PARSER_PROXIES`, see `easyhome.parser.proxy_pool`.
     use_proxy: bool = False
 
     first_page: str
 
+    # Pagination: the pages `2..max_pages` of the list are crawled after the first one until a page has only known
+    # announcements, see `ParseSiteService.parse`. The page number is passed by the `page_param` query parameter.
+    max_pages: int = 1
+    page_param: str = "page"
+
+    # Request scheduler of the site: at most `max_in_flight` detail pages are fetched at the same time and at most
+    # `requests_per_second` requests are started per second (0 disables the rate limit).
+    max_in_flight: int = 5
+    requests_per_second: float = 0
+
+    # Timeouts of one request to the site (in seconds): to connect, to wait for the next chunk of the response and to
+    # make the whole request. The requests are also cut by the deadline of the run, see `easyhome.parser.deadline`.
+    connect_timeout: float = 10
+    read_timeout: float = 30
+    request_timeout: float = 60
+
+    # Hedging of the announcement pages: a request slower than the p95 latency of the site is duplicated and the first
+    # response wins, see `easyhome.parser.hedging`.
+    hedge_requests: bool = False
+
+    # The HTML parser used to build the pages of the site and the encoding of the pages, the raw bytes of the responses
+    # are decoded once by the parser without sniffing the encoding, see `easyhome.parser.backends`.
+    parser_backend: ParserBackend = ParserBackend.html_parser
+    encoding: str = "utf-8"
+
+    # Listing-only ingest: the apartments are built from the main page and the announcement pages are fetched only for
+    # the apartments which miss one of the `listing_detail_fields`.
+    listing_only: bool = False
+    listing_detail_fields: ClassVar[tuple[str, ...]] = ("phone", "body")
+
+    # The label -> value blocks of the announcement pages, see `get_info_table`: the container of the blocks, one
+    # selector for both the labels and the values of the blocks and the class of the labels. The selectors are compiled
+    # once per site class, see `__init_subclass__`.
+    info_container_selector: ClassVar[str] = ""
+    info_selector: ClassVar[str] = ""
+    info_label_class: ClassVar[str] = ""
+    _info_container_pattern: ClassVar[Selector] = ""
+    _info_pattern: ClassVar[Selector] = ""
+
     currency_map: ClassVar[dict[str, Currency]] = {
         "": Currency.undefined,
         "сом": Currency.kgs,
@@ -30,12 +71,95 @@ class AbstractSite(abc.ABC):
         "USD": Currency.usd,
     }
 
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Compile the info selectors of the site class once, `get_info_table` is called for every announcement page."""
+        super().__init_subclass__(**kwargs)
+        if cls.info_container_selector:
+            cls._info_container_pattern = compile_selector(cls.info_container_selector)
+        if cls.info_selector:
+            cls._info_pattern = compile_selector(cls.info_selector)
+
+    def get_page_url(self, page_number: int) -> str:
+        """Use this method to get the URL of the page of the announcement list, the first page is `first_page`."""
+        if page_number == 1:
+            return self.first_page
+
+        url = urlsplit(self.first_page)
+        query = dict(parse_qsl(url.query))
+        query[self.page_param] = str(page_number)
+        return urlunsplit(url._replace(query=urlencode(query)))
+
+    def make_page(self, content: bytes | str) -> Page:
+        """Use this method to build the page from the response content."""
+        return make_page(content, self.parser_backend, self.encoding)
+
+    def get_announcement_pages_map_from_content(self, content: bytes) -> dict[str, str]:
+        """Use this method to get a map of announcement pages from the main page content."""
+        page = self.make_page(content)
+        try:
+            return self.get_announcement_pages_map(page)
+        finally:
+            # The tree is full of reference cycles, destroy it now instead of waiting for the garbage collector.
+            page.decompose()
+
+    def parse_apartment_from_content(self, content: bytes) -> ApartmentEntity:
+        """Use this method to parse the apartment from the response content."""
+        page = self.make_page(content)
+        try:
+            return self.parse_apartment(page)
+        finally:
+            page.decompose()
+
+    def get_info_table(self, page: Page) -> dict[str, str]:
+        """
+        Use this method to get the `{label: value}` table of the info blocks of the announcement page.
+
+        The labels and the values are selected at once in the document order, so the blocks are walked once and every
+        field is a dict lookup instead of a `:-soup-contains()` scan of the whole page. The trailing colons of the
+        labels are dropped and the first block wins if a label is repeated.
+        """
+        container = page.select_one(self._info_container_pattern)
+        if container is None:
+            return {}
+
+        info_table: dict[str, str] = {}
+        label: str | None = None
+        for elem in container.select(self._info_pattern):
+            if self.info_label_class in elem.get_attribute_list("class"):
+                label = elem.get_text(strip=True).rstrip(":")
+            elif label is not None:
+                info_table.setdefault(label, elem.get_text(strip=True))
+                label = None
+
+        return info_table
+
+    def get_listing_apartments_from_content(self, content: bytes) -> dict[str, ApartmentEntity]:
+        """Use this method to get the apartments built from the main page content, the sites without feeds have none."""
+        return {}
+
+    def get_complete_listing_apartments_from_content(
+        self,
+        content: bytes,
+        pages_map: dict[str, str],
+    ) -> list[ApartmentEntity]:
+        """Use this method to get the apartments of the main page which are listed and don't need their pages."""
+        listing_apartments = self.get_listing_apartments_from_content(content)
+        return [
+            apartment
+            for external_id, apartment in listing_apartments.items()
+            if external_id in pages_map and self.is_listing_apartment_complete(apartment)
+        ]
+
+    def is_listing_apartment_complete(self, apartment: ApartmentEntity) -> bool:
+        """Use this method to check if the apartment built from the main page doesn't need its announcement page."""
+        return all(getattr(apartment, field) for field in self.listing_detail_fields)
+
     @abc.abstractmethod
-    def get_announcement_pages_map(self, page: BeautifulSoup) -> dict[int, str]:
+    def get_announcement_pages_map(self, page: Page) -> dict[str, str]:
         """Use this method to get a map of announcement pages from the main page."""
         raise NotImplementedError
 
     @abc.abstractmethod
-    def parse_apartment(self, parsed_response: BeautifulSoup) -> ApartmentEntity:
+    def parse_apartment(self, parsed_response: Page) -> ApartmentEntity:
         """Use this method to parse the apartment from the parsed response."""
         raise NotImplementedError
@@ -2,15 +2,16 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING
+from typing import ClassVar, TYPE_CHECKING
 from urllib.parse import urljoin, urlparse
 
 from easyhome.easyhome.models import Currency, Site
+from easyhome.parser.backends import ParserBackend
 from easyhome.parser.entity import ApartmentEntity
 from easyhome.parser.sites.base import AbstractSite
 
 if TYPE_CHECKING:
-    from bs4 import BeautifulSoup
+    from easyhome.parser.backends import Page
 
 int_regex = re.compile(r"\d+")
 text_regex = re.compile(r"[a-zA-Zа-яА-Я]+")
@@ -22,6 +23,14 @@ class Diesel(AbstractSite):
 
     name = Site.diesel
     first_page = "https://diesel.elcat.kg/index.php?showforum=305"
+    max_pages = 3
+    max_in_flight = 4
+    requests_per_second = 3
+    parser_backend = ParserBackend.selectolax
+
+    info_container_selector: ClassVar[str] = ".custom-fields"
+    info_selector: ClassVar[str] = ".custom-field > .field-label, .custom-field > .field-value"
+    info_label_class: ClassVar[str] = "field-label"
 
     _host = "https://diesel.elcat.kg"
     _negative_theme = "2477961"
@@ -31,7 +40,7 @@ class Diesel(AbstractSite):
         external_id = url.query.split("showtopic=")[-1]
         return f"{urljoin(self._host, url.path)}?showtopic={external_id}", external_id
 
-    def get_announcement_pages_map(self, page: BeautifulSoup) -> dict[str, str]:
+    def get_announcement_pages_map(self, page: Page) -> dict[str, str]:
         """Use this method to get a map of announcement pages from the main page."""
         announcement_map: dict[str, str] = {}
         for item in page.select(".topic_title"):
@@ -41,15 +50,7 @@ class Diesel(AbstractSite):
         announcement_map.pop(self._negative_theme, None)
         return announcement_map
 
-    @staticmethod
-    def _get_span_contains_str(page: BeautifulSoup, text: str) -> str:
-        elem = page.select_one(f"span:-soup-contains('{text}')")
-        if elem is None:
-            return ""
-
-        return elem.parent.select_one(".field-value").get_text(strip=True)
-
-    def _parse_price_and_currency(self, page: BeautifulSoup) -> tuple[int, Currency]:
+    def _parse_price_and_currency(self, page: Page) -> tuple[int, Currency]:
         elem = page.select_one("span.field-value.badge.badge-green")
         if elem is None:
             return 0, Currency.undefined
@@ -60,7 +61,7 @@ class Diesel(AbstractSite):
         return price, currency
 
     @staticmethod
-    def _parse_body(page: BeautifulSoup) -> str:
+    def _parse_body(page: Page) -> str:
         body = page.select_one(".post")
         body = body.get_text().strip()
         body = editor_regex.sub("", body)
@@ -68,7 +69,7 @@ class Diesel(AbstractSite):
         body = body.replace(" ", "")
         return body.strip()
 
-    def parse_apartment(self, parsed_response: BeautifulSoup) -> ApartmentEntity:
+    def parse_apartment(self, parsed_response: Page) -> ApartmentEntity:
         """Use this method to parse the apartment from the parsed response."""
         href = parsed_response.select_one("meta[name='identifier-url']").attrs["content"]
         _external_url, _external_id = self._parse_ulr_and_external_id(href)
@@ -83,14 +84,16 @@ class Diesel(AbstractSite):
         if _phone != "":
             _phone = f"+996{_phone.get_text(strip=True)[-9:]}"
 
-        _rooms = self._get_span_contains_str(parsed_response, "Количество комнат")
+        info_table = self.get_info_table(parsed_response)
+
+        _rooms = info_table.get("Количество комнат", "")
         _rooms = int(_rooms) if _rooms.isdigit() else 0
 
-        _area = self._get_span_contains_str(parsed_response, "Площадь (кв.м.)")
+        _area = info_table.get("Площадь (кв.м.)", "")
         _area = int(_area) if _area.isdigit() else 0
 
-        _city = self._get_span_contains_str(parsed_response, "Город:")
-        _room_type = self._get_span_contains_str(parsed_response, "Тип помещения")
+        _city = info_table.get("Город", "")
+        _room_type = info_table.get("Тип помещения", "")
         _body = self._parse_body(parsed_response)
 
         _images = [item.attrs["src"] for item in parsed_response.select(".attach")]
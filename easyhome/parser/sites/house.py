@@ -3,15 +3,16 @@
 from __future__ import annotations
 
 import re
-from typing import TYPE_CHECKING, TypedDict
+from typing import ClassVar, TYPE_CHECKING, TypedDict
 from urllib.parse import urljoin
 
 from easyhome.easyhome.models import Currency, Site
+from easyhome.parser.backends import ParserBackend
 from easyhome.parser.entity import ApartmentEntity
 from easyhome.parser.sites.base import AbstractSite
 
 if TYPE_CHECKING:
-    from bs4 import BeautifulSoup
+    from easyhome.parser.backends import Page
 
 int_regex = re.compile(r"\d+")
 
@@ -26,10 +27,19 @@ class House(AbstractSite):
 
     name = Site.house
     first_page = "https://www.house.kg/snyat-kvartiru?region=1&town=2&rental_term=3&sort_by=upped_at+desc&page=1"
+    max_pages = 5
+    max_in_flight = 5
+    requests_per_second = 5
+    hedge_requests = True
+    parser_backend = ParserBackend.selectolax
+
+    info_container_selector: ClassVar[str] = ".details-main"
+    info_selector: ClassVar[str] = ".info-row > .label, .info-row > .info"
+    info_label_class: ClassVar[str] = "label"
 
     _host = "https://www.house.kg"
 
-    def get_announcement_pages_map(self, page: BeautifulSoup) -> dict[str, str]:
+    def get_announcement_pages_map(self, page: Page) -> dict[str, str]:
         """Use this method to get a map of announcement pages from the main page."""
         apartment_urls: list[str] = [i.attrs["content"] for i in page.select("meta[itemprop=url]")]
 
@@ -40,7 +50,7 @@ class House(AbstractSite):
         return announcement_map
 
     @staticmethod
-    def _parse_price_and_currency(parsed_response: BeautifulSoup) -> tuple[int, Currency]:
+    def _parse_price_and_currency(parsed_response: Page) -> tuple[int, Currency]:
         """Use this method to parse the price and currency from the parsed response."""
         price_elem = parsed_response.select_one(".price-dollar")
         currency = Currency.usd
@@ -53,18 +63,8 @@ class House(AbstractSite):
         return price, currency
 
     @staticmethod
-    def _fund_text_contain(parsed_response: BeautifulSoup, text: str) -> str:
-        label_elem = parsed_response.select_one(f".label:-soup-contains('{text}')")
-        if not label_elem:
-            return ""
-
-        info_elem = label_elem.parent.select_one(".info")
-        if not info_elem:
-            return ""
-        return info_elem.get_text(strip=True)
-
-    def _parse_floor_and_max_floor(self, parsed_response: BeautifulSoup) -> tuple[int, int]:
-        floor_string = self._fund_text_contain(parsed_response, "Этаж")
+    def _parse_floor_and_max_floor(info_table: dict[str, str]) -> tuple[int, int]:
+        floor_string = info_table.get("Этаж", "")
         if not floor_string:
             return 0, 0
 
@@ -78,18 +78,20 @@ class House(AbstractSite):
         return floor, max_floor
 
     @staticmethod
-    def _parse_images(parsed_response: BeautifulSoup) -> list[str]:
+    def _parse_images(parsed_response: Page) -> list[str]:
         return [i.attrs["href"] for i in parsed_response.select(".fotorama > a")]
 
-    def parse_apartment(self, parsed_response: BeautifulSoup) -> ApartmentEntity:
+    def parse_apartment(self, parsed_response: Page) -> ApartmentEntity:
         """Use this method to parse the apartment from the parsed response."""
         _canonical_url = parsed_response.select_one("link[rel='canonical']").attrs["href"]
         _external_id = _canonical_url.split("/")[-1]
 
         _title = parsed_response.select_one("h1").get_text(strip=True)
 
+        info_table = self.get_info_table(parsed_response)
+
         _price, _currency = self._parse_price_and_currency(parsed_response)
-        _floor, _max_floor = self._parse_floor_and_max_floor(parsed_response)
+        _floor, _max_floor = self._parse_floor_and_max_floor(info_table)
 
         _phone = ""
         phone_elem = parsed_response.select_one(".number")
@@ -101,12 +103,13 @@ class House(AbstractSite):
         _address = parsed_response.select_one(".address").get_text(strip=True)
         _city, _district = _address.split(",")
 
-        _description = parsed_response.select_one(".description > p").get_text(strip=True)
+        # html.parser keeps the CRLF line breaks of the description, lxml and lexbor normalize them.
+        _description = parsed_response.select_one(".description > p").get_text(strip=True).replace("\r\n", "\n")
 
         _images = self._parse_images(parsed_response)
 
         _area = 0
-        area_str = self._fund_text_contain(parsed_response, "Площадь")
+        area_str = info_table.get("Площадь", "")
         if area_str:
             _area = int(a[0]) if (a := int_regex.search(area_str)) else 0
 
@@ -1,21 +1,47 @@
 """Use this module to parse the Lalafo site."""
 from __future__ import annotations
 
-import json
+import contextlib
 import re
 from typing import Any, ClassVar, TYPE_CHECKING, TypedDict
 from urllib.parse import urljoin
 
+import orjson
 from django.db import models
 
 from easyhome.easyhome.models import Currency, Site
+from easyhome.parser.backends import ParserBackend
 from easyhome.parser.entity import ApartmentEntity
 from easyhome.parser.sites.base import AbstractSite
 
 if TYPE_CHECKING:
-    from bs4 import BeautifulSoup
+    from easyhome.parser.backends import Page
 
 int_regex = re.compile(r"\d+")
+# The titles of the feed items start with the number of rooms, e.g. "2 комнаты, ...".
+title_rooms_regex = re.compile(r"^(\d+) комнат")
+
+next_data_marker = b'id="__NEXT_DATA__"'
+script_end_marker = b"</script>"
+
+
+def extract_next_data(content: bytes) -> dict[str, Any] | None:
+    """
+    Use this function to get the `__NEXT_DATA__` JSON straight from the response bytes, without building a DOM.
+
+    The JSON is decoded from a memoryview of the script payload, so the page is neither decoded nor copied. Returns None
+    if the page has no `__NEXT_DATA__` script.
+    """
+    marker_position = content.find(next_data_marker)
+    if marker_position == -1:
+        return None
+
+    start = content.find(b">", marker_position) + 1
+    end = content.find(script_end_marker, start)
+    if start == 0 or end == -1:
+        return None
+
+    return orjson.loads(memoryview(content)[start:end])
 
 
 class ItemDef(TypedDict):  # noqa: D101
@@ -47,6 +73,11 @@ class Lalafo(AbstractSite):
 
     name = Site.lalafo
     first_page = "https://lalafo.kg/kyrgyzstan/kvartiry/arenda-kvartir/dolgosrochnaya-arenda-kvartir"
+    max_pages = 5
+    max_in_flight = 10
+    requests_per_second = 10
+    hedge_requests = True
+    parser_backend = ParserBackend.selectolax
 
     _host = "https://lalafo.kg"
     _default_next_data_json: ClassVar[dict[str, dict]] = {
@@ -70,38 +101,80 @@ class Lalafo(AbstractSite):
     floor_total_id = 229
     district_id = 357
 
-    def get_announcement_pages_map(self, page: BeautifulSoup) -> dict[str, str]:
+    def __init__(self, *, listing_only: bool = False) -> None:  # noqa: D107
+        self.listing_only = listing_only
+
+    def get_announcement_pages_map_from_content(self, content: bytes) -> dict[str, str]:
+        """Use this method to get a map of announcement pages from the main page content, the DOM isn't built."""
+        next_data = extract_next_data(content)
+        if next_data is None:
+            return super().get_announcement_pages_map_from_content(content)
+        return self._get_announcement_pages_map(next_data)
+
+    def parse_apartment_from_content(self, content: bytes) -> ApartmentEntity:
+        """Use this method to parse the apartment from the response content, the DOM isn't built."""
+        next_data = extract_next_data(content)
+        if next_data is None:
+            return super().parse_apartment_from_content(content)
+        return self._parse_apartment(next_data)
+
+    def get_listing_apartments_from_content(self, content: bytes) -> dict[str, ApartmentEntity]:
+        """
+        Use this method to build the apartments straight from the feed items of the main page content.
+
+        The feed items have the same fields as the announcement pages, except for the params: only the district is
+        there, so the floors are unknown and the number of rooms is taken from the title. The items which can't be
+        built are left to the announcement pages.
+        """
+        if not self.listing_only or (next_data := extract_next_data(content)) is None:
+            return {}
+
+        apartments: dict[str, ApartmentEntity] = {}
+        for item in self._get_listing_items(next_data):
+            with contextlib.suppress(KeyError, TypeError, ValueError):
+                apartments[str(item["id"])] = self._apartment_from_item(str(item["id"]), item)
+
+        return apartments
+
+    def get_announcement_pages_map(self, page: Page) -> dict[str, str]:
         """Use this method to get a map of announcement pages from the main page."""
         next_script_elem = page.select_one("#__NEXT_DATA__")
+        return self._get_announcement_pages_map(orjson.loads(next_script_elem.getText()))
 
-        elem_json = json.loads(next_script_elem.getText())
+    def parse_apartment(self, parsed_response: Page) -> ApartmentEntity:
+        """Use this method to parse the apartment from the parsed response."""
+        apartment_script_elem = parsed_response.select_one("#__NEXT_DATA__")
+        return self._parse_apartment(orjson.loads(apartment_script_elem.getText()))
+
+    def _get_listing_items(self, elem_json: dict[str, Any]) -> list[ItemDef]:
         props = elem_json.get("props", self._default_next_data_json)
 
         listing_fields = props["initialState"]["listing"]["listingFeed"]
-        items: list[ItemDef] = listing_fields["data"]["items"] if "data" in listing_fields else listing_fields["items"]
+        return listing_fields["data"]["items"] if "data" in listing_fields else listing_fields["items"]
 
+    def _get_announcement_pages_map(self, elem_json: dict[str, Any]) -> dict[str, str]:
         announcement_map: dict[str, str] = {}
-        for item in items:
+        for item in self._get_listing_items(elem_json):
             announcement_map[str(item["id"])] = urljoin(self._host, item["url"])
 
         return announcement_map
 
-    def parse_apartment(self, parsed_response: BeautifulSoup) -> ApartmentEntity:
-        """Use this method to parse the apartment from the parsed response."""
-        apartment_script_elem = parsed_response.select_one("#__NEXT_DATA__")
-        elem_json: dict[str, Any] = json.loads(apartment_script_elem.getText())
-
+    def _parse_apartment(self, elem_json: dict[str, Any]) -> ApartmentEntity:
         initial_state: dict[str, Any] = elem_json.get("props", {"initialState": {}})["initialState"]
 
         _external_id: str = str(initial_state["feed"]["adDetails"]["currentAdId"])
         apartment_dict: dict[str, Any] = initial_state["feed"]["adDetails"][_external_id]["item"]
+        return self._apartment_from_item(_external_id, apartment_dict)
 
+    def _apartment_from_item(self, _external_id: str, apartment_dict: dict[str, Any]) -> ApartmentEntity:
         _currency = self.currency_map[c] if (c := apartment_dict.get("currency", "")) else Currency.undefined
 
-        _params_map = {i["id"]: i["value"] for i in apartment_dict["params"]}
+        _params_map = {i["id"]: i["value"] for i in apartment_dict.get("params") or []}
 
-        _rooms = _params_map.get(LalafoParams.number_of_rooms) or ""
-        _rooms = int(r[0]) if (r := int_regex.search(_rooms)) else 0
+        if _rooms := _params_map.get(LalafoParams.number_of_rooms) or "":
+            _rooms = int(r[0]) if (r := int_regex.search(_rooms)) else 0
+        else:
+            _rooms = int(r[1]) if (r := title_rooms_regex.search(apartment_dict["title"])) else 0
 
         _floor = int(f) if (f := _params_map.get(LalafoParams.floor)) and f.isdigit() else 0
         _max_floor = int(mf) if (mf := _params_map.get(LalafoParams.number_of_floors)) and mf.isdigit() else 0
@@ -0,0 +1,16 @@
+from __future__ import annotations  # noqa: D100
+
+from typing import TYPE_CHECKING
+
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from easyhome.parser.metrics import get_registry
+
+if TYPE_CHECKING:
+    from django.http import HttpRequest
+
+
+def metrics_page(request: HttpRequest) -> HttpResponse:  # noqa: ARG001
+    """Use this view to export the metrics of the crawler for Prometheus."""
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -1,26 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+from http import HTTPStatus
 from typing import Any, TYPE_CHECKING
 
 import pytest
-from bs4 import BeautifulSoup
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from django.conf import settings
 from graphene_django.utils.testing import graphql_query
 
+from easyhome.parser.backends import ParserBackend, make_page
+from easyhome.parser.http_client import HttpClient
+from tests.helpers import ServerStats, server_stats_key
+
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterator
 
     from graphene.test import Client
 
+    from easyhome.parser.backends import Page
+
 
 @pytest.fixture  # noqa: PT001
-def parser_datasets() -> Callable[[str], BeautifulSoup]:
+def parser_datasets() -> Callable[[str, ParserBackend], Page]:
     dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
 
-    def wrap(file_path: str) -> BeautifulSoup:
-        with (dataset_path / file_path).open(mode="r") as _f:
-            parsed_file = BeautifulSoup(_f, "html.parser")
-        return parsed_file  # noqa: RET504
+    def wrap(file_path: str, backend: ParserBackend = ParserBackend.html_parser) -> Page:
+        return make_page((dataset_path / file_path).read_bytes(), backend)
 
     return wrap
 
@@ -31,3 +38,49 @@ def client_query(client: Client) -> Callable[..., dict]:
         return graphql_query(*args, **kwargs, client=client, graphql_url="/graphql/")
 
     return func
+
+
+@pytest.fixture()
+def http_server() -> Iterator[TestServer]:
+    """
+    Run a local site on the HttpClient event loop.
+
+    `/pages/{page_id}` returns a small page with the id, the `delay` query parameter delays the response and the
+    `first_delay` query parameter delays only the first response of the page. The `etag` query parameter is the
+    `ETag` of the page, the conditional requests with this `ETag` get 304.
+    `/status/{status}` returns an empty response with the status.
+    """
+    stats = ServerStats()
+
+    async def page(request: web.Request) -> web.Response:
+        stats.peers.append(request.transport.get_extra_info("peername"))
+        stats.paths[request.path] += 1
+        stats.in_flight += 1
+        stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+        try:
+            await asyncio.sleep(float(request.query.get("delay", 0)))
+            if stats.paths[request.path] == 1:
+                await asyncio.sleep(float(request.query.get("first_delay", 0)))
+        finally:
+            stats.in_flight -= 1
+
+        etag = request.query.get("etag")
+        if etag and request.headers.get("If-None-Match") == etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED)
+        text = f"<html><body><h1>{request.match_info['page_id']}</h1></body></html>"
+        return web.Response(text=text, headers={"ETag": etag} if etag else None)
+
+    async def status(request: web.Request) -> web.Response:
+        stats.paths[request.path] += 1
+        return web.Response(status=int(request.match_info["status"]))
+
+    app = web.Application()
+    app.router.add_get("/pages/{page_id}", page)
+    app.router.add_get("/status/{status}", status)
+    app[server_stats_key] = stats
+
+    event_loop = HttpClient()._event_loop
+    server = TestServer(app)
+    event_loop.run(server.start_server())
+    yield server
+    event_loop.run(server.close())
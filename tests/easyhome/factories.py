@@ -4,14 +4,15 @@ from __future__ import annotations
 import factory
 from faker import Faker
 
-from easyhome.easyhome.models import Apartment
+from easyhome.easyhome.models import Apartment, Site
 
 fake = Faker()
 Faker.seed(0)
 
 
 class ApartmentFactory(factory.django.DjangoModelFactory):
-    external_id = factory.Sequence(lambda n: n)
+    external_id = factory.Sequence(str)
+    site = Site.lalafo
     url = factory.Sequence(lambda n: f"https://ex.co/{n}")
 
     class Meta:
@@ -1,11 +1,28 @@
 from __future__ import annotations
 
+from collections import Counter
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from aiohttp import web
+
 if TYPE_CHECKING:
     from django.test.utils import CaptureQueriesContext
 
 
+@dataclass
+class ServerStats:
+    """Requests received by the `http_server` fixture."""
+
+    peers: list[tuple[str, int]] = field(default_factory=list)
+    paths: Counter[str] = field(default_factory=Counter)
+    in_flight: int = 0
+    max_in_flight: int = 0
+
+
+server_stats_key = web.AppKey("server_stats_key", ServerStats)
+
+
 def print_queries(queries: CaptureQueriesContext) -> str:
     """Return captured queries as a string."""
     return "\n" + "\n\n".join(map(lambda q: q["sql"], queries.captured_queries))  # noqa: C417
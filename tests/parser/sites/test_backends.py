@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from easyhome.parser.backends import ParserBackend, compile_selector, make_page
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from easyhome.parser.backends import Page
+    from easyhome.parser.sites.base import AbstractSite
+
+first_pages = [
+    (Diesel, "diesel_first_page.html"),
+    (House, "house_first_page.html"),
+    (Lalafo, "lalafo_first_page.html"),
+]
+
+apartment_pages = [
+    (Diesel, "diesel_293168645.html"),
+    (House, "house_08753936.html"),
+    (Lalafo, "lalafo_107495362.html"),
+    (Lalafo, "lalafo_85063437.html"),
+]
+
+
+@pytest.mark.parametrize("backend", list(ParserBackend))
+@pytest.mark.parametrize(("site_class", "file_path"), first_pages)
+def test_get_announcement_pages_map_is_same_on_backends(
+    parser_datasets: Callable[[str, ParserBackend], Page],
+    site_class: type[AbstractSite],
+    file_path: str,
+    backend: ParserBackend,
+) -> None:
+    site = site_class()
+
+    expected = site.get_announcement_pages_map(parser_datasets(file_path, ParserBackend.html_parser))
+    assert expected
+    assert site.get_announcement_pages_map(parser_datasets(file_path, backend)) == expected
+
+
+@pytest.mark.parametrize("backend", list(ParserBackend))
+@pytest.mark.parametrize(("site_class", "file_path"), apartment_pages)
+def test_parse_apartment_is_same_on_backends(
+    parser_datasets: Callable[[str, ParserBackend], Page],
+    site_class: type[AbstractSite],
+    file_path: str,
+    backend: ParserBackend,
+) -> None:
+    site = site_class()
+
+    expected = site.parse_apartment(parser_datasets(file_path, ParserBackend.html_parser))
+    assert site.parse_apartment(parser_datasets(file_path, backend)) == expected
+
+
+info_pages = [
+    (Diesel, "diesel_293168645.html", "span", ".field-value"),
+    (House, "house_08753936.html", ".label", ".info"),
+]
+
+
+@pytest.mark.parametrize("backend", list(ParserBackend))
+@pytest.mark.parametrize(("site_class", "file_path", "label_selector", "value_selector"), info_pages)
+def test_get_info_table_is_same_as_contains_lookup(  # noqa: PLR0913, PLR0917
+    parser_datasets: Callable[[str, ParserBackend], Page],
+    site_class: type[AbstractSite],
+    file_path: str,
+    label_selector: str,
+    value_selector: str,
+    backend: ParserBackend,
+) -> None:
+    # Given: an announcement page
+    page = parser_datasets(file_path, backend)
+
+    # When: the info table is built
+    info_table = site_class().get_info_table(page)
+
+    # Then: every value is the one found by the `:-soup-contains()` lookup of its label
+    assert info_table
+    for label, value in info_table.items():
+        label_elem = page.select_one(f"{label_selector}:-soup-contains('{label}')")
+        assert label_elem.parent.select_one(value_selector).get_text(strip=True) == value
+
+
+@pytest.mark.parametrize("site_class", [Diesel, House])
+def test_info_selectors_are_compiled_once_per_site(site_class: type[AbstractSite]) -> None:
+    # Given: the selectors of a site with an info table
+    info_container_selector, info_selector = site_class.info_container_selector, site_class.info_selector
+
+    # When: a subclass of the site is defined and instantiated twice
+    subclass = type(f"Custom{site_class.__name__}", (site_class,), {})
+    first_site, second_site = subclass(), subclass()
+
+    # Then: the selectors are compiled once with the class and shared by its instances
+    assert subclass._info_container_pattern is compile_selector(info_container_selector)
+    assert subclass._info_pattern is compile_selector(info_selector)
+    assert first_site._info_pattern is second_site._info_pattern
+
+
+@pytest.mark.parametrize("backend", list(ParserBackend))
+def test_make_page_decodes_declared_encoding(backend: ParserBackend) -> None:
+    # Given: a cp1251 page without a declared charset
+    content = "<html><body><h1>Квартира, 2 комнаты</h1></body></html>".encode("cp1251")
+
+    # When: the page is built with the encoding of the site
+    page = make_page(content, backend, "cp1251")
+
+    # Then: the text is decoded by the declared encoding
+    assert page.select_one("h1").get_text(strip=True) == "Квартира, 2 комнаты"
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import pytest
+
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+
+@pytest.mark.parametrize(
+    ("site", "page_number", "expected"),
+    [
+        (Lalafo(), 1, "https://lalafo.kg/kyrgyzstan/kvartiry/arenda-kvartir/dolgosrochnaya-arenda-kvartir"),
+        (Lalafo(), 2, "https://lalafo.kg/kyrgyzstan/kvartiry/arenda-kvartir/dolgosrochnaya-arenda-kvartir?page=2"),
+        (Diesel(), 3, "https://diesel.elcat.kg/index.php?showforum=305&page=3"),
+        (
+            House(),
+            2,
+            "https://www.house.kg/snyat-kvartiru?region=1&town=2&rental_term=3&sort_by=upped_at+desc&page=2",
+        ),
+    ],
+)
+def test_get_page_url(site: Lalafo | Diesel | House, page_number: int, expected: str) -> None:
+    assert site.get_page_url(page_number) == expected
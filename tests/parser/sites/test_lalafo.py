@@ -1,10 +1,13 @@
-from collections.abc import Callable  # noqa: I002
+import dataclasses  # noqa: I002
+from collections.abc import Callable
 
+import pytest
 from bs4 import BeautifulSoup
+from django.conf import settings
 
 from easyhome.easyhome.models import Currency, Site
 from easyhome.parser.entity import ApartmentEntity
-from easyhome.parser.sites.lalafo import Lalafo
+from easyhome.parser.sites.lalafo import Lalafo, extract_next_data
 
 
 def test_get_announcement_pages_map(parser_datasets: Callable[[str], BeautifulSoup]) -> None:
@@ -103,3 +106,50 @@ def test_parse_apartment(parser_datasets: Callable[[str], BeautifulSoup]) -> Non
         lat=42.8746212,
         lon=74.5697617,
     )
+
+
+def test_get_announcement_pages_map_from_content(parser_datasets: Callable[[str], BeautifulSoup]) -> None:
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_first_page.html").read_bytes()
+
+    lalafo_site = Lalafo()
+    expected = lalafo_site.get_announcement_pages_map(parser_datasets("lalafo_first_page.html"))
+    assert lalafo_site.get_announcement_pages_map_from_content(content) == expected
+
+
+@pytest.mark.parametrize("file_path", ["lalafo_107495362.html", "lalafo_85063437.html"])
+def test_parse_apartment_from_content(parser_datasets: Callable[[str], BeautifulSoup], file_path: str) -> None:
+    content = (settings.BASE_DIR / "tests/parser/__dataset__" / file_path).read_bytes()
+
+    lalafo_site = Lalafo()
+    expected = lalafo_site.parse_apartment(parser_datasets(file_path))
+    assert extract_next_data(content) is not None
+    assert lalafo_site.parse_apartment_from_content(content) == expected
+
+
+def test_parse_apartment_from_content_without_marker(parser_datasets: Callable[[str], BeautifulSoup]) -> None:
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_107495362.html").read_bytes()
+    content = content.replace(b'id="__NEXT_DATA__"', b"id='__NEXT_DATA__'")
+
+    lalafo_site = Lalafo()
+    expected = lalafo_site.parse_apartment(parser_datasets("lalafo_107495362.html"))
+    assert extract_next_data(content) is None
+    assert lalafo_site.parse_apartment_from_content(content) == expected
+
+
+def test_get_listing_apartments_from_content(parser_datasets: Callable[[str], BeautifulSoup]) -> None:
+    # Given: the main page and an announcement page of the apartment from its feed
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_first_page.html").read_bytes()
+    detail_apartment = Lalafo().parse_apartment(parser_datasets("lalafo_107495362.html"))
+
+    # When: the apartments are built from the feed
+    listing_apartments = Lalafo(listing_only=True).get_listing_apartments_from_content(content)
+
+    # Then: every announcement of the feed is built, the apartment only misses the floors of the announcement page
+    assert listing_apartments.keys() == Lalafo().get_announcement_pages_map_from_content(content).keys()
+    assert listing_apartments["107495362"] == dataclasses.replace(detail_apartment, floor=0, max_floor=0)
+
+
+def test_get_listing_apartments_from_content_is_disabled() -> None:
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_first_page.html").read_bytes()
+
+    assert Lalafo().get_listing_apartments_from_content(content) == {}
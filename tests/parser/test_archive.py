@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from django.conf import settings
+
+from easyhome.easyhome.models import Apartment, Site
+from easyhome.parser.archive import PageArchive, PageKind
+from easyhome.parser.entity import FetchResult
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.sites.lalafo import Lalafo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_store_page(tmp_path: Path) -> None:
+    # Given: a page of the site
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_107495362.html").read_bytes()
+    archive = PageArchive(tmp_path)
+
+    # When: the page is stored twice
+    digest = archive.store(Site.lalafo, PageKind.detail, content)
+    same_digest = archive.store(Site.lalafo, PageKind.detail, content)
+
+    # Then: the page is stored once by its hash, compressed, and can be read back
+    pages = list(archive.iter_pages())
+    assert digest == same_digest == hashlib.sha256(content).hexdigest()
+    assert [(p.site, p.kind, p.digest) for p in pages] == [(Site.lalafo, PageKind.detail, digest)]
+    assert pages[0].path == tmp_path / "lalafo" / "detail" / digest[:2] / f"{digest}.html.zst"
+    assert pages[0].path.stat().st_size < len(content) / 4
+    assert archive.read(pages[0]) == content
+
+
+def test_prune_pages(tmp_path: Path) -> None:
+    # Given: an old page and a recent one
+    archive = PageArchive(tmp_path, retention_days=30)
+    old_digest = archive.store(Site.lalafo, PageKind.list, b"<html>old</html>")
+    archive.store(Site.lalafo, PageKind.list, b"<html>recent</html>")
+
+    expired_at = time.time() - 31 * 24 * 60 * 60
+    os.utime(archive.get_path(Site.lalafo, PageKind.list, old_digest), (expired_at, expired_at))
+
+    # When: the archive is pruned
+    pruned = archive.prune()
+
+    # Then: only the old page is removed
+    assert pruned == 1
+    assert [p.digest for p in archive.iter_pages()] == [archive.get_digest(b"<html>recent</html>")]
+
+
+@pytest.mark.django_db
+def test_create_announcement_archives_pages(tmp_path: Path) -> None:
+    # Given: a fetched announcement page and a broken one
+    content = (settings.BASE_DIR / "tests/parser/__dataset__/lalafo_107495362.html").read_bytes()
+    fetch_results = [
+        ("107495362", FetchResult(url="", body=content, status=HTTPStatus.OK, attempts=1)),
+        ("1", FetchResult(url="", body=b"<html></html>", status=HTTPStatus.OK, attempts=1)),
+    ]
+    archive = PageArchive(tmp_path)
+
+    # When: the announcements are created
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo(), archive=archive)
+    service.create_announcement(fetch_results)
+
+    # Then: both pages are archived, the apartment refers to its page
+    apartment = Apartment.objects.get()
+    assert apartment.page_hash == archive.get_digest(content)
+    assert {p.digest for p in archive.iter_pages(Site.lalafo, PageKind.detail)} == {
+        archive.get_digest(content),
+        archive.get_digest(b"<html></html>"),
+    }
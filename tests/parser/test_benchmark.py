@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from django.conf import settings
+
+from easyhome.parser.benchmark import (
+    CALIBRATION,
+    find_regressions,
+    get_calibration_benchmark,
+    get_site_benchmarks,
+    normalize_results,
+    read_baseline,
+    run_benchmarks,
+    write_baseline,
+)
+from easyhome.parser.sites.diesel import Diesel
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_run_site_benchmarks() -> None:
+    # Given: the benchmarks of the site over the dataset
+    benchmarks = get_site_benchmarks(Diesel(), settings.BASE_DIR / "tests/parser/__dataset__")
+
+    # When: the benchmarks are measured
+    results = run_benchmarks(benchmarks, rounds=1, min_time=0)
+
+    # Then: every stage of every page of the site is measured
+    assert set(results) == {
+        "diesel.make_page.first_page",
+        "diesel.get_announcement_pages_map.first_page",
+        "diesel.make_page.293168645",
+        "diesel.parse_apartment.293168645",
+    }
+    assert all(seconds > 0 for seconds in results.values())
+
+
+def test_find_regressions(tmp_path: Path) -> None:
+    # Given: the stored baseline
+    baseline_path = tmp_path / "parsers.json"
+    write_baseline(baseline_path, {"fast": 1.0, "slow": 1.0, "removed": 1.0})
+
+    # When: the results are compared with the baseline
+    results = {"fast": 1.1, "slow": 1.3, "new": 10.0}
+    regressions = find_regressions(results, read_baseline(baseline_path), max_regression=20)
+
+    # Then: only the benchmark slower than the budget regresses
+    assert [(r.name, round(r.change)) for r in regressions] == [("slow", 30)]
+
+
+def test_normalize_results_by_calibration() -> None:
+    # Given: the results of a machine which is twice as slow as another one
+    benchmarks = [
+        get_calibration_benchmark(),
+        *get_site_benchmarks(Diesel(), settings.BASE_DIR / "tests/parser/__dataset__"),
+    ]
+    results = run_benchmarks(benchmarks, rounds=1, min_time=0)
+    slow_results = {name: seconds * 2 for name, seconds in results.items()}
+
+    # When: the results are normalized
+    normalized = normalize_results(results)
+
+    # Then: the times are in the units of the calibration benchmark, which doesn't depend on the speed of the machine
+    assert CALIBRATION not in normalized
+    assert normalized == pytest.approx(normalize_results(slow_results))
+
+
+def test_read_baseline_in_seconds(tmp_path: Path) -> None:
+    # Given: a baseline in the seconds of one machine
+    baseline_path = tmp_path / "parsers.json"
+    baseline_path.write_text('{"benchmarks": {"slow": 1.0}}')
+
+    # When: the baseline is read
+    baseline = read_baseline(baseline_path)
+
+    # Then: the baseline can't be compared with the normalized results
+    assert baseline == {}
+
+
+def test_read_missing_baseline(tmp_path: Path) -> None:
+    # When: the baseline isn't written yet
+    baseline = read_baseline(tmp_path / "parsers.json")
+
+    # Then: nothing can regress
+    assert baseline == {}
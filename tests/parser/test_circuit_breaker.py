@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from http import HTTPStatus
+
+from easyhome.parser.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def test_circuit_opens_after_failures_in_row() -> None:
+    # Given: a breaker which opens after three failures in a row
+    breaker = CircuitBreaker("diesel", failure_threshold=3)
+
+    # When: the site fails twice, answers and fails three times
+    for status in (503, 0, 200, 502, 429):
+        breaker.on_response(status)
+    state_before_last_failure = breaker.state
+    breaker.on_response(HTTPStatus.GATEWAY_TIMEOUT)
+
+    # Then: the circuit is opened by the failures in a row only and the requests are rejected
+    assert state_before_last_failure == CircuitState.closed
+    assert breaker.state == CircuitState.open
+    assert not breaker.allow_request()
+
+
+def test_half_open_circuit_lets_one_probe() -> None:
+    # Given: an open circuit after its timeout
+    breaker = CircuitBreaker("diesel", failure_threshold=1, reset_timeout=0.01)
+    breaker.on_response(HTTPStatus.SERVICE_UNAVAILABLE)
+    time.sleep(0.02)
+
+    # When: the requests are made
+    allowed = [breaker.allow_request() for _ in range(3)]
+
+    # Then: only the probe is let through
+    assert allowed == [True, False, False]
+    assert breaker.state == CircuitState.half_open
+
+
+def test_probe_closes_or_opens_circuit() -> None:
+    # Given: two half-open circuits
+    succeeded = CircuitBreaker("diesel", failure_threshold=1, reset_timeout=0.01)
+    failed = CircuitBreaker("house", failure_threshold=1, reset_timeout=0.01)
+    for breaker in (succeeded, failed):
+        breaker.on_response(HTTPStatus.SERVICE_UNAVAILABLE)
+    time.sleep(0.02)
+
+    # When: the probes are answered
+    for breaker, status in ((succeeded, HTTPStatus.OK), (failed, HTTPStatus.BAD_GATEWAY)):
+        breaker.allow_request()
+        breaker.on_response(status)
+
+    # Then: the successful probe closes its circuit, the failed one opens it again
+    assert succeeded.state == CircuitState.closed
+    assert succeeded.allow_request()
+    assert failed.state == CircuitState.open
+    assert not failed.allow_request()
+
+
+def test_cancelled_probe_lets_next_probe_through() -> None:
+    # Given: a half-open circuit and its probe
+    breaker = CircuitBreaker("diesel", failure_threshold=1, reset_timeout=0.01)
+    breaker.on_response(HTTPStatus.SERVICE_UNAVAILABLE)
+    time.sleep(0.02)
+    breaker.allow_request()
+
+    # When: the probe is cancelled by the deadline of the run
+    breaker.on_cancel()
+
+    # Then: the next request is the new probe
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.half_open
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from easyhome.parser.hedging import HedgePolicy
+
+
+def test_hedge_delay_is_latency_quantile() -> None:
+    # Given: a policy which needs ten latencies
+    policy = HedgePolicy(0.1, quantile=0.9, min_samples=10)
+
+    # When: the latencies 0.01..0.10 are observed
+    delays = []
+    for i in range(1, 11):
+        delays.append(policy.on_request())
+        policy.on_response(i / 100)
+
+    # Then: no request is hedged before the tenth latency, then the delay is the 90th percentile
+    assert delays == [None] * 10
+    assert policy.on_request() == 0.09  # noqa: PLR2004
+
+
+def test_hedge_rate_is_capped() -> None:
+    # Given: a policy which hedges at most a quarter of the requests
+    policy = HedgePolicy(0.25, burst=1)
+
+    # When: a hedge is asked for after every request
+    hedges = 0
+    for _ in range(100):
+        policy.on_request()
+        hedges += policy.take()
+
+    # Then: every fourth request is hedged
+    assert hedges == 25  # noqa: PLR2004
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import threading
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import aiohttp
+import pytest
+from bs4 import BeautifulSoup
+
+from easyhome.common.event_loop import get_event_loop_thread
+from easyhome.parser.circuit_breaker import CircuitOpenError, CircuitState
+from easyhome.parser.deadline import Deadline, DeadlineExceededError
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.sites.diesel import Diesel
+from tests.helpers import server_stats_key
+
+if TYPE_CHECKING:
+    from aiohttp.test_utils import TestServer
+    from pytest_django.fixtures import SettingsWrapper
+
+
+def page_title(body: bytes) -> str:
+    return BeautifulSoup(body, "html.parser").select_one("h1").get_text()
+
+
+def test_fetch_announcement_pages(http_server: TestServer) -> None:
+    # Given: a map of announcement pages
+    pages_map = {str(i): str(http_server.make_url(f"/pages/{i}")) for i in range(5)}
+
+    # When: the pages are fetched
+    fetch_results = HttpClient().fetch_announcement_pages(pages_map)
+
+    # Then: every page is fetched
+    assert {k: page_title(v.body) for k, v in fetch_results.items()} == {str(i): str(i) for i in range(5)}
+    assert all(v.ok and v.status == HTTPStatus.OK and v.attempts == 1 for v in fetch_results.values())
+
+
+def test_fetch_announcement_pages_reuses_session(http_server: TestServer) -> None:
+    # Given: the http client
+    http_client = HttpClient()
+
+    # When: the pages are fetched by several runs one after another
+    http_client.fetch_announcement_pages({"1": str(http_server.make_url("/pages/1"))})
+    async_session = http_client.async_session
+    http_client.fetch_announcement_pages({"2": str(http_server.make_url("/pages/2"))})
+
+    # Then: the runs share the session and its connection
+    assert http_client.async_session is async_session
+    assert len(set(http_server.app[server_stats_key].peers)) == 1
+
+
+def test_fetch_announcement_pages_from_threads(http_server: TestServer) -> None:
+    # Given: several threads which use the http client at the same time
+    results: dict[str, str] = {}
+
+    def fetch(page_id: str) -> None:
+        fetch_results = HttpClient().fetch_announcement_pages({page_id: str(http_server.make_url(f"/pages/{page_id}"))})
+        results[page_id] = page_title(fetch_results[page_id].body)
+
+    threads = [threading.Thread(target=fetch, args=(str(i),)) for i in range(5)]
+
+    # When: the pages are fetched
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Then: each thread gets its page
+    assert results == {str(i): str(i) for i in range(5)}
+
+
+def test_fetch_first_page_from_threads_shares_event_loop(http_server: TestServer) -> None:
+    # Given: the scheduler threads which run one after another
+    bodies: list[bytes | None] = []
+
+    def fetch(page_id: str) -> None:
+        bodies.append(HttpClient().fetch_first_page(str(http_server.make_url(f"/pages/{page_id}"))))
+
+    # When: every thread fetches a first page
+    for i in range(3):
+        thread = threading.Thread(target=fetch, args=(str(i),))
+        thread.start()
+        thread.join()
+
+    # Then: the requests are made on the event loop of the process by one connection
+    assert [page_title(body) for body in bodies] == ["0", "1", "2"]
+    assert HttpClient()._event_loop is get_event_loop_thread()
+    assert len(set(http_server.app[server_stats_key].peers)) == 1
+
+
+def test_fetch_announcement_pages_limits_requests_in_flight(http_server: TestServer) -> None:
+    # Given: a site which allows two requests at the same time
+    class LimitedSite(Diesel):
+        max_in_flight = 2
+
+    pages_map = {str(i): str(http_server.make_url(f"/pages/{i}").with_query(delay=0.05)) for i in range(6)}
+
+    # When: the pages are fetched
+    fetch_results = HttpClient().fetch_announcement_pages(pages_map, site=LimitedSite())
+
+    # Then: every page is fetched without exceeding the limit
+    assert all(v.ok for v in fetch_results.values())
+    assert http_server.app[server_stats_key].max_in_flight == 2  # noqa: PLR2004
+
+
+def test_adaptive_limit_is_capped_by_connections_of_host(settings: SettingsWrapper) -> None:
+    # Given: more requests in flight than the connections per host
+    settings.PARSER_ADAPTIVE_CONCURRENCY = True
+    settings.AIOHTTP_REQUEST_LIMIT = 15
+    settings.AIOHTTP_CONNECTION_LIMIT_PER_HOST = 10
+
+    # When: the limiter of a site is created
+    limiter = HttpClient()._get_limiter("https://adaptive.example.com/1", Diesel())
+
+    # Then: the limit can't grow above the connections of the host
+    assert limiter.controller.max_limit == settings.AIOHTTP_CONNECTION_LIMIT_PER_HOST
+
+
+def test_fetch_announcement_pages_partial_failure(http_server: TestServer) -> None:
+    # Given: a deleted announcement among the existing ones
+    pages_map = {
+        "1": str(http_server.make_url("/pages/1")),
+        "2": str(http_server.make_url("/status/404")),
+        "3": str(http_server.make_url("/pages/3")),
+    }
+
+    # When: the pages are fetched
+    fetch_results = HttpClient().fetch_announcement_pages(pages_map)
+
+    # Then: the existing announcements are fetched and the deleted one is not retried
+    assert [k for k, v in fetch_results.items() if v.ok] == ["1", "3"]
+    assert fetch_results["2"].status == HTTPStatus.NOT_FOUND
+    assert fetch_results["2"].attempts == 1
+    assert fetch_results["2"].error == f"Response 404 for URL {pages_map['2']}."
+
+
+def test_fetch_announcement_pages_retry_budget(http_server: TestServer, settings: SettingsWrapper) -> None:
+    # Given: a run which may retry one request and two unavailable pages
+    settings.PARSER_RETRY_BUDGET = 1
+    pages_map = {
+        "1": str(http_server.make_url("/status/503").with_query(page=1)),
+        "2": str(http_server.make_url("/status/503").with_query(page=2)),
+    }
+
+    # When: the pages are fetched
+    fetch_results = HttpClient().fetch_announcement_pages(pages_map)
+
+    # Then: only one request is retried
+    assert sorted(v.attempts for v in fetch_results.values()) == [1, 2]
+    assert all(v.status == HTTPStatus.SERVICE_UNAVAILABLE for v in fetch_results.values())
+    assert http_server.app[server_stats_key].paths["/status/503"] == 3  # noqa: PLR2004
+
+
+def test_iter_announcement_pages_yields_pages_as_they_come(http_server: TestServer) -> None:
+    # Given: a slow page before a fast one
+    pages_map = {
+        "1": str(http_server.make_url("/pages/1").with_query(delay=0.2)),
+        "2": str(http_server.make_url("/pages/2")),
+    }
+
+    # When: the pages are fetched
+    fetch_results = list(HttpClient().iter_announcement_pages(pages_map))
+
+    # Then: the fast page comes first
+    assert [external_id for external_id, _ in fetch_results] == ["2", "1"]
+
+
+def test_iter_announcement_pages_pauses_when_consumer_is_slow(
+    http_server: TestServer,
+    settings: SettingsWrapper,
+) -> None:
+    # Given: two workers, a queue of one page and a slow consumer
+    settings.AIOHTTP_REQUEST_LIMIT = 2
+    settings.PARSER_PIPELINE_QUEUE_SIZE = 1
+    pages_map = {str(i): str(http_server.make_url(f"/pages/{i}")) for i in range(10)}
+
+    # When: the consumer takes the first page and waits
+    fetch_results = HttpClient().iter_announcement_pages(pages_map)
+    next(fetch_results)
+    time.sleep(0.2)
+
+    # Then: the fetching is paused until the consumer takes the next pages
+    assert sum(http_server.app[server_stats_key].paths.values()) <= 4  # noqa: PLR2004
+    assert len(list(fetch_results)) == 9  # noqa: PLR2004
+
+
+def test_afetch_first_page(http_server: TestServer) -> None:
+    # Given: the first page of a site and a broken one
+    http_client = HttpClient()
+
+    # When: the pages are fetched on the event loop of the client
+    body = http_client.run(http_client.afetch_first_page(str(http_server.make_url("/pages/first"))))
+    with pytest.raises(aiohttp.ClientError, match="Response 404"):
+        http_client.run(http_client.afetch_first_page(str(http_server.make_url("/status/404"))))
+
+    # Then: the body of the page is returned, the broken page raises the error
+    assert page_title(body) == "first"
+
+
+def test_afetch_first_page_fails_fast_when_site_is_down(http_server: TestServer, settings: SettingsWrapper) -> None:
+    # Given: a site which is down, its circuit is opened after two failed requests
+    settings.PARSER_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.PARSER_RETRY_BUDGET = 0
+    http_client = HttpClient()
+    url = str(http_server.make_url("/status/503"))
+    http_client.fetch_announcement_pages({"1": url, "2": url})
+
+    # When: the first page of the site is fetched
+    with pytest.raises(CircuitOpenError):
+        http_client.run(http_client.afetch_first_page(url))
+
+    # Then: the site isn't requested while its circuit is open
+    assert http_server.app[server_stats_key].paths["/status/503"] == 2  # noqa: PLR2004
+
+
+def test_fetch_first_page_closes_circuit_when_site_is_back(http_server: TestServer, settings: SettingsWrapper) -> None:
+    # Given: a site whose circuit is opened by two failed requests and is half-open right away
+    settings.PARSER_CIRCUIT_FAILURE_THRESHOLD = 2
+    settings.PARSER_CIRCUIT_RESET_TIMEOUT = 0
+    settings.PARSER_RETRY_BUDGET = 0
+    http_client = HttpClient()
+    url = str(http_server.make_url("/status/503"))
+    http_client.fetch_announcement_pages({"1": url, "2": url})
+    breaker = http_client.get_breaker(url)
+    assert breaker.state == CircuitState.open
+
+    # When: the first page of the site is fetched as the probe
+    body = http_client.fetch_first_page(str(http_server.make_url("/pages/first")))
+
+    # Then: the probe is made once and its success closes the circuit
+    assert page_title(body) == "first"
+    assert breaker.state == CircuitState.closed
+    assert http_server.app[server_stats_key].paths["/pages/first"] == 1
+
+
+def test_fetch_announcement_pages_read_timeout_of_site(http_server: TestServer, settings: SettingsWrapper) -> None:
+    # Given: a site which waits for the response at most 0.05 seconds and a slow page
+    class ImpatientSite(Diesel):
+        read_timeout = 0.05
+
+    settings.PARSER_RETRY_BUDGET = 0
+    pages_map = {"1": str(http_server.make_url("/pages/1").with_query(delay=0.5))}
+
+    # When: the page is fetched
+    fetch_results = HttpClient().fetch_announcement_pages(pages_map, site=ImpatientSite())
+
+    # Then: the request is timed out by the site
+    assert fetch_results["1"].status == 0
+    assert "Timeout on reading data from socket" in fetch_results["1"].error
+
+
+def test_iter_announcement_pages_cancels_fetches_at_deadline(http_server: TestServer) -> None:
+    # Given: a fast page, a page which takes longer than the run and a deadline of 0.2 seconds
+    pages_map = {
+        "1": str(http_server.make_url("/pages/1")),
+        "2": str(http_server.make_url("/pages/2").with_query(delay=5)),
+    }
+    started_at = time.monotonic()
+    fetch_results = HttpClient().iter_announcement_pages(pages_map, deadline=Deadline(0.2))
+
+    # When: the pages are fetched
+    external_id, _ = next(fetch_results)
+    with pytest.raises(DeadlineExceededError):
+        next(fetch_results)
+
+    # Then: the fast page is yielded and the slow one is cancelled at the deadline
+    assert external_id == "1"
+    assert time.monotonic() - started_at < 1
+    assert http_server.app[server_stats_key].in_flight == 0
+
+
+def test_fetch_first_page_after_deadline(http_server: TestServer) -> None:
+    # Given: an expired deadline
+    deadline = Deadline(0)
+
+    # When: the first page is fetched
+    with pytest.raises(DeadlineExceededError):
+        HttpClient().fetch_first_page(str(http_server.make_url("/pages/first")), deadline=deadline)
+
+    # Then: the page isn't requested
+    assert not http_server.app[server_stats_key].paths
+
+
+def test_fetch_announcement_pages_hedges_slow_request(http_server: TestServer, settings: SettingsWrapper) -> None:
+    # Given: a site with hedging which answered fast twenty times and a page which is slow only the first time
+    class HedgedSite(Diesel):
+        requests_per_second = 0
+        hedge_requests = True
+
+    settings.PARSER_HEDGE_MAX_RATE = 1
+    site = HedgedSite()
+    http_client = HttpClient()
+    http_client.fetch_announcement_pages({str(i): str(http_server.make_url(f"/pages/{i}")) for i in range(20)}, site)
+
+    hedge = http_client._get_hedge_policy(str(http_server.make_url("/pages/slow")), site)
+    delay = hedge.delay
+
+    # When: the slow page is fetched
+    started_at = time.monotonic()
+    fetch_results = http_client.fetch_announcement_pages(
+        {"slow": str(http_server.make_url("/pages/slow").with_query(first_delay=5))},
+        site,
+    )
+
+    # Then: the duplicate answers first, its latency is measured from the first request and the slow one is cancelled
+    assert fetch_results["slow"].ok
+    assert time.monotonic() - started_at < 1
+    assert hedge._latencies[-1] >= delay
+    assert http_server.app[server_stats_key].paths["/pages/slow"] == 2  # noqa: PLR2004
+    assert http_server.app[server_stats_key].in_flight == 0
+
+
+def test_fetch_first_page_conditional_request(http_server: TestServer) -> None:
+    # Given: a first page with an ETag which was fetched once
+    http_client = HttpClient()
+    url = str(http_server.make_url("/pages/first").with_query(etag='"v1"'))
+    http_client.fetch_first_page(url)
+
+    # When: the page is fetched again by the conditional requests
+    body = http_client.fetch_first_page(url, conditional=True)
+    async_body = http_client.run(http_client.afetch_first_page(url, conditional=True))
+
+    # Then: the page isn't modified, so it isn't sent again
+    assert body is async_body is None
+    assert http_server.app[server_stats_key].paths["/pages/first"] == 3  # noqa: PLR2004
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from django.conf import settings
+from prometheus_client import REGISTRY
+
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.metrics import Stage
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.simulator import SimulatorConfig, SiteSimulator
+from easyhome.parser.sites.diesel import Diesel
+
+if TYPE_CHECKING:
+    from django.test import Client
+
+
+def get_sample_value(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.django_db
+def test_crawl_metrics() -> None:
+    # Given: a simulated site
+    simulator = SiteSimulator(Diesel(), settings.BASE_DIR / "tests/parser/__dataset__", SimulatorConfig(pages=1))
+    simulator.start()
+    site = simulator.get_site()
+    site.requests_per_second = 0
+    stage_count = "easyhome_parser_stage_duration_seconds_count"
+    stages_before = {stage: get_sample_value(stage_count, site="diesel", stage=stage) for stage in Stage}
+    responses_before = get_sample_value("easyhome_parser_responses_total", site="diesel", status="200")
+    new_before = get_sample_value("easyhome_parser_announcements_total", site="diesel", result="new")
+
+    # When: the site is crawled
+    try:
+        ParseSiteService(http_client=HttpClient(), site=site).parse()
+    finally:
+        simulator.stop()
+
+    # Then: every stage is measured and the responses and the new announcements are counted
+    detail_pages = simulator.stats.detail_pages
+    stages = {
+        stage: get_sample_value(stage_count, site="diesel", stage=stage) - stages_before[stage] for stage in Stage
+    }
+    assert stages[Stage.first_page] == stages[Stage.pages_map] == stages[Stage.filter] == 1
+    assert stages[Stage.fetch] == stages[Stage.parse] == detail_pages
+    assert stages[Stage.insert] > 0
+    assert get_sample_value("easyhome_parser_responses_total", site="diesel", status="200") - responses_before == (
+        detail_pages + 1
+    )
+    assert get_sample_value("easyhome_parser_announcements_total", site="diesel", result="new") - new_before == (
+        detail_pages
+    )
+
+
+def test_metrics_page(client: Client) -> None:
+    # When: the metrics are requested
+    response = client.get("/metrics/")
+
+    # Then: the metrics of the crawler are exported
+    assert response.status_code == 200  # noqa: PLR2004
+    assert b"easyhome_parser_stage_duration_seconds" in response.content
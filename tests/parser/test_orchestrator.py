@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+from typing import Any, TYPE_CHECKING, TypeVar
+
+import aiohttp
+import pytest
+from django.conf import settings
+
+from easyhome.easyhome.models import Apartment, Site
+from easyhome.parser.entity import FetchResult
+from easyhome.parser.orchestrator import CrawlOrchestrator
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Coroutine
+
+    from easyhome.parser.deadline import Deadline
+    from easyhome.parser.rate_limit import RetryBudget
+    from easyhome.parser.sites.base import AbstractSite
+
+# The async ORM queries the database from another thread, so the data must be committed.
+pytestmark = pytest.mark.django_db(transaction=True)
+
+T = TypeVar("T")
+
+
+class DatasetHttpClient:
+    """Serve the dataset pages instead of the sites, the pages which aren't in the dataset are not found."""
+
+    def __init__(self, broken_sites: set[str]) -> None:
+        self.dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+        self.broken_sites = broken_sites
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run(coro)
+
+    async def afetch_first_page(
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes:
+        if site.name in self.broken_sites:
+            msg = f"Response 503 for URL {page_url}."
+            raise aiohttp.ClientError(msg)
+        return (self.dataset_path / f"{site.name}_first_page.html").read_bytes()
+
+    async def aiter_announcement_pages(
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> AsyncIterator[tuple[str, FetchResult]]:
+        for external_id, url in pages_map.items():
+            page_path = self.dataset_path / f"{site.name}_{external_id.split('-')[-1]}.html"
+            if page_path.exists():
+                yield external_id, FetchResult(url=url, body=page_path.read_bytes(), status=HTTPStatus.OK, attempts=1)
+            else:
+                yield external_id, FetchResult(url=url, status=HTTPStatus.NOT_FOUND, attempts=1, error="Not found.")
+
+
+def test_crawl_all_sites() -> None:
+    # Given: three sites, the first page of House is broken
+    http_client = DatasetHttpClient(broken_sites={Site.house})
+    services = [ParseSiteService(http_client=http_client, site=site) for site in (Lalafo(), Diesel(), House())]
+
+    # When: the sites are crawled
+    CrawlOrchestrator(http_client=http_client, services=services).crawl()
+
+    # Then: the announcements of the other sites are stored
+    assert set(Apartment.objects.values_list("site", "external_id")) == {
+        (Site.lalafo, "107495362"),
+        (Site.diesel, "293168645"),
+    }
+
+
+def test_crawl_all_sites_skips_existing_announcements() -> None:
+    # Given: the sites were crawled once
+    http_client = DatasetHttpClient(broken_sites=set())
+    services = [ParseSiteService(http_client=http_client, site=site) for site in (Lalafo(), Diesel())]
+    CrawlOrchestrator(http_client=http_client, services=services).crawl()
+
+    # When: the sites are crawled again
+    CrawlOrchestrator(http_client=http_client, services=services).crawl()
+
+    # Then: the announcements are stored once
+    assert Apartment.objects.count() == 2  # noqa: PLR2004
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+from easyhome.parser.parse_pool import ParsePool
+
+if TYPE_CHECKING:
+    import pytest
+    from pytest_django.fixtures import SettingsWrapper
+
+
+def get_thread_names() -> list[str]:
+    return [thread.name for thread in threading.enumerate()]
+
+
+def test_worker_does_not_run_scheduler(settings: SettingsWrapper, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: a pool of one worker process started with the scheduler enabled
+    settings.PARSER_POOL_SIZE = 1
+    monkeypatch.setenv("SCHEDULER_DIESEL_ENABLED", "true")
+
+    # When: the threads of the worker are listed
+    try:
+        thread_names = ParsePool().get_executor().submit(get_thread_names).result()
+    finally:
+        ParsePool().close()
+
+    # Then: the worker doesn't run the scheduler of the web worker
+    assert "APScheduler" not in thread_names
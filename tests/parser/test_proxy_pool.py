@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.proxy_pool import ProxyPool
+from easyhome.parser.sites.diesel import Diesel
+from tests.helpers import server_stats_key
+
+if TYPE_CHECKING:
+    import pytest
+    from aiohttp.test_utils import TestServer
+
+
+def test_proxy_pool_spreads_load_by_score() -> None:
+    # Given: a fast proxy, a slow one and a new one
+    pool = ProxyPool(["http://fast:3128", "http://slow:3128", "http://new:3128"], seed=0)
+    fast, slow, _ = pool.proxies
+    pool.on_response(fast, HTTPStatus.OK, 0.1)
+    pool.on_response(slow, HTTPStatus.OK, 1.0)
+
+    # When: the proxies are chosen
+    chosen = Counter(pool.choose().name for _ in range(1000))
+
+    # Then: the fast and the new proxies get most of the load, the slow one still gets some
+    assert chosen["fast:3128"] > 5 * chosen["slow:3128"] > 0
+    assert chosen["new:3128"] > 5 * chosen["slow:3128"]
+
+
+def test_proxy_pool_evicts_failing_proxy() -> None:
+    # Given: two proxies, the first one fails
+    pool = ProxyPool(["http://broken:3128", "http://healthy:3128"], min_requests=2, eviction_timeout=0.05)
+    broken, _ = pool.proxies
+
+    # When: the broken proxy fails twice in a row
+    for status in (HTTPStatus.TOO_MANY_REQUESTS, 0):
+        pool.on_response(broken, status, 0.1)
+
+    # Then: it's not chosen until the eviction is over
+    assert {pool.choose().name for _ in range(100)} == {"healthy:3128"}
+    time.sleep(0.06)
+    assert "broken:3128" in {pool.choose().name for _ in range(100)}
+
+
+def test_fetch_announcement_pages_via_proxy(http_server: TestServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Given: a site with `use_proxy` which is reachable only via the proxy
+    class ProxiedSite(Diesel):
+        use_proxy = True
+        requests_per_second = 0
+
+    http_client = HttpClient()
+    monkeypatch.setattr(http_client, "proxy_pool", ProxyPool([str(http_server.make_url("/"))]))
+    pages_map = {str(i): f"http://site.invalid/pages/{i}" for i in range(3)}
+
+    # When: the pages are fetched
+    fetch_results = http_client.fetch_announcement_pages(pages_map, site=ProxiedSite())
+
+    # Then: the pages are fetched via the proxy and the proxy is scored
+    assert all(result.ok for result in fetch_results.values())
+    assert sum(http_server.app[server_stats_key].paths.values()) == 3  # noqa: PLR2004
+    assert http_client.proxy_pool.proxies[0].requests == 3  # noqa: PLR2004
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from http import HTTPStatus
+
+from easyhome.parser.rate_limit import AimdController, RequestLimiter, TokenBucket
+
+
+def test_token_bucket_limits_rate() -> None:
+    # Given: a bucket with 20 tokens per second and one token of capacity
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def acquire_many() -> None:
+        for _ in range(5):
+            await bucket.acquire()
+
+    # When: five tokens are taken
+    started_at = time.monotonic()
+    asyncio.run(acquire_many())
+
+    # Then: the last four tokens wait for the refill
+    assert time.monotonic() - started_at >= 0.19  # noqa: PLR2004
+
+
+def test_request_limiter_limits_in_flight() -> None:
+    # Given: a limiter which allows two requests at the same time
+    limiter = RequestLimiter(limit=2)
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal max_in_flight
+        async with limiter.slot():
+            max_in_flight = max(max_in_flight, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def requests() -> None:
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    # When: ten requests are made
+    asyncio.run(requests())
+
+    # Then: at most two of them are in flight
+    assert max_in_flight == 2  # noqa: PLR2004
+    assert limiter.in_flight == 0
+
+
+def test_request_limiter_picks_up_new_limit() -> None:
+    # Given: a limiter which allows one request at the same time
+    limiter = RequestLimiter(limit=1)
+    max_in_flight = 0
+
+    async def request() -> None:
+        nonlocal max_in_flight
+        async with limiter.slot():
+            max_in_flight = max(max_in_flight, limiter.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def requests() -> None:
+        limiter.limit = 3
+        await asyncio.gather(*(request() for _ in range(10)))
+
+    # When: the limit is increased
+    asyncio.run(requests())
+
+    # Then: the new limit is used
+    assert max_in_flight == 3  # noqa: PLR2004
+
+
+def test_aimd_controller_increases_limit_additively() -> None:
+    # Given: a controller with the limit of two requests
+    controller = AimdController(2, max_limit=3)
+
+    # When: the healthy responses come
+    limits = [controller.on_response(HTTPStatus.OK, time.monotonic(), 0.1) for _ in range(8)]
+
+    # Then: the limit grows by one after every round of requests up to the highest one
+    assert limits == [2, 3, 3, 3, 3, 3, 3, 3]
+
+
+def test_aimd_controller_decreases_limit_once_per_burst() -> None:
+    # Given: a controller with the limit of eight requests
+    controller = AimdController(8)
+    started_at = time.monotonic()
+
+    # When: the requests started at the same time fail, then a request started after the cut fails
+    burst_limits = [controller.on_response(status, started_at, 0.1) for status in (503, 502, 0, 429)]
+    limit = controller.on_response(HTTPStatus.GATEWAY_TIMEOUT, time.monotonic(), 0.1)
+
+    # Then: the burst cuts the limit once, the next failure cuts it again
+    assert burst_limits == [4, 4, 4, 4]
+    assert limit == 2  # noqa: PLR2004
+
+
+def test_aimd_controller_decreases_limit_on_latency_spike() -> None:
+    # Given: a controller which got fast healthy responses
+    controller = AimdController(4, max_limit=4, min_spike_latency=0.5)
+    for _ in range(5):
+        controller.on_response(HTTPStatus.OK, time.monotonic(), 0.1)
+
+    # When: a slow response and a response slower than the average but fast come
+    slow_limit = controller.on_response(HTTPStatus.OK, time.monotonic(), 1.0)
+    fast_limit = controller.on_response(HTTPStatus.OK, time.monotonic(), 0.4)
+
+    # Then: only the slow response cuts the limit
+    assert slow_limit == fast_limit == 2  # noqa: PLR2004
+
+
+def test_request_limiter_follows_controller() -> None:
+    # Given: a limiter with a controller
+    limiter = RequestLimiter(limit=4, controller=AimdController(4))
+
+    # When: the host is overloaded
+    asyncio.run(limiter.on_response(HTTPStatus.SERVICE_UNAVAILABLE, time.monotonic(), 0.1))
+
+    # Then: the limit of the limiter is cut
+    assert limiter.limit == 2  # noqa: PLR2004
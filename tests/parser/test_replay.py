@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+
+from easyhome.easyhome.models import Apartment, Site
+from easyhome.parser.archive import PageArchive, PageKind
+from easyhome.parser.replay import ReplayService, iter_replay_pages
+from easyhome.parser.sites.diesel import Diesel
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+
+
+def get_sites() -> dict[str, Lalafo | Diesel | House]:
+    return {Site.lalafo: Lalafo(), Site.diesel: Diesel(), Site.house: House()}
+
+
+def test_replay_dataset_dry_run() -> None:
+    # Given: the directory of the stored pages
+    pages = iter_replay_pages(dataset_path)
+
+    # When: the pages are replayed without the database
+    stats = ReplayService(sites=get_sites(), dry_run=True).replay(pages)
+
+    # Then: every page is parsed and the stages are measured
+    assert (stats.list_pages, stats.detail_pages, stats.apartments, stats.failures) == (3, 4, 4, 0)
+    assert stats.announcements > 0
+    assert set(stats.timings) == {"read", "list", "parse"}
+    assert stats.pages_per_second > 0
+
+
+@pytest.mark.django_db
+def test_replay_archive_updates_stored_apartments(tmp_path: Path) -> None:
+    # Given: an archived page of an apartment which was stored by a broken parser
+    content = (dataset_path / "lalafo_107495362.html").read_bytes()
+    archive = PageArchive(tmp_path)
+    digest = archive.store(Site.lalafo, PageKind.detail, content)
+    apartment = Lalafo().parse_apartment_from_content(content)
+    Apartment.objects.create(site=Site.lalafo, external_id=apartment.external_id, url=apartment.external_url, price=0)
+
+    # When: the archive is replayed
+    stats = ReplayService(sites=get_sites()).replay(iter_replay_pages(tmp_path))
+
+    # Then: the stored apartment is updated by the new parsing result and linked to its page
+    stored = Apartment.objects.get()
+    assert stats.apartments == 1
+    assert "save" in stats.timings
+    assert stored.price == apartment.price
+    assert stored.page_hash == digest
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("reverse", [False, True])
+def test_replay_archive_prefers_announcement_pages_to_list_pages(tmp_path: Path, *, reverse: bool) -> None:
+    # Given: an archive of a list page of the listing-only site and the announcement page of one of its apartments
+    archive = PageArchive(tmp_path)
+    archive.store(Site.lalafo, PageKind.list, (dataset_path / "lalafo_first_page.html").read_bytes())
+    content = (dataset_path / "lalafo_107495362.html").read_bytes()
+    apartment = Lalafo().parse_apartment_from_content(content)
+    digest = archive.store(Site.lalafo, PageKind.detail, content)
+    pages = sorted(iter_replay_pages(tmp_path), key=lambda page: page.kind, reverse=reverse)
+
+    # When: the pages are replayed in one batch
+    ReplayService(sites={Site.lalafo: Lalafo(listing_only=True)}).replay(pages)
+
+    # Then: the complete listing apartments are stored once, the one with its page keeps the parsed fields
+    site = Lalafo(listing_only=True)
+    list_content = (dataset_path / "lalafo_first_page.html").read_bytes()
+    listing_apartments = site.get_complete_listing_apartments_from_content(
+        list_content,
+        site.get_announcement_pages_map_from_content(list_content),
+    )
+    stored = Apartment.objects.get(external_id=apartment.external_id)
+    assert Apartment.objects.count() == len(listing_apartments)
+    assert (stored.floor, stored.max_floor, stored.page_hash) == (apartment.floor, apartment.max_floor, digest)
+
+
+@pytest.mark.django_db
+def test_replay_archive_keeps_newest_snapshot_of_announcement(tmp_path: Path) -> None:
+    # Given: two snapshots of the same announcement page, the newest one has the first digest in the path order
+    content = (dataset_path / "lalafo_107495362.html").read_bytes()
+    archive = PageArchive(tmp_path)
+    digests = sorted(
+        archive.store(Site.lalafo, PageKind.detail, content + snapshot) for snapshot in (b"<!-- 1 -->", b"<!-- 2 -->")
+    )
+    newest_digest, oldest_digest = digests
+    os.utime(archive.get_path(Site.lalafo, PageKind.detail, oldest_digest), (1, 1))
+
+    # When: the archive is replayed
+    ReplayService(sites=get_sites()).replay(iter_replay_pages(tmp_path))
+
+    # Then: the stored apartment is linked to the newest snapshot
+    assert Apartment.objects.get().page_hash == newest_digest
+
+
+def test_replay_command_dry_run() -> None:
+    # Given: the output of the command
+    stdout = StringIO()
+
+    # When: the pages of one site are replayed
+    call_command("parse", replay=dataset_path, site="diesel", dry_run=True, stdout=stdout)
+
+    # Then: the report shows the pages of the site, the other pages are skipped
+    assert "Replayed 2 pages (1 list, 1 detail)" in stdout.getvalue()
+    assert "5 pages skipped" in stdout.getvalue()
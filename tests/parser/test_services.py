@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from prometheus_client import REGISTRY
+
+from easyhome.easyhome.models import Apartment, Currency, Site
+from easyhome.parser.deadline import DeadlineExceededError
+from easyhome.parser.entity import ApartmentEntity, FetchResult
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.parse_pool import ParsePool
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.sites.base import AbstractSite
+from easyhome.parser.sites.house import House
+from easyhome.parser.sites.lalafo import Lalafo
+from tests.easyhome.factories import ApartmentFactory
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest_django import DjangoAssertNumQueries
+    from pytest_django.fixtures import SettingsWrapper
+
+    from easyhome.parser.backends import Page
+    from easyhome.parser.deadline import Deadline
+    from easyhome.parser.rate_limit import RetryBudget
+
+pytestmark = pytest.mark.django_db
+
+
+def test_filter_non_existing_announcement() -> None:
+    # Given: stored announcements for the same ids on different sites
+    ApartmentFactory(site=Site.lalafo, external_id="107495362")
+    ApartmentFactory(site=Site.house, external_id="85063437")
+
+    pages_map = {
+        "107495362": "https://lalafo.kg/bishkek/ads/107495362",
+        "85063437": "https://lalafo.kg/bishkek/ads/85063437",
+    }
+
+    # When: the announcements are filtered
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo())
+    non_existing_announcement = service.filter_non_existing_announcement(pages_map)
+
+    # Then: only the announcement stored for this site is skipped
+    assert non_existing_announcement == {"85063437": "https://lalafo.kg/bishkek/ads/85063437"}
+
+
+def test_filter_non_existing_announcement_with_string_id() -> None:
+    # Given: a stored announcement with a non-numeric id
+    ApartmentFactory(site=Site.house, external_id="143143565ae557fecb240-08753936")
+
+    pages_map = {"143143565ae557fecb240-08753936": "https://www.house.kg/details/143143565ae557fecb240-08753936"}
+
+    # When: the announcements are filtered
+    service = ParseSiteService(http_client=HttpClient(), site=House())
+
+    # Then: the announcement is skipped
+    assert service.filter_non_existing_announcement(pages_map) == {}
+
+
+def test_apartment_identity_is_unique_per_site() -> None:
+    # Given: a stored announcement
+    ApartmentFactory(site=Site.lalafo, external_id="107495362")
+
+    # When: the same announcement is stored again
+    Apartment.objects.bulk_create([Apartment(site=Site.lalafo, external_id="107495362")], ignore_conflicts=True)
+
+    # Then: the announcement is stored only once
+    assert Apartment.objects.filter(site=Site.lalafo, external_id="107495362").count() == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_save_apartments_counts_inserted_apartments(*, use_async: bool) -> None:
+    # Given: a batch of two apartments, one of them is already stored by another run
+    dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+    apartments = [
+        Lalafo().parse_apartment_from_content((dataset_path / f"lalafo_{external_id}.html").read_bytes())
+        for external_id in ("107495362", "85063437")
+    ]
+    ApartmentFactory(site=Site.lalafo, external_id=apartments[0].external_id)
+    new_count = "easyhome_parser_announcements_total"
+    new_before = REGISTRY.get_sample_value(new_count, {"site": Site.lalafo, "result": "new"}) or 0.0
+
+    # When: the apartments are saved
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo())
+    if use_async:
+        # The async ORM runs the queries in this thread, so they see the apartment of the test transaction.
+        async_to_sync(service.asave_apartments)(apartments)
+    else:
+        service.save_apartments(apartments)
+
+    # Then: only the inserted apartment is counted as new
+    assert Apartment.objects.filter(site=Site.lalafo).count() == len(apartments)
+    assert REGISTRY.get_sample_value(new_count, {"site": Site.lalafo, "result": "new"}) == new_before + 1
+
+
+def test_create_announcement_skips_failed_pages() -> None:
+    # Given: a fetched announcement page and a failed one
+    dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+    fetch_results = {
+        "107495362": FetchResult(
+            url="https://lalafo.kg/bishkek/ads/107495362",
+            body=(dataset_path / "lalafo_107495362.html").read_bytes(),
+            status=HTTPStatus.OK,
+            attempts=1,
+        ),
+        "85063437": FetchResult(
+            url="https://lalafo.kg/bishkek/ads/85063437",
+            status=HTTPStatus.NOT_FOUND,
+            attempts=1,
+            error="Response 404 for URL https://lalafo.kg/bishkek/ads/85063437.",
+        ),
+    }
+
+    # When: the announcements are created
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo())
+    service.create_announcement(fetch_results.items())
+
+    # Then: only the fetched announcement is stored
+    assert list(Apartment.objects.values_list("site", "external_id")) == [(Site.lalafo, "107495362")]
+
+
+def test_create_announcement_inserts_by_batches(settings: SettingsWrapper) -> None:
+    # Given: a stream of three fetched announcement pages and batches of two apartments
+    settings.PARSER_INSERT_BATCH_SIZE = 2
+    dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+    stored_before_last_page: list[int] = []
+
+    def fetch_results() -> Iterator[tuple[str, FetchResult]]:
+        for external_id in ("85063437", "107495362"):
+            body = (dataset_path / f"lalafo_{external_id}.html").read_bytes()
+            yield external_id, FetchResult(url="", body=body, status=HTTPStatus.OK, attempts=1)
+
+        stored_before_last_page.append(Apartment.objects.count())
+        yield "1", FetchResult(url="", body=b"<html></html>", status=HTTPStatus.OK, attempts=1)
+
+    # When: the announcements are created
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo())
+    service.create_announcement(fetch_results())
+
+    # Then: the first batch is stored before the last page comes, the broken page is skipped
+    assert stored_before_last_page == [2]
+    assert set(Apartment.objects.values_list("external_id", flat=True)) == {"85063437", "107495362"}
+
+
+def test_parse_listing_only_fetches_incomplete_apartments() -> None:
+    # Given: the main page of Lalafo with a stored announcement and a client which records the fetched pages
+    dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+    ApartmentFactory(site=Site.lalafo, external_id="107495362")
+
+    class FakeHttpClient:
+        fetched_ids: list[str] = []  # noqa: RUF012
+
+        def fetch_first_page(
+            self,
+            page_url: str,
+            site: AbstractSite | None = None,
+            deadline: Deadline | None = None,
+            *,
+            conditional: bool = False,
+        ) -> bytes:
+            return (dataset_path / "lalafo_first_page.html").read_bytes()
+
+        def iter_announcement_pages(
+            self,
+            pages_map: dict[str, str],
+            site: Lalafo | None = None,
+            deadline: Deadline | None = None,
+            retry_budget: RetryBudget | None = None,
+        ) -> Iterator[tuple[str, FetchResult]]:
+            for external_id, url in pages_map.items():
+                self.fetched_ids.append(external_id)
+                yield external_id, FetchResult(url=url, status=HTTPStatus.NOT_FOUND, error="Not found.")
+
+    site = Lalafo(listing_only=True)
+    listing_apartments = site.get_listing_apartments_from_content(FakeHttpClient().fetch_first_page(site.first_page))
+    incomplete_ids = {k for k, v in listing_apartments.items() if not (v.phone and v.body)}
+
+    # When: the site is parsed in the listing-only mode
+    ParseSiteService(http_client=FakeHttpClient(), site=site).parse()
+
+    # Then: the complete apartments are stored from the feed, only the incomplete ones are fetched
+    assert incomplete_ids
+    assert set(FakeHttpClient.fetched_ids) == incomplete_ids
+    assert Apartment.objects.count() == len(listing_apartments) - len(incomplete_ids)
+
+
+def test_create_announcement_parses_in_pool(settings: SettingsWrapper) -> None:
+    # Given: a pool of one worker process, two announcement pages and a broken one
+    settings.PARSER_POOL_SIZE = 1
+    dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+    fetch_results = [
+        (external_id, FetchResult(url="", body=body, status=HTTPStatus.OK, attempts=1))
+        for external_id, body in (
+            ("85063437", (dataset_path / "lalafo_85063437.html").read_bytes()),
+            ("107495362", (dataset_path / "lalafo_107495362.html").read_bytes()),
+            ("1", b"<html></html>"),
+        )
+    ]
+
+    # When: the announcements are created
+    service = ParseSiteService(http_client=HttpClient(), site=Lalafo())
+    try:
+        service.create_announcement(fetch_results)
+    finally:
+        ParsePool().close()
+
+    # Then: the apartments parsed by the worker are stored, the broken page is skipped
+    assert set(Apartment.objects.values_list("external_id", flat=True)) == {"85063437", "107495362"}
+
+
+class ListSite(AbstractSite):
+    """The pages of the list are comma-separated ids, the announcement pages are the titles."""
+
+    name = Site.lalafo
+    first_page = "https://example.com/list"
+    max_pages = 4
+
+    def get_announcement_pages_map_from_content(self, content: bytes) -> dict[str, str]:
+        return {external_id: f"https://example.com/{external_id}" for external_id in content.decode().split(",")}
+
+    def parse_apartment_from_content(self, content: bytes) -> ApartmentEntity:
+        external_id, _, title = content.decode().partition(":")
+        return ApartmentEntity(
+            external_id=external_id,
+            site=self.name,
+            external_url=f"https://example.com/{external_id}",
+            title=title,
+            price=0,
+            currency=Currency.kgs,
+            phone="",
+            rooms=1,
+            city="",
+            body="",
+            images_list=[],
+        )
+
+    def get_announcement_pages_map(self, page: Page) -> dict[str, str]:
+        raise NotImplementedError
+
+    def parse_apartment(self, parsed_response: Page) -> ApartmentEntity:
+        raise NotImplementedError
+
+
+class ListHttpClient:
+    """Serve the pages of the list by their URLs and record the fetched pages."""
+
+    def __init__(self, list_pages: dict[str, bytes]) -> None:
+        self.list_pages = list_pages
+        self.fetched_pages: list[str] = []
+        self.fetched_ids: list[str] = []
+        self.retry_budgets: list[RetryBudget | None] = []
+
+    def fetch_first_page(
+        self,
+        page_url: str,
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        *,
+        conditional: bool = False,
+    ) -> bytes:
+        self.fetched_pages.append(page_url)
+        return self.list_pages[page_url]
+
+    def iter_announcement_pages(
+        self,
+        pages_map: dict[str, str],
+        site: AbstractSite | None = None,
+        deadline: Deadline | None = None,
+        retry_budget: RetryBudget | None = None,
+    ) -> Iterator[tuple[str, FetchResult]]:
+        self.retry_budgets.append(retry_budget)
+        for external_id, url in pages_map.items():
+            self.fetched_ids.append(external_id)
+            yield external_id, FetchResult(url=url, body=f"{external_id}:new".encode(), status=HTTPStatus.OK)
+
+
+def test_parse_stops_at_high_water_mark() -> None:
+    # Given: a list of four pages, the second page has one new announcement and the third page has only known ones
+    ApartmentFactory(site=Site.lalafo, external_id="4")
+    ApartmentFactory(site=Site.lalafo, external_id="5")
+
+    site = ListSite()
+    http_client = ListHttpClient(
+        {
+            site.get_page_url(1): b"1,2",
+            # The announcement 2 is pushed from the first page to the second one.
+            site.get_page_url(2): b"2,3,4",
+            site.get_page_url(3): b"4,5",
+            site.get_page_url(4): b"6",
+        },
+    )
+
+    # When: the site is parsed
+    ParseSiteService(http_client=http_client, site=site).parse()
+
+    # Then: the pages are crawled until the page with only known announcements, every new one is fetched once
+    assert http_client.fetched_pages == [site.get_page_url(1), site.get_page_url(2), site.get_page_url(3)]
+    assert http_client.fetched_ids == ["1", "2", "3"]
+    assert set(Apartment.objects.values_list("external_id", flat=True)) == {"1", "2", "3", "4", "5"}
+
+
+def test_parse_shares_retry_budget_of_run(settings: SettingsWrapper) -> None:
+    # Given: a list of two pages with new announcements
+    settings.PARSER_RETRY_BUDGET = 3
+    site = ListSite()
+    site.max_pages = 2
+    http_client = ListHttpClient({site.get_page_url(1): b"1,2", site.get_page_url(2): b"3"})
+
+    # When: the site is parsed
+    ParseSiteService(http_client=http_client, site=site).parse()
+
+    # Then: the announcement pages of both list pages take their retries from one budget of the run
+    first_budget, second_budget = http_client.retry_budgets
+    assert first_budget is second_budget
+    assert first_budget.retries == settings.PARSER_RETRY_BUDGET
+
+
+def test_parse_stores_apartments_fetched_before_deadline() -> None:
+    # Given: a client which runs out of the deadline after the first announcement page
+    class SlowListHttpClient(ListHttpClient):
+        def iter_announcement_pages(
+            self,
+            pages_map: dict[str, str],
+            site: AbstractSite | None = None,
+            deadline: Deadline | None = None,
+            retry_budget: RetryBudget | None = None,
+        ) -> Iterator[tuple[str, FetchResult]]:
+            yield next(super().iter_announcement_pages(pages_map, site, deadline, retry_budget))
+            msg = "The run is out of its time budget."
+            raise DeadlineExceededError(msg)
+
+    site = ListSite()
+    http_client = SlowListHttpClient({site.get_page_url(1): b"1,2,3"})
+    runs_count = "easyhome_parser_runs_total"
+    cut_short_before = REGISTRY.get_sample_value(runs_count, {"site": site.name, "result": "cut_short"}) or 0.0
+
+    # When: the site is parsed
+    ParseSiteService(http_client=http_client, site=site).parse()
+
+    # Then: the apartment fetched before the deadline is stored and the run is recorded as cut short
+    assert list(Apartment.objects.values_list("external_id", flat=True)) == ["1"]
+    assert REGISTRY.get_sample_value(runs_count, {"site": site.name, "result": "cut_short"}) == cut_short_before + 1
+
+
+def test_parse_skips_unchanged_page(django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    # Given: a site which was parsed twice, so its first page has only known announcements
+    site = ListSite()
+    site.max_pages = 1
+    http_client = ListHttpClient({site.get_page_url(1): b"1,2"})
+    service = ParseSiteService(http_client=http_client, site=site)
+    service.parse()
+    service.parse()
+
+    # When: the site is parsed again and the server sends the same page
+    with django_assert_num_queries(0):
+        service.parse()
+
+    # Then: the page is fetched but isn't looked up in the database, the announcements are fetched once
+    assert http_client.fetched_pages == [site.get_page_url(1)] * 3
+    assert http_client.fetched_ids == ["1", "2"]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from django.conf import settings
+
+from easyhome.easyhome.models import Apartment, Site
+from easyhome.parser.http_client import HttpClient
+from easyhome.parser.services import ParseSiteService
+from easyhome.parser.simulator import SimulatorConfig, SiteSimulator
+from easyhome.parser.sites.diesel import Diesel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+dataset_path = settings.BASE_DIR / "tests/parser/__dataset__"
+
+
+@pytest.fixture()
+def diesel_simulator() -> Iterator[SiteSimulator]:
+    simulator = SiteSimulator(Diesel(), dataset_path, SimulatorConfig(pages=2, error_rate=0.05, slow_rate=0.05))
+    simulator.start()
+    yield simulator
+    simulator.stop()
+
+
+def test_simulator_serves_synthetic_pages(diesel_simulator: SiteSimulator) -> None:
+    # Given: the site crawled from the simulator
+    site = diesel_simulator.get_site()
+    http_client = HttpClient()
+
+    # When: the list pages are fetched
+    first_page = site.get_announcement_pages_map_from_content(http_client.fetch_first_page(site.get_page_url(1)))
+    second_page = site.get_announcement_pages_map_from_content(http_client.fetch_first_page(site.get_page_url(2)))
+
+    # Then: every list page has its own announcements on the simulator
+    assert len(first_page) == len(second_page) > 0
+    assert not set(first_page) & set(second_page)
+    assert all(url.startswith(diesel_simulator.base_url) for url in first_page.values())
+
+
+@pytest.mark.django_db
+def test_crawl_simulated_site(diesel_simulator: SiteSimulator) -> None:
+    # Given: the site crawled from the simulator, without the rate limit
+    site = diesel_simulator.get_site()
+    site.requests_per_second = 0
+
+    # When: the site is crawled
+    ParseSiteService(http_client=HttpClient(), site=site).parse()
+
+    # Then: the announcements of all list pages are stored, the failed responses are retried
+    stats = diesel_simulator.stats
+    assert stats.list_pages == 2  # noqa: PLR2004
+    assert stats.errors > 0
+    assert stats.slow_responses > 0
+    assert Apartment.objects.filter(site=Site.diesel).count() == stats.detail_pages
+    assert set(Apartment.objects.values_list("external_id", flat=True)) == {
+        diesel_simulator.get_announcement_id(page_number, index, template_id)
+        for page_number in (1, 2)
+        for index, template_id in enumerate(diesel_simulator._list_ids)
+    }